@@ -0,0 +1,98 @@
+import argparse
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers.activity import compute_activity, timestamps_to_array
+
+HEATMAP_WEEKS = 53
+
+
+def synthetic_timestamps(posts: int, years: int) -> list:
+    now = datetime.now(timezone.utc)
+    rng = np.random.default_rng(42)
+    offsets = rng.integers(0, years * 365 * 86400, size=posts)
+    return [(now - timedelta(seconds=int(offset))).isoformat() for offset in offsets]
+
+
+def legacy_activity(values: list, now: datetime) -> dict:
+    per_day = Counter()
+    hour_of_week = [[0] * 24 for _ in range(7)]
+    today = now.date()
+    heatmap_start = today - timedelta(days=today.weekday() + (HEATMAP_WEEKS - 1) * 7)
+    heatmap = [[0] * 7 for _ in range(HEATMAP_WEEKS)]
+
+    for value in values:
+        created_in = datetime.fromisoformat(value).astimezone(timezone.utc)
+        day = created_in.date()
+        per_day[day] += 1
+        hour_of_week[day.weekday()][created_in.hour] += 1
+        offset = (day - heatmap_start).days
+        if 0 <= offset < HEATMAP_WEEKS * 7:
+            heatmap[offset // 7][offset % 7] += 1
+
+    return {
+        "totalPosts": len(values),
+        "postsPerDay": [
+            {"date": day.isoformat(), "count": count}
+            for day, count in sorted(per_day.items())
+        ],
+        "postsPerHourOfWeek": hour_of_week,
+        "heatmap": {"start": heatmap_start.isoformat(), "weeks": heatmap},
+    }
+
+
+def vectorized_activity(values: list, now: datetime) -> dict:
+    return compute_activity(
+        timestamps_to_array(values), int(now.timestamp()), HEATMAP_WEEKS
+    )
+
+
+def measure(name: str, job, iterations: int):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        job()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    print(
+        f"{name:<12} mediana={statistics.median(timings):9.2f} ms "
+        f"min={min(timings):9.2f} ms"
+    )
+
+
+def main(posts: int, years: int, iterations: int):
+    values = synthetic_timestamps(posts, years)
+    now = datetime.now(timezone.utc)
+    timestamps = timestamps_to_array(values)
+
+    if legacy_activity(values, now) != vectorized_activity(values, now):
+        raise SystemExit("Os resultados das duas implementações divergem.")
+
+    print(f"{posts} postagens distribuídas em {years} anos")
+    print(f"memória dos timestamps: {timestamps.nbytes / 1024 / 1024:.2f} MiB")
+    measure("legado", lambda: legacy_activity(values, now), iterations)
+    measure("numpy", lambda: vectorized_activity(values, now), iterations)
+    measure(
+        "agrupamento",
+        lambda: compute_activity(timestamps, int(now.timestamp()), HEATMAP_WEEKS),
+        iterations,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara o histograma de atividade em Python puro com a versão vetorizada."
+    )
+    parser.add_argument("--posts", type=int, default=500_000)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+    main(args.posts, args.years, args.iterations)
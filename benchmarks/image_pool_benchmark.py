@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers.images import IMAGE_WIDTHS, process_image
+from services import image_service
+
+
+def synthetic_photo(width: int, height: int, seed: int) -> bytes:
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(0, 255, width, dtype=np.float32)
+    pixels = np.empty((height, width, 3), dtype=np.uint8)
+    for channel in range(3):
+        noise = rng.normal(0, 20, size=(height, width))
+        pixels[..., channel] = np.clip(gradient * (channel + 1) / 3 + noise, 0, 255)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+
+async def run_inline(images: list) -> None:
+    for data in images:
+        process_image(data, IMAGE_WIDTHS)
+        await asyncio.sleep(0)
+
+
+async def run_pool(images: list) -> None:
+    loop = asyncio.get_running_loop()
+    pool = image_service.get_image_pool()
+    await asyncio.gather(
+        *(
+            loop.run_in_executor(pool, process_image, data, IMAGE_WIDTHS)
+            for data in images
+        )
+    )
+
+
+async def event_loop_lag(job) -> tuple:
+    worst = 0.0
+    done = False
+
+    async def probe():
+        nonlocal worst
+        while not done:
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            worst = max(worst, time.perf_counter() - started - 0.01)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    await job
+    elapsed = time.perf_counter() - started
+    done = True
+    await probe_task
+    return elapsed, worst
+
+
+async def main(uploads: int, width: int, height: int):
+    images = [synthetic_photo(width, height, seed) for seed in range(uploads)]
+    image_service.get_image_pool().submit(int).result()
+
+    print(
+        f"{uploads} uploads de {width}x{height} "
+        f"({sum(map(len, images)) / len(images) / 1024:.0f} KiB em média), "
+        f"{image_service.IMAGE_WORKERS} processos"
+    )
+    for name, job in (("inline", run_inline), ("pool", run_pool)):
+        elapsed, lag = await event_loop_lag(job(images))
+        print(
+            f"{name:<8} {uploads / elapsed:6.2f} imagens/s "
+            f"total={elapsed:6.2f} s atraso máximo do loop={lag * 1000:8.1f} ms"
+        )
+    image_service.shutdown_image_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Mede a vazão do pipeline de derivadas de imagem com uploads concorrentes."
+    )
+    parser.add_argument("--uploads", type=int, default=32)
+    parser.add_argument("--width", type=int, default=3000)
+    parser.add_argument("--height", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.uploads, args.width, args.height))
@@ -0,0 +1,159 @@
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+OLD_POST_DATE = "2000-01-01T00:00:00+00:00"
+FAKE_USERNAME = "benchmark"
+FAKE_CREDENTIALS = {
+    "SUPABASE_URL": "http://localhost:54321",
+    "SUPABASE_ANON_KEY": "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoiYW5vbiJ9.signature",
+    "SUPABASE_SERVICE_KEY": "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZSJ9.signature",
+}
+
+
+def fake_database(latency_ms: float, users: int, posts_per_user: int):
+    from tests.fakes import FakeDatabase
+
+    now = datetime.now(timezone.utc)
+    profiles = [
+        {
+            "id": f"user-{index}",
+            "username": FAKE_USERNAME if index == 0 else f"user{index}",
+            "role": "user",
+            "avatar_url": None,
+            "joined_at": (now - timedelta(days=400 + index)).isoformat(),
+            "last_login": now.isoformat(),
+            "followers_count": 0,
+            "mensagens_count": posts_per_user,
+        }
+        for index in range(users)
+    ]
+    topics = []
+    comments = []
+    for profile in profiles:
+        for post in range(posts_per_user):
+            table = topics if post % 4 == 0 else comments
+            table.append(
+                {
+                    "id": len(table) + 1,
+                    "author_id": profile["id"],
+                    "created_in": (now - timedelta(hours=post)).isoformat(),
+                }
+            )
+
+    database = FakeDatabase(profiles=profiles, topicos=topics, comentarios=comments)
+    database.keys = {"user_stats": "user_id"}
+    database.embeds = {"user_stats": "user_id"}
+    database.latency = latency_ms / 1000
+    return database
+
+
+def use_fake_database(database) -> None:
+    from services import follow_service, forum_service, statistic_service
+
+    for module in (follow_service, forum_service, statistic_service):
+        module.supabase = database
+        if hasattr(module, "supabase_admin"):
+            module.supabase_admin = database
+
+
+async def legacy_user_stats(username: str):
+    from services import statistic_service
+    from services.follow_service import get_user_id_by_username
+    from services.forum_service import get_forum_stats
+
+    user_id = await get_user_id_by_username(username)
+    profile = (
+        statistic_service.supabase.from_("profiles")
+        .select("joined_at, mensagens_count, followers_count, last_login")
+        .eq("id", user_id)
+        .single()
+        .execute()
+        .data
+    )
+    record = statistic_service.compute_user_stats_record(user_id)
+    forum_stats = await get_forum_stats()
+    return statistic_service.build_user_stats_response(profile, record, forum_stats)
+
+
+async def measure(name: str, job, iterations: int, database=None):
+    await job()
+    round_trips = database.round_trips if database else 0
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await job()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    timings.sort()
+    p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+    queries = (
+        f" consultas={(database.round_trips - round_trips) / iterations:4.1f}"
+        if database
+        else ""
+    )
+    print(
+        f"{name:<10} mediana={statistics.median(timings):8.2f} ms "
+        f"p95={p95:8.2f} ms media={statistics.mean(timings):8.2f} ms{queries}"
+    )
+
+
+async def main(username: str, iterations: int, database=None):
+    from services.follow_service import get_user_id_by_username
+    from services.statistic_service import (
+        get_user_stats,
+        store_user_stats_record,
+        update_user_stats_record,
+    )
+
+    await measure("legado", lambda: legacy_user_stats(username), iterations, database)
+    await measure("snapshot", lambda: get_user_stats(username), iterations, database)
+
+    user_id = await get_user_id_by_username(username)
+    await measure(
+        "recálculo",
+        lambda: asyncio.to_thread(store_user_stats_record, user_id),
+        iterations,
+        database,
+    )
+    await measure(
+        "delta",
+        lambda: asyncio.to_thread(
+            update_user_stats_record, user_id, "comment", OLD_POST_DATE, 0
+        ),
+        iterations,
+        database,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara o cálculo legado de estatísticas com o snapshot por usuário."
+    )
+    parser.add_argument("username", nargs="?", default=FAKE_USERNAME)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument(
+        "--simulated-latency-ms",
+        type=float,
+        help="usa o banco em memória de tests/fakes com esta latência por consulta",
+    )
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts-per-user", type=int, default=20)
+    args = parser.parse_args()
+
+    database = None
+    if args.simulated_latency_ms is not None:
+        for name, value in FAKE_CREDENTIALS.items():
+            os.environ.setdefault(name, value)
+        database = fake_database(
+            args.simulated_latency_ms, args.users, args.posts_per_user
+        )
+        use_fake_database(database)
+    asyncio.run(main(args.username, args.iterations, database))
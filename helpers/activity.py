@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Iterable
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600
+EPOCH_WEEKDAY = 3
+
+
+def timestamps_to_array(values: Iterable[str]) -> np.ndarray:
+    return np.fromiter(
+        (int(datetime.fromisoformat(value).timestamp()) for value in values),
+        dtype=np.int64,
+    )
+
+
+def compute_activity(timestamps: np.ndarray, now: int, heatmap_weeks: int) -> dict:
+    days = timestamps // SECONDS_PER_DAY
+    weekdays = (days + EPOCH_WEEKDAY) % 7
+    hours = (timestamps % SECONDS_PER_DAY) // SECONDS_PER_HOUR
+
+    day_values, day_counts = np.unique(days, return_counts=True)
+    hour_of_week = np.bincount(weekdays * 24 + hours, minlength=7 * 24)
+
+    today = now // SECONDS_PER_DAY
+    heatmap_start = today - (today + EPOCH_WEEKDAY) % 7 - (heatmap_weeks - 1) * 7
+    recent = days[(days >= heatmap_start) & (days <= today)] - heatmap_start
+    heatmap = np.bincount(recent, minlength=heatmap_weeks * 7).reshape(heatmap_weeks, 7)
+
+    dates = day_values.astype("datetime64[D]").astype(str)
+    return {
+        "totalPosts": int(timestamps.size),
+        "postsPerDay": [
+            {"date": date, "count": count}
+            for date, count in zip(dates.tolist(), day_counts.tolist())
+        ],
+        "postsPerHourOfWeek": hour_of_week.reshape(7, 24).tolist(),
+        "heatmap": {
+            "start": str(np.datetime64(int(heatmap_start), "D")),
+            "weeks": heatmap.tolist(),
+        },
+    }
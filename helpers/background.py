@@ -0,0 +1,47 @@
+import asyncio
+from typing import Awaitable, Callable, List, Set
+
+from helpers.exceptions import AppException
+
+background_tasks: List[asyncio.Task] = []
+pending_jobs: Set[asyncio.Task] = set()
+
+
+async def run_job(job: Awaitable, name: str) -> None:
+    try:
+        await job
+    except AppException as e:
+        print(f"Tarefa em segundo plano '{name}' falhou: {e.message}")
+    except Exception as e:
+        print(f"Tarefa em segundo plano '{name}' falhou: {str(e)}")
+
+
+def run_in_background(job: Awaitable, name: str) -> asyncio.Task:
+    task = asyncio.create_task(run_job(job, name))
+    pending_jobs.add(task)
+    task.add_done_callback(pending_jobs.discard)
+    return task
+
+
+async def run_periodically(
+    job: Callable[[], Awaitable[None]], interval_seconds: float, name: str
+) -> None:
+    while True:
+        await run_job(job(), name)
+        await asyncio.sleep(interval_seconds)
+
+
+def start_periodic_job(
+    job: Callable[[], Awaitable[None]], interval_seconds: float, name: str
+) -> asyncio.Task:
+    task = asyncio.create_task(run_periodically(job, interval_seconds, name))
+    background_tasks.append(task)
+    return task
+
+
+async def stop_background_jobs() -> None:
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+    await asyncio.gather(*pending_jobs, return_exceptions=True)
@@ -17,9 +17,11 @@ ERROR_TYPE_MAP = {
     "FORBIDDEN_ERROR": status.HTTP_403_FORBIDDEN,
     "NOT_FOUND": status.HTTP_404_NOT_FOUND,
     "CONFLICT": status.HTTP_409_CONFLICT,
+    "PAYLOAD_TOO_LARGE": status.HTTP_413_CONTENT_TOO_LARGE,
     "TOO_MANY_REQUESTS": status.HTTP_429_TOO_MANY_REQUESTS,
     "DATABASE_ERROR": status.HTTP_500_INTERNAL_SERVER_ERROR,
     "INTERNAL_SERVER_ERROR": status.HTTP_500_INTERNAL_SERVER_ERROR,
+    "SERVICE_UNAVAILABLE": status.HTTP_503_SERVICE_UNAVAILABLE,
 }
 
 
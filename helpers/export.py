@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from sqlalchemy import Column, Date, DateTime, Integer
+
+from helpers.exceptions import AppException
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+def iter_batches(rows: Iterable[dict], size: int) -> Iterator[List[dict]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def text_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def iter_csv(rows: Iterable[dict], columns: List[str], batch_size: int):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    for batch in iter_batches(rows, batch_size):
+        writer.writerows(
+            {
+                key: text_value(value) if isinstance(value, (dict, list)) else value
+                for key, value in row.items()
+            }
+            for row in batch
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def iter_ndjson(rows: Iterable[dict], batch_size: int):
+    for batch in iter_batches(rows, batch_size):
+        yield "".join(
+            json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in batch
+        ).encode("utf-8")
+
+
+def load_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise AppException(
+            "BAD_REQUEST", "A exportação em Parquet requer o pacote pyarrow."
+        )
+    return pyarrow, pyarrow.parquet
+
+
+class ChunkSink:
+    def __init__(self):
+        self.closed = False
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def arrow_schema(pa, columns: List[Column]):
+    fields = []
+    for column in columns:
+        if isinstance(column.type, Integer):
+            arrow_type = pa.int64()
+        elif isinstance(column.type, DateTime):
+            arrow_type = pa.timestamp("us", tz="UTC")
+        elif isinstance(column.type, Date):
+            arrow_type = pa.date32()
+        else:
+            arrow_type = pa.string()
+        fields.append(pa.field(column.name, arrow_type))
+    return pa.schema(fields)
+
+
+def iter_parquet(rows: Iterable[dict], columns: List[Column], row_group_size: int):
+    pa, pq = load_pyarrow()
+    schema = arrow_schema(pa, columns)
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    for batch in iter_batches(rows, row_group_size):
+        arrays = []
+        for field in schema:
+            values = [row.get(field.name) for row in batch]
+            if pa.types.is_integer(field.type):
+                arrays.append(pa.array(values, type=field.type))
+            else:
+                arrays.append(
+                    pa.array(
+                        [
+                            None if value is None else text_value(value)
+                            for value in values
+                        ],
+                        type=pa.string(),
+                    ).cast(field.type)
+                )
+        writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
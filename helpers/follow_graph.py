@@ -0,0 +1,144 @@
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _contains(values: array, value: int) -> bool:
+    position = bisect_left(values, value)
+    return position < len(values) and values[position] == value
+
+
+def _insert(values: array, value: int) -> bool:
+    position = bisect_left(values, value)
+    if position < len(values) and values[position] == value:
+        return False
+    values.insert(position, value)
+    return True
+
+
+def _remove(values: array, value: int) -> bool:
+    position = bisect_left(values, value)
+    if position < len(values) and values[position] == value:
+        del values[position]
+        return True
+    return False
+
+
+class FollowGraph:
+    def __init__(self):
+        self.loaded = False
+        self._ids: Dict[str, int] = {}
+        self._users: List[str] = []
+        self._following: List[array] = []
+        self._followers: List[array] = []
+        self._pending: Optional[List[Tuple[bool, str, str]]] = None
+
+    @classmethod
+    def from_edges(cls, edges: Iterable[Tuple[str, str]]) -> "FollowGraph":
+        graph = cls()
+        for follower_id, following_id in edges:
+            follower = graph._intern(follower_id)
+            following = graph._intern(following_id)
+            graph._following[follower].append(following)
+            graph._followers[following].append(follower)
+
+        graph._following = [array("I", sorted(set(v))) for v in graph._following]
+        graph._followers = [array("I", sorted(set(v))) for v in graph._followers]
+        graph.loaded = True
+        return graph
+
+    def _intern(self, user_id: str) -> int:
+        user_id = str(user_id)
+        index = self._ids.get(user_id)
+        if index is None:
+            index = len(self._users)
+            self._ids[user_id] = index
+            self._users.append(user_id)
+            self._following.append(array("I"))
+            self._followers.append(array("I"))
+        return index
+
+    def begin_reload(self) -> None:
+        self._pending = []
+
+    def cancel_reload(self) -> None:
+        self._pending = None
+
+    def replace(self, other: "FollowGraph") -> None:
+        pending = self._pending or []
+        self._ids = other._ids
+        self._users = other._users
+        self._following = other._following
+        self._followers = other._followers
+        self._pending = None
+        self.loaded = True
+
+        for added, follower_id, following_id in pending:
+            if added:
+                self.add_edge(follower_id, following_id)
+            else:
+                self.remove_edge(follower_id, following_id)
+
+    def add_edge(self, follower_id: str, following_id: str) -> None:
+        if self._pending is not None:
+            self._pending.append((True, str(follower_id), str(following_id)))
+        if not self.loaded:
+            return
+
+        follower = self._intern(follower_id)
+        following = self._intern(following_id)
+        if _insert(self._following[follower], following):
+            _insert(self._followers[following], follower)
+
+    def remove_edge(self, follower_id: str, following_id: str) -> None:
+        if self._pending is not None:
+            self._pending.append((False, str(follower_id), str(following_id)))
+        if not self.loaded:
+            return
+
+        follower = self._ids.get(str(follower_id))
+        following = self._ids.get(str(following_id))
+        if follower is None or following is None:
+            return
+        if _remove(self._following[follower], following):
+            _remove(self._followers[following], follower)
+
+    def is_following(self, follower_id: str, following_id: str) -> bool:
+        follower = self._ids.get(str(follower_id))
+        following = self._ids.get(str(following_id))
+        if follower is None or following is None:
+            return False
+        return _contains(self._following[follower], following)
+
+    def is_mutual(self, user_id: str, other_id: str) -> bool:
+        return self.is_following(user_id, other_id) and self.is_following(
+            other_id, user_id
+        )
+
+    def followers_count(self, user_id: str) -> int:
+        index = self._ids.get(str(user_id))
+        return len(self._followers[index]) if index is not None else 0
+
+    def following_count(self, user_id: str) -> int:
+        index = self._ids.get(str(user_id))
+        return len(self._following[index]) if index is not None else 0
+
+    def edge_count(self) -> int:
+        return sum(len(values) for values in self._following)
+
+    def memory_usage(self) -> int:
+        adjacency = sum(
+            sys.getsizeof(values) for values in self._following + self._followers
+        )
+        interned = sum(sys.getsizeof(user_id) for user_id in self._users)
+        containers = (
+            sys.getsizeof(self._ids)
+            + sys.getsizeof(self._users)
+            + sys.getsizeof(self._following)
+            + sys.getsizeof(self._followers)
+        )
+        return adjacency + interned + containers
+
+
+follow_graph = FollowGraph()
@@ -0,0 +1,94 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+def compute_follow_suggestions(
+    user_count: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    edge_weights: np.ndarray,
+    activity: np.ndarray,
+    top_k: int,
+) -> Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    order = np.argsort(sources, kind="stable")
+    targets = targets[order]
+    edge_weights = edge_weights[order]
+
+    indptr = np.zeros(user_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=user_count), out=indptr[1:])
+
+    suggestions = {}
+    for user in np.flatnonzero(np.diff(indptr)):
+        followees = targets[indptr[user] : indptr[user + 1]]
+        starts = indptr[followees]
+        lengths = indptr[followees + 1] - starts
+        total = int(lengths.sum())
+        if total == 0:
+            continue
+
+        offsets = np.arange(total) + np.repeat(
+            starts - np.cumsum(lengths) + lengths, lengths
+        )
+        candidates = targets[offsets]
+        weights = edge_weights[offsets]
+
+        keep = (candidates != user) & ~np.isin(candidates, followees)
+        if not keep.any():
+            continue
+        candidates = candidates[keep]
+        weights = weights[keep]
+
+        unique, inverse = np.unique(candidates, return_inverse=True)
+        scores = np.bincount(inverse, weights=weights) * activity[unique]
+        shared = np.bincount(inverse)
+
+        if len(unique) > top_k:
+            top = np.argpartition(-scores, top_k)[:top_k]
+        else:
+            top = np.arange(len(unique))
+        top = top[np.argsort(-scores[top], kind="stable")]
+
+        suggestions[int(user)] = (
+            unique[top].astype(np.int32),
+            scores[top].astype(np.float32),
+            shared[top].astype(np.int32),
+        )
+    return suggestions
+
+
+class FollowSuggestionStore:
+    def __init__(self):
+        self.loaded = False
+        self._user_index: Dict[str, int] = {}
+        self._profiles: List[dict] = []
+        self._suggestions: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def replace(
+        self,
+        user_index: Dict[str, int],
+        profiles: List[dict],
+        suggestions: Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray]],
+    ) -> None:
+        self._user_index = user_index
+        self._profiles = profiles
+        self._suggestions = suggestions
+        self.loaded = True
+
+    def get(self, user_id: str) -> List[dict]:
+        index = self._user_index.get(str(user_id))
+        if index is None or index not in self._suggestions:
+            return []
+
+        candidates, scores, shared = self._suggestions[index]
+        return [
+            {
+                **self._profiles[candidate],
+                "sharedCount": int(count),
+                "score": round(float(score), 4),
+            }
+            for candidate, score, count in zip(candidates, scores, shared)
+        ]
+
+
+follow_suggestions = FollowSuggestionStore()
@@ -0,0 +1,96 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import tempfile
+from collections import OrderedDict
+from itertools import count
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+
+def cache_key(*parts) -> str:
+    return hashlib.sha256("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+
+
+def iter_mapped(file: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    with file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), chunk_size):
+                yield mapped[start : start + chunk_size]
+
+
+def claim_directory(root: Path) -> Tuple[Path, BinaryIO]:
+    for slot in count():
+        directory = root / f"worker-{slot}"
+        directory.mkdir(parents=True, exist_ok=True)
+        lock = open(directory / ".lock", "wb")
+        try:
+            fcntl.flock(lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            continue
+        return directory, lock
+
+
+class DiskLRUCache:
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.directory = self.root
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self.loaded = False
+        self._lock: Optional[BinaryIO] = None
+
+    def path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def load(self) -> None:
+        if self._lock is None:
+            self.directory, self._lock = claim_directory(self.root)
+
+        found = []
+        if self.directory.is_dir():
+            for directory in self.directory.iterdir():
+                if not directory.is_dir():
+                    continue
+                for entry in os.scandir(directory):
+                    if entry.is_file() and not entry.name.startswith("."):
+                        stat = entry.stat()
+                        found.append((stat.st_atime, entry.name, stat.st_size))
+
+        self._entries = OrderedDict((key, size) for _, key, size in sorted(found))
+        self.total_bytes = sum(self._entries.values())
+        self.loaded = True
+
+    def get(self, key: str) -> Optional[Path]:
+        if key not in self._entries:
+            return None
+        self._entries.move_to_end(key)
+        return self.path(key)
+
+    def write(self, key: str, data: bytes) -> None:
+        target = self.path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=target.parent, prefix=".render-", delete=False
+        ) as temporary:
+            temporary.write(data)
+        os.replace(temporary.name, target)
+
+    def add(self, key: str, size: int) -> List[Path]:
+        self.total_bytes += size - self._entries.pop(key, 0)
+        self._entries[key] = size
+
+        evicted = []
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, old_size = self._entries.popitem(last=False)
+            self.total_bytes -= old_size
+            evicted.append(self.path(old_key))
+        return evicted
+
+    def discard(self, key: str) -> None:
+        self.total_bytes -= self._entries.pop(key, 0)
@@ -0,0 +1,134 @@
+import io
+import os
+from pathlib import Path
+from typing import Iterable, List, Union
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+IMAGE_MAX_PIXELS = int(os.environ.get("IMAGE_MAX_PIXELS", str(40_000_000)))
+IMAGE_WIDTHS = (320, 640, 1280)
+AVATAR_WIDTHS = (48, 96, 256)
+
+SOURCE_FORMATS = {
+    "JPEG": ("jpg", "image/jpeg"),
+    "PNG": ("png", "image/png"),
+    "GIF": ("gif", "image/gif"),
+    "WEBP": ("webp", "image/webp"),
+}
+DERIVATIVE_FORMATS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True}),
+}
+DERIVATIVE_EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+
+Image.MAX_IMAGE_PIXELS = IMAGE_MAX_PIXELS
+
+
+class InvalidImage(ValueError):
+    pass
+
+
+def open_source(source: Union[bytes, str]) -> Image.Image:
+    return Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+
+
+def open_image(source: Union[bytes, str]) -> Image.Image:
+    try:
+        with open_source(source) as probe:
+            probe.verify()
+        image = open_source(source)
+        image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise InvalidImage(str(e))
+
+    if image.format not in SOURCE_FORMATS:
+        raise InvalidImage(f"formato não suportado: {image.format}")
+    if image.width * image.height > IMAGE_MAX_PIXELS:
+        raise InvalidImage("imagem grande demais")
+    return image
+
+
+def encode(image: Image.Image, format: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, **options)
+    return buffer.getvalue()
+
+
+def has_alpha(image: Image.Image) -> bool:
+    return image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+
+
+def flatten(image: Image.Image) -> Image.Image:
+    if has_alpha(image):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def sanitized_original(image: Image.Image, source: Union[bytes, str]) -> bytes:
+    if getattr(image, "n_frames", 1) > 1:
+        return source if isinstance(source, bytes) else Path(source).read_bytes()
+
+    options = {}
+    if image.info.get("icc_profile"):
+        options["icc_profile"] = image.info["icc_profile"]
+    if image.format == "JPEG":
+        return encode(flatten(image), "JPEG", quality=90, **options)
+    if image.format == "WEBP":
+        return encode(image, "WEBP", quality=90, **options)
+    return encode(image, image.format, **options)
+
+
+def derivative_widths(width: int, widths: Iterable[int]) -> List[int]:
+    return [target for target in widths if target < width] or [width]
+
+
+def resize_width(image: Image.Image, width: int) -> Image.Image:
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def encode_derivative(image: Image.Image, name: str) -> bytes:
+    format, _, options = DERIVATIVE_FORMATS[name]
+    return encode(flatten(image) if format == "JPEG" else image, format, **options)
+
+
+def prepare(source: Union[bytes, str]) -> tuple:
+    opened = open_image(source)
+    image = ImageOps.exif_transpose(opened)
+    image.format = opened.format
+    return image, image.convert("RGBA" if has_alpha(image) else "RGB")
+
+
+def render_variant(data: bytes, width: int, name: str) -> bytes:
+    _, base = prepare(data)
+    return encode_derivative(resize_width(base, min(width, base.width)), name)
+
+
+def process_image(source: Union[bytes, str], widths: Iterable[int]) -> dict:
+    image, base = prepare(source)
+    derivatives = []
+    for width in derivative_widths(image.width, widths):
+        resized = resize_width(base, width)
+        for name, (_, content_type, _) in DERIVATIVE_FORMATS.items():
+            derivatives.append(
+                {
+                    "width": width,
+                    "format": name,
+                    "extension": DERIVATIVE_EXTENSIONS[name],
+                    "content_type": content_type,
+                    "data": encode_derivative(resized, name),
+                }
+            )
+
+    extension, content_type = SOURCE_FORMATS[image.format]
+    return {
+        "width": image.width,
+        "height": image.height,
+        "extension": extension,
+        "content_type": content_type,
+        "data": sanitized_original(image, source),
+        "derivatives": derivatives,
+    }
@@ -0,0 +1,52 @@
+import heapq
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class Leaderboard:
+    def __init__(self, size: int):
+        self.size = size
+        self.loaded = False
+        self._scores: Dict[Hashable, int] = {}
+        self._heap: List[Tuple[int, Hashable]] = []
+        self._top: Optional[List[Tuple[Hashable, int]]] = None
+
+    def replace(self, scores: Dict[Hashable, int]) -> None:
+        self._scores = {key: score for key, score in scores.items() if score > 0}
+        self._rebuild_heap()
+        self.loaded = True
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(-score, key) for key, score in self._scores.items()]
+        heapq.heapify(self._heap)
+        self._top = None
+
+    def add(self, key: Hashable, delta: int) -> None:
+        score = max(0, self._scores.get(key, 0) + delta)
+        if score:
+            self._scores[key] = score
+            heapq.heappush(self._heap, (-score, key))
+        else:
+            self._scores.pop(key, None)
+        self._top = None
+
+        if len(self._heap) > 2 * len(self._scores) + self.size:
+            self._rebuild_heap()
+
+    def discard(self, key: Hashable) -> None:
+        if self._scores.pop(key, None) is not None:
+            self._top = None
+
+    def top(self) -> List[Tuple[Hashable, int]]:
+        if self._top is None:
+            ranked = []
+            seen = set()
+            while self._heap and len(ranked) < self.size:
+                negative_score, key = heapq.heappop(self._heap)
+                if key in seen or self._scores.get(key) != -negative_score:
+                    continue
+                seen.add(key)
+                ranked.append((negative_score, key))
+            for entry in ranked:
+                heapq.heappush(self._heap, entry)
+            self._top = [(key, -negative_score) for negative_score, key in ranked]
+        return list(self._top)
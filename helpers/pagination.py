@@ -0,0 +1,121 @@
+import base64
+import json
+import re
+import uuid
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence
+
+from helpers.exceptions import AppException
+
+ISO_TIMESTAMP = re.compile(
+    r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?"
+    r"(?:Z|[+-]\d{2}:?\d{2})?"
+)
+
+
+def encode_cursor(*values) -> str:
+    payload = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def is_timestamp(value) -> bool:
+    if not isinstance(value, str) or not ISO_TIMESTAMP.fullmatch(value):
+        return False
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        return False
+    return True
+
+
+def is_integer(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_uuid(value) -> bool:
+    if not isinstance(value, str):
+        return False
+    try:
+        return str(uuid.UUID(value)) == value.lower()
+    except ValueError:
+        return False
+
+
+def is_identifier(value) -> bool:
+    return is_integer(value) or is_uuid(value)
+
+
+def decode_cursor(
+    cursor: str, checks: Sequence[Callable] = (is_timestamp, is_identifier)
+) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except Exception:
+        raise AppException("BAD_REQUEST", "Cursor de paginação inválido.")
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(checks)
+        or not all(check(value) for check, value in zip(checks, values))
+    ):
+        raise AppException("BAD_REQUEST", "Cursor de paginação inválido.")
+    return values
+
+
+def quote_filter_value(value) -> str:
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def keyset_filter(
+    sort_column: str, tie_column: str, cursor_values: list, descending: bool
+) -> str:
+    operator = "lt" if descending else "gt"
+    sort_value = quote_filter_value(cursor_values[0])
+    tie_value = quote_filter_value(cursor_values[1])
+    return (
+        f"{sort_column}.{operator}.{sort_value},"
+        f"and({sort_column}.eq.{sort_value},{tie_column}.{operator}.{tie_value})"
+    )
+
+
+def build_cursor_page(
+    rows: List[dict],
+    limit: int,
+    cursor_key: Callable[[dict], tuple],
+    item: Optional[Callable[[dict], Optional[dict]]] = None,
+) -> dict:
+    page_rows = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit and page_rows:
+        next_cursor = encode_cursor(*cursor_key(page_rows[-1]))
+
+    items = page_rows
+    if item:
+        items = [value for value in (item(row) for row in page_rows) if value]
+
+    return {"data": items, "nextCursor": next_cursor}
+
+
+def iter_keyset(build_query, sort_column: str, tie_column: str = None, page_size=1000):
+    cursor_values = None
+    while True:
+        query = build_query()
+        if cursor_values and tie_column:
+            query = query.or_(
+                keyset_filter(sort_column, tie_column, cursor_values, False)
+            )
+        elif cursor_values:
+            query = query.gt(sort_column, cursor_values[0])
+
+        query = query.order(sort_column)
+        if tie_column:
+            query = query.order(tie_column)
+        rows = query.limit(page_size).execute().data or []
+        if not rows:
+            return
+
+        yield from rows
+        cursor_values = [rows[-1][sort_column]]
+        if tie_column:
+            cursor_values.append(rows[-1][tie_column])
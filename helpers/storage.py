@@ -0,0 +1,313 @@
+import asyncio
+import json
+import mimetypes
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import quote
+
+import httpx
+from config.supabase_client import (
+    supabase_anon_key,
+    supabase_service_key,
+    supabase_url,
+)
+from helpers.exceptions import AppException
+
+STORAGE_BACKEND = os.environ.get("STORAGE_BACKEND", "supabase").lower()
+STORAGE_LOCAL_ROOT = os.environ.get("STORAGE_LOCAL_ROOT", "storage")
+STORAGE_PUBLIC_URL = os.environ.get("STORAGE_PUBLIC_URL", "http://localhost:8000")
+STORAGE_MAX_CONNECTIONS = int(os.environ.get("STORAGE_MAX_CONNECTIONS", "32"))
+STORAGE_REMOVE_BATCH_SIZE = 1000
+STORAGE_TIMEOUTS = {
+    "default": float(os.environ.get("STORAGE_TIMEOUT_SECONDS", "30")),
+    "head": float(os.environ.get("STORAGE_HEAD_TIMEOUT_SECONDS", "5")),
+    "get": float(os.environ.get("STORAGE_GET_TIMEOUT_SECONDS", "30")),
+    "put": float(os.environ.get("UPLOAD_TIMEOUT_SECONDS", "60")),
+    "remove": float(os.environ.get("STORAGE_REMOVE_TIMEOUT_SECONDS", "30")),
+    "list": float(os.environ.get("STORAGE_LIST_TIMEOUT_SECONDS", "30")),
+}
+PUBLIC_BUCKETS = ("images", "avatars")
+
+DEFAULT_CACHE_CONTROL = "max-age=3600"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+UPLOAD_FAILED_MESSAGE = "Falha ao fazer upload do arquivo."
+
+
+class SupabaseStorage:
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+        self._slots = asyncio.Semaphore(STORAGE_MAX_CONNECTIONS)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=f"{supabase_url}/storage/v1",
+                limits=httpx.Limits(
+                    max_connections=STORAGE_MAX_CONNECTIONS,
+                    max_keepalive_connections=STORAGE_MAX_CONNECTIONS,
+                ),
+                timeout=STORAGE_TIMEOUTS["default"],
+            )
+        return self._client
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def headers(self, token: Optional[str] = None) -> dict:
+        return {
+            "apikey": supabase_anon_key if token else supabase_service_key,
+            "authorization": f"Bearer {token or supabase_service_key}",
+        }
+
+    async def request(self, operation: str, method: str, url: str, **options):
+        async with self._slots:
+            return await self.client.request(
+                method,
+                url,
+                timeout=STORAGE_TIMEOUTS[operation],
+                **{"headers": self.headers(), **options},
+            )
+
+    async def exists(self, bucket: str, path: str) -> bool:
+        response = await self.request(
+            "head", "HEAD", f"/object/authenticated/{bucket}/{quote(path)}"
+        )
+        return response.status_code == 200
+
+    async def put(
+        self,
+        bucket: str,
+        path: str,
+        data: bytes,
+        content_type: str,
+        token: Optional[str] = None,
+        upsert: bool = False,
+        exist_ok: bool = False,
+        cache_control: str = DEFAULT_CACHE_CONTROL,
+    ) -> None:
+        response = await self.request(
+            "put",
+            "POST",
+            f"/object/{bucket}/{quote(path)}",
+            content=data,
+            headers={
+                **self.headers(token),
+                "content-type": content_type,
+                "cache-control": cache_control,
+                "x-upsert": "true" if upsert else "false",
+            },
+        )
+        duplicate = response.status_code == 409 or "Duplicate" in response.text
+        if response.is_error and not (exist_ok and duplicate):
+            raise AppException("STORAGE_ERROR", UPLOAD_FAILED_MESSAGE)
+
+    async def read(self, bucket: str, path: str) -> Optional[bytes]:
+        response = await self.request(
+            "get", "GET", f"/object/authenticated/{bucket}/{quote(path)}"
+        )
+        if response.status_code in (400, 404):
+            return None
+        if response.is_error:
+            raise AppException("STORAGE_ERROR", "Falha ao ler o arquivo.")
+        return response.content
+
+    def public_url(self, bucket: str, path: str) -> str:
+        return f"{supabase_url}/storage/v1/object/public/{bucket}/{quote(path)}"
+
+    async def remove_batch(self, bucket: str, paths: List[str]) -> None:
+        response = await self.request(
+            "remove", "DELETE", f"/object/{bucket}", json={"prefixes": paths}
+        )
+        if response.is_error:
+            raise AppException("STORAGE_ERROR", "Falha ao remover os arquivos.")
+
+    async def remove(self, bucket: str, paths: List[str]) -> None:
+        await asyncio.gather(
+            *(
+                self.remove_batch(
+                    bucket, paths[start : start + STORAGE_REMOVE_BATCH_SIZE]
+                )
+                for start in range(0, len(paths), STORAGE_REMOVE_BATCH_SIZE)
+            )
+        )
+
+    async def list(
+        self, bucket: str, prefix: str, limit: int, offset: int
+    ) -> List[dict]:
+        response = await self.request(
+            "list",
+            "POST",
+            f"/object/list/{bucket}",
+            json={
+                "prefix": prefix,
+                "limit": limit,
+                "offset": offset,
+                "sortBy": {"column": "name", "order": "asc"},
+            },
+        )
+        if response.is_error:
+            raise AppException("STORAGE_ERROR", "Falha ao listar os arquivos.")
+        return response.json()
+
+
+class LocalStorage:
+    def __init__(self, root: str, public_url: str):
+        self.root = Path(root).resolve()
+        self.public_base = public_url.rstrip("/")
+
+    def file_path(self, bucket: str, path: str) -> Path:
+        bucket_root = self.root / bucket
+        target = (bucket_root / path).resolve()
+        if bucket not in PUBLIC_BUCKETS or not target.is_relative_to(bucket_root):
+            raise AppException("NOT_FOUND", "Arquivo não encontrado.")
+        return target
+
+    def meta_path(self, bucket: str, path: str) -> Path:
+        return self.root / ".meta" / bucket / f"{path}.json"
+
+    def write_atomic(self, target: Path, data: bytes) -> None:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=target.parent, prefix=".upload-", delete=False
+        ) as temporary:
+            temporary.write(data)
+            temporary.flush()
+            os.fsync(temporary.fileno())
+        os.replace(temporary.name, target)
+
+    def write(
+        self,
+        bucket: str,
+        path: str,
+        data: bytes,
+        content_type: str,
+        upsert: bool,
+        exist_ok: bool,
+        cache_control: str,
+    ) -> None:
+        target = self.file_path(bucket, path)
+        if target.exists() and not upsert:
+            if exist_ok:
+                return
+            raise AppException("STORAGE_ERROR", UPLOAD_FAILED_MESSAGE)
+
+        metadata = {"content_type": content_type, "cache_control": cache_control}
+        self.write_atomic(self.meta_path(bucket, path), json.dumps(metadata).encode())
+        self.write_atomic(target, data)
+
+    async def exists(self, bucket: str, path: str) -> bool:
+        return await asyncio.to_thread(self.file_path(bucket, path).is_file)
+
+    async def put(
+        self,
+        bucket: str,
+        path: str,
+        data: bytes,
+        content_type: str,
+        token: Optional[str] = None,
+        upsert: bool = False,
+        exist_ok: bool = False,
+        cache_control: str = DEFAULT_CACHE_CONTROL,
+    ) -> None:
+        try:
+            await asyncio.to_thread(
+                self.write,
+                bucket,
+                path,
+                data,
+                content_type,
+                upsert,
+                exist_ok,
+                cache_control,
+            )
+        except OSError:
+            raise AppException("STORAGE_ERROR", UPLOAD_FAILED_MESSAGE)
+
+    async def read(self, bucket: str, path: str) -> Optional[bytes]:
+        target = self.file_path(bucket, path)
+        try:
+            return await asyncio.to_thread(target.read_bytes)
+        except (FileNotFoundError, IsADirectoryError):
+            return None
+
+    def public_url(self, bucket: str, path: str) -> str:
+        return f"{self.public_base}/storage/{bucket}/{quote(path)}"
+
+    async def close(self) -> None:
+        pass
+
+    def remove_files(self, bucket: str, paths: List[str]) -> None:
+        for path in paths:
+            self.file_path(bucket, path).unlink(missing_ok=True)
+            self.meta_path(bucket, path).unlink(missing_ok=True)
+
+    async def remove(self, bucket: str, paths: List[str]) -> None:
+        await asyncio.to_thread(self.remove_files, bucket, paths)
+
+    async def list(
+        self, bucket: str, prefix: str, limit: int, offset: int
+    ) -> List[dict]:
+        return await asyncio.to_thread(
+            self.list_directory, bucket, prefix, limit, offset
+        )
+
+    def list_directory(
+        self, bucket: str, prefix: str, limit: int, offset: int
+    ) -> List[dict]:
+        directory = self.file_path(bucket, prefix) if prefix else self.root / bucket
+        if not directory.is_dir():
+            return []
+
+        entries = sorted(
+            (
+                entry
+                for entry in os.scandir(directory)
+                if not entry.name.startswith(".")
+            ),
+            key=lambda entry: entry.name,
+        )
+        listed = []
+        for entry in entries[offset : offset + limit]:
+            if entry.is_dir():
+                listed.append({"name": entry.name, "id": None})
+                continue
+            stat = entry.stat()
+            listed.append(
+                {
+                    "name": entry.name,
+                    "id": entry.name,
+                    "created_at": datetime.fromtimestamp(
+                        stat.st_mtime, timezone.utc
+                    ).isoformat(),
+                    "metadata": {"size": stat.st_size},
+                }
+            )
+        return listed
+
+    def open(self, bucket: str, path: str) -> Tuple[Path, dict]:
+        target = self.file_path(bucket, path)
+        if not target.is_file():
+            raise AppException("NOT_FOUND", "Arquivo não encontrado.")
+        try:
+            metadata = json.loads(self.meta_path(bucket, path).read_text())
+        except (OSError, ValueError):
+            metadata = {}
+        metadata.setdefault(
+            "content_type",
+            mimetypes.guess_type(target.name)[0] or "application/octet-stream",
+        )
+        metadata.setdefault("cache_control", DEFAULT_CACHE_CONTROL)
+        return target, metadata
+
+
+if STORAGE_BACKEND == "local":
+    storage = LocalStorage(STORAGE_LOCAL_ROOT, STORAGE_PUBLIC_URL)
+else:
+    storage = SupabaseStorage()
@@ -0,0 +1,88 @@
+import os
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.formparsers import MultiPartParser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+UPLOAD_MAX_FILE_BYTES = int(
+    os.environ.get("UPLOAD_MAX_FILE_BYTES", str(10 * 1024 * 1024))
+)
+UPLOAD_MAX_REQUEST_BYTES = int(
+    os.environ.get("UPLOAD_MAX_REQUEST_BYTES", str(40 * 1024 * 1024))
+)
+UPLOAD_SPOOL_THRESHOLD = int(os.environ.get("UPLOAD_SPOOL_THRESHOLD", str(256 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+MultiPartParser.spool_max_size = UPLOAD_SPOOL_THRESHOLD
+
+PAYLOAD_TOO_LARGE_MESSAGE = "O envio excede o tamanho máximo permitido."
+
+
+def is_multipart(scope: Scope) -> bool:
+    for name, value in scope.get("headers", []):
+        if name == b"content-type":
+            return value.lower().startswith(b"multipart/form-data")
+    return False
+
+
+def declared_length(scope: Scope):
+    for name, value in scope.get("headers", []):
+        if name == b"content-length":
+            try:
+                return int(value)
+            except ValueError:
+                return None
+    return None
+
+
+class UploadSizeLimitMiddleware:
+    def __init__(self, app: ASGIApp, max_bytes: int = UPLOAD_MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        too_large = JSONResponse(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            content={"error": PAYLOAD_TOO_LARGE_MESSAGE},
+        )
+        length = declared_length(scope)
+        if length is not None and length > self.max_bytes:
+            await too_large(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_sent = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def limited_send(message: Message) -> None:
+            nonlocal response_sent
+            if not exceeded:
+                await send(message)
+                return
+            if not response_sent:
+                response_sent = True
+                await too_large(scope, receive, send)
+
+        try:
+            await self.app(scope, limited_receive, limited_send)
+        except Exception:
+            if not exceeded:
+                raise
+            if not response_sent:
+                response_sent = True
+                await too_large(scope, receive, send)
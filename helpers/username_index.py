@@ -0,0 +1,186 @@
+import heapq
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from helpers.bloom import BloomFilter
+
+PREFIX_UPPER_BOUND = "\U0010ffff"
+FILTER_HEADROOM = 10000
+KEY_SEPARATOR = "\x00"
+
+
+def normalize_username(username: str) -> str:
+    return username.casefold()
+
+
+def index_key(username: str) -> str:
+    return f"{normalize_username(username)}{KEY_SEPARATOR}{username}"
+
+
+def normalized_part(key: str) -> str:
+    return key.partition(KEY_SEPARATOR)[0]
+
+
+def trigrams(text: str) -> Set[str]:
+    return {text[position : position + 3] for position in range(len(text) - 2)}
+
+
+class UsernameIndex:
+    def __init__(self):
+        self.loaded = False
+        self.complete = False
+        self._keys: List[str] = []
+        self._entries: Dict[str, dict] = {}
+        self._user_keys: Dict[str, str] = {}
+        self._trigrams: Dict[str, Set[str]] = {}
+        self._filter = BloomFilter(FILTER_HEADROOM)
+        self._pending: Optional[List[Tuple[str, tuple]]] = None
+
+    @classmethod
+    def from_profiles(
+        cls, profiles: Iterable[dict], expected_count: Optional[int] = None
+    ) -> "UsernameIndex":
+        index = cls()
+        for profile in profiles:
+            index._store(
+                str(profile["id"]),
+                {
+                    "username": profile["username"],
+                    "role": profile["role"],
+                    "avatar_url": profile.get("avatar_url"),
+                    "activity": profile.get("mensagens_count") or 0,
+                },
+            )
+        index._keys = sorted(index._entries)
+        index._filter = BloomFilter(len(index._entries) * 2 + FILTER_HEADROOM)
+        for entry in index._entries.values():
+            index._filter.add(entry["username"])
+        index.loaded = True
+        index.complete = (
+            expected_count is not None and len(index._user_keys) >= expected_count
+        )
+        return index
+
+    def _store(self, user_id: str, entry: dict) -> str:
+        key = index_key(entry["username"])
+        self._entries[key] = entry
+        self._user_keys[user_id] = key
+        for trigram in trigrams(normalized_part(key)):
+            self._trigrams.setdefault(trigram, set()).add(key)
+        return key
+
+    def _unstore(self, user_id: str) -> Optional[dict]:
+        key = self._user_keys.pop(user_id, None)
+        if key is None:
+            return None
+
+        entry = self._entries.pop(key, None)
+        position = bisect_left(self._keys, key)
+        if position < len(self._keys) and self._keys[position] == key:
+            del self._keys[position]
+        for trigram in trigrams(normalized_part(key)):
+            keys = self._trigrams.get(trigram)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._trigrams[trigram]
+        return entry
+
+    def begin_reload(self) -> None:
+        self._pending = []
+
+    def cancel_reload(self) -> None:
+        self._pending = None
+
+    def replace(self, other: "UsernameIndex") -> None:
+        pending = self._pending or []
+        self._keys = other._keys
+        self._entries = other._entries
+        self._user_keys = other._user_keys
+        self._trigrams = other._trigrams
+        self._filter = other._filter
+        self._pending = None
+        self.loaded = True
+        self.complete = other.complete
+
+        for operation, arguments in pending:
+            getattr(self, operation)(*arguments)
+
+    def upsert(
+        self,
+        user_id: str,
+        username: str,
+        role: Optional[str] = None,
+        avatar_url: Optional[str] = None,
+    ) -> None:
+        user_id = str(user_id)
+        if self._pending is not None:
+            self._pending.append(("upsert", (user_id, username, role, avatar_url)))
+
+        previous = self._unstore(user_id) or {}
+        key = self._store(
+            user_id,
+            {
+                "username": username,
+                "role": role or previous.get("role") or "Visitante",
+                "avatar_url": avatar_url or previous.get("avatar_url"),
+                "activity": previous.get("activity", 0),
+            },
+        )
+        position = bisect_left(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            self._keys.insert(position, key)
+        self._filter.add(username)
+
+    def remove(self, user_id: str) -> None:
+        user_id = str(user_id)
+        if self._pending is not None:
+            self._pending.append(("remove", (user_id,)))
+        self._unstore(user_id)
+
+    def contains(self, username: str) -> bool:
+        return index_key(username) in self._entries
+
+    def is_taken(self, username: str) -> Optional[bool]:
+        if username not in self._filter:
+            return False if self.complete else None
+        if self.contains(username):
+            return True
+        return None
+
+    def _rank(self, keys: Iterable[str], limit: int) -> List[str]:
+        return heapq.nlargest(
+            limit,
+            keys,
+            key=lambda key: (self._entries[key]["activity"], -len(key)),
+        )
+
+    def search(self, query: str, limit: int) -> List[dict]:
+        key = normalize_username(query)
+        start = bisect_left(self._keys, key)
+        end = bisect_left(self._keys, key + PREFIX_UPPER_BOUND, start)
+        matches = self._rank(self._keys[start:end], limit)
+
+        if len(matches) < limit and len(key) >= 3:
+            postings = sorted(
+                (self._trigrams.get(trigram, set()) for trigram in trigrams(key)),
+                key=len,
+            )
+            candidates = set.intersection(*postings) if postings[0] else set()
+            infix = (
+                candidate
+                for candidate in candidates
+                if key in normalized_part(candidate) and not candidate.startswith(key)
+            )
+            matches += self._rank(infix, limit - len(matches))
+
+        return [
+            {
+                field: self._entries[match][field]
+                for field in ("username", "role", "avatar_url")
+            }
+            for match in matches
+        ]
+
+
+username_index = UsernameIndex()
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from routes.auth_routes import auth_routes, auth_tag_metadata
@@ -10,7 +11,22 @@ from routes.user_routes import user_routes, user_tag_metadata
 from routes.follow_routes import follow_routes, follow_tag_metadata
 from routes.statistic_routes import statistic_router, statistic_tag_metadata
 from routes.admin_routes import admin_routes, admin_tag_metadata
+from routes.feed_routes import feed_routes, feed_tag_metadata
+from routes.storage_routes import storage_routes, storage_tag_metadata
+from routes.image_routes import image_routes, image_tag_metadata
 from helpers.exceptions import AppException, app_exception_handler
+from helpers.background import start_periodic_job, stop_background_jobs
+from helpers.storage import storage
+from helpers.upload_limits import UploadSizeLimitMiddleware
+from services import (
+    deletion_service,
+    follow_service,
+    feed_service,
+    image_service,
+    leaderboard_service,
+    storage_gc_service,
+    user_service,
+)
 import os
 from dotenv import load_dotenv
 
@@ -18,6 +34,53 @@ load_dotenv()
 
 cliente_app = os.getenv("FRONTEND_URL", "").split(",")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if follow_service.FOLLOW_GRAPH_ENABLED:
+        start_periodic_job(
+            follow_service.load_follow_graph,
+            follow_service.FOLLOW_GRAPH_REFRESH_SECONDS,
+            "follow_graph",
+        )
+    if follow_service.FOLLOW_SUGGESTIONS_ENABLED:
+        start_periodic_job(
+            follow_service.refresh_follow_suggestions,
+            follow_service.FOLLOW_SUGGESTIONS_REFRESH_SECONDS,
+            "follow_suggestions",
+        )
+    start_periodic_job(
+        user_service.load_username_index,
+        user_service.USERNAME_INDEX_REFRESH_SECONDS,
+        "username_index",
+    )
+    start_periodic_job(
+        feed_service.trim_feed_entries,
+        feed_service.FEED_TRIM_INTERVAL_SECONDS,
+        "feed_trim",
+    )
+    start_periodic_job(
+        leaderboard_service.rebuild_leaderboards,
+        leaderboard_service.LEADERBOARD_REBUILD_SECONDS,
+        "leaderboards",
+    )
+    start_periodic_job(
+        deletion_service.process_deletion_queue,
+        deletion_service.STORAGE_DELETION_INTERVAL_SECONDS,
+        "storage_deletions",
+    )
+    if storage_gc_service.STORAGE_GC_ENABLED:
+        start_periodic_job(
+            storage_gc_service.collect_all_garbage,
+            storage_gc_service.STORAGE_GC_INTERVAL_SECONDS,
+            "storage_gc",
+        )
+    yield
+    await stop_background_jobs()
+    image_service.shutdown_image_pool()
+    await storage.close()
+
+
 app = FastAPI(
     title="Auditore Fórum API",
     description="Documentação da API para o projeto de fórum.",
@@ -27,6 +90,9 @@ app = FastAPI(
         user_tag_metadata,
         profile_tag_metadata,
         follow_tag_metadata,
+        feed_tag_metadata,
+        storage_tag_metadata,
+        image_tag_metadata,
         statistic_tag_metadata,
         category_tag_metadata,
         topic_tag_metadata,
@@ -34,6 +100,7 @@ app = FastAPI(
         forum_tag_metadata,
         admin_tag_metadata,
     ],
+    lifespan=lifespan,
 )
 
 app.add_exception_handler(AppException, app_exception_handler)
@@ -45,9 +112,13 @@ app.include_router(topic_routes)
 app.include_router(profile_routes)
 app.include_router(user_routes)
 app.include_router(follow_routes)
+app.include_router(feed_routes)
 app.include_router(statistic_router)
 app.include_router(admin_routes)
+app.include_router(storage_routes)
+app.include_router(image_routes)
 
+app.add_middleware(UploadSizeLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cliente_app,
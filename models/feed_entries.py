@@ -0,0 +1,40 @@
+from sqlalchemy import (
+    Column,
+    DateTime,
+    BigInteger,
+    Integer,
+    ForeignKey,
+    Index,
+    UUID,
+)
+from .base import Base
+
+
+class FeedEntry(Base):
+    __tablename__ = "feed_entries"
+    __table_args__ = (
+        Index("idx_feed_entries_user_created", "user_id", "created_in", "id"),
+        Index("idx_feed_entries_user_author", "user_id", "author_id"),
+        {"schema": "public"},
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("public.profiles.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    author_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("public.profiles.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    topic_id = Column(
+        Integer, ForeignKey("public.topicos.id", ondelete="CASCADE"), nullable=False
+    )
+    comment_id = Column(
+        Integer,
+        ForeignKey("public.comentarios.id", ondelete="CASCADE"),
+        nullable=True,
+    )
+    created_in = Column(DateTime(timezone=True), nullable=False)
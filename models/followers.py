@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, CheckConstraint, UUID
+from sqlalchemy import Column, DateTime, ForeignKey, CheckConstraint, Index, UUID
 from sqlalchemy.sql import func
 from .base import Base
 
@@ -7,6 +7,18 @@ class Follower(Base):
     __tablename__ = "followers"
     __table_args__ = (
         CheckConstraint("follower_id <> following_id", name="check_not_following_self"),
+        Index(
+            "idx_followers_following_created",
+            "following_id",
+            "created_at",
+            "follower_id",
+        ),
+        Index(
+            "idx_followers_follower_created",
+            "follower_id",
+            "created_at",
+            "following_id",
+        ),
         {"schema": "public"},
     )
     follower_id = Column(
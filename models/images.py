@@ -6,7 +6,9 @@ from sqlalchemy import (
     ForeignKey,
     CheckConstraint,
     UUID,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
 from .base import Base
 
@@ -23,7 +25,8 @@ class Imagem(Base):
     )
 
     id = Column(Integer, primary_key=True)
-    url = Column(Text, nullable=False)
+    url = Column(Text, index=True, nullable=False)
+    variants = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
     topic_id = Column(
         Integer,
         ForeignKey("public.topicos.id", ondelete="CASCADE"),
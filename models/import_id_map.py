@@ -0,0 +1,15 @@
+from sqlalchemy import BigInteger, Column, DateTime, Text
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class ImportIdMap(Base):
+    __tablename__ = "import_id_map"
+    __table_args__ = {"schema": "public"}
+
+    table_name = Column(Text, primary_key=True)
+    legacy_id = Column(BigInteger, primary_key=True)
+    new_id = Column(BigInteger, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -1,13 +1,29 @@
 import uuid
-from sqlalchemy import Column, String, Text, Date, DateTime, Integer, ForeignKey, UUID
-from sqlalchemy.dialects.postgresql import ENUM as SQLAlchemyEnum
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    Date,
+    DateTime,
+    Integer,
+    ForeignKey,
+    Index,
+    UUID,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ENUM as SQLAlchemyEnum, JSONB
 from sqlalchemy.sql import func
 from .base import Base, UserRole
 
 
 class Profile(Base):
     __tablename__ = "profiles"
-    __table_args__ = {"schema": "public"}
+    __table_args__ = (
+        Index("idx_profiles_joined_at_username", "joined_at", "username"),
+        Index("idx_profiles_last_login_username", "last_login", "username"),
+        Index("idx_profiles_mensagens_count_username", "mensagens_count", "username"),
+        {"schema": "public"},
+    )
     id = Column(
         UUID(as_uuid=True),
         ForeignKey("auth.users.id", ondelete="CASCADE"),
@@ -33,7 +49,8 @@ class Profile(Base):
     instagram = Column(Text, nullable=True)
     discord = Column(Text, nullable=True)
     steam = Column(Text, nullable=True)
-    avatar_url = Column(Text, nullable=True)
+    avatar_url = Column(Text, index=True, nullable=True)
+    avatar_variants = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
     followers_count = Column(Integer, nullable=False, default=0)
     following_count = Column(Integer, nullable=False, default=0)
     mensagens_count = Column(Integer, nullable=False, default=0)
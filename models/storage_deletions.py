@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, Text
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class StorageDeletion(Base):
+    __tablename__ = "storage_deletions"
+    __table_args__ = (
+        Index("idx_storage_deletions_due", "attempts", "next_attempt_at"),
+        {"schema": "public"},
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    bucket = Column(Text, nullable=False)
+    path = Column(Text, nullable=False)
+    reference_url = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    next_attempt_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
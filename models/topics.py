@@ -5,6 +5,7 @@ from sqlalchemy import (
     Integer,
     ForeignKey,
     CheckConstraint,
+    Index,
     UUID,
 )
 from sqlalchemy.sql import func
@@ -15,6 +16,7 @@ class Topico(Base):
     __tablename__ = "topicos"
     __table_args__ = (
         CheckConstraint("length(content) <= 2000", name="content_length_check"),
+        Index("idx_topicos_author_created", "author_id", "created_in", "id"),
         {"schema": "public"},
     )
 
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, DateTime, Integer, ForeignKey, UUID
+from sqlalchemy.sql import func
+from .base import Base
+
+
+class UserStats(Base):
+    __tablename__ = "user_stats"
+    __table_args__ = {"schema": "public"}
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("public.profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    topics_count = Column(Integer, nullable=False, default=0)
+    messages_count = Column(Integer, nullable=False, default=0)
+    last_topic_at = Column(DateTime(timezone=True), nullable=True)
+    last_post_at = Column(DateTime(timezone=True), nullable=True)
+    computed_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
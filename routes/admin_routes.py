@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Response, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, Response, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from typing import Literal, Optional
 from urllib.parse import unquote
 from services.auth_service import login_user
 from routes.auth_routes import set_auth_cookies
 from schemas.auth_schemas import UserLogin
 from schemas.category_schemas import CategoryCreate, Category, UpdateCategory
-from services import category_service
+from services import category_service, export_service
+from helpers.dependencies import get_required_admin_user
+from helpers.export import EXPORT_FORMATS
 
 admin_tag_metadata = {
     "name": "Administração",
@@ -96,3 +101,28 @@ async def get_category_details(slug: str):
 async def delete_category_route(slug: str):
     await category_service.delete_category(slug)
     return {"message": f"Categoria deletada com sucesso."}
+
+
+@admin_routes.get(
+    "/export/{table}",
+    status_code=status.HTTP_200_OK,
+    summary="Exporta uma tabela do fórum em CSV, NDJSON ou Parquet",
+)
+async def export_table_route(
+    table: Literal["topicos", "comentarios", "profiles", "followers"],
+    output_format: Literal["csv", "ndjson", "parquet"] = Query(
+        "ndjson", alias="format"
+    ),
+    since: Optional[datetime] = None,
+    admin_user: dict = Depends(get_required_admin_user),
+):
+    chunks, watermark = await export_service.export_table(table, output_format, since)
+    media_type, extension = EXPORT_FORMATS[output_format]
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{table}.{extension}"',
+            "X-Export-Watermark": watermark,
+        },
+    )
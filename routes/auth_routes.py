@@ -1,5 +1,5 @@
 import os
-from fastapi import APIRouter, Request, Response, status, Depends, HTTPException
+from fastapi import APIRouter, Request, Response, status, Depends, HTTPException, Query
 from typing import Optional
 from fastapi.responses import JSONResponse
 from helpers.exceptions import AppException
@@ -11,6 +11,7 @@ from services.auth_service import (
     update_authenticated_user_password,
     delete_user_account,
 )
+from services.user_service import is_username_available
 from schemas.auth_schemas import (
     UserCreate,
     UserLogin,
@@ -21,6 +22,7 @@ from schemas.auth_schemas import (
     AccountDelete,
     UserCurrent,
     MessageResponse,
+    UsernameAvailability,
 )
 from helpers.dependencies import (
     get_current_user,
@@ -44,6 +46,19 @@ async def register(user_data: UserCreate):
     return await register_user(user_data)
 
 
+@auth_routes.get(
+    "/username-available",
+    response_model=UsernameAvailability,
+    summary="Verifica se um nome de usuário está disponível",
+    status_code=status.HTTP_200_OK,
+)
+async def username_available(
+    username: str = Query(..., min_length=3, max_length=50),
+):
+    available = await is_username_available(username)
+    return {"username": username, "available": available}
+
+
 @auth_routes.post(
     "/login", summary="Autentica um usuário", status_code=status.HTTP_200_OK
 )
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends, status, Query
+from typing import Optional
+from services import feed_service
+from schemas.feed_schemas import FeedPage
+from helpers.dependencies import get_current_user, UserCurrent
+
+feed_tag_metadata = {
+    "name": "Feed",
+    "description": "Endpoints para o feed de atividades dos usuários seguidos.",
+}
+
+feed_routes = APIRouter(prefix="/feed", tags=[feed_tag_metadata["name"]])
+
+
+@feed_routes.get(
+    "",
+    response_model=FeedPage,
+    status_code=status.HTTP_200_OK,
+    summary="Obtém os tópicos e comentários recentes dos usuários seguidos",
+)
+async def get_feed(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: UserCurrent = Depends(get_current_user),
+):
+    return await feed_service.get_feed(str(current_user.id), limit, cursor)
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, status, Query
+from typing import Literal, Optional
 from services import follow_service
 from schemas.follow_schemas import (
-    followerProfile,
+    FollowListPage,
+    FollowSuggestion,
     FollowStatsResponse,
     FollowingStatsResponse,
+    BulkFollowingStatusRequest,
+    BulkFollowingStatusResponse,
     GenericMessageResponse,
 )
 from helpers.dependencies import get_current_user, UserCurrent
@@ -16,6 +20,19 @@ follow_tag_metadata = {
 follow_routes = APIRouter(prefix="/follow", tags=[follow_tag_metadata["name"]])
 
 
+@follow_routes.get(
+    "/suggestions",
+    response_model=list[FollowSuggestion],
+    status_code=status.HTTP_200_OK,
+    summary="Obtém sugestões de usuários para o usuário logado seguir",
+)
+async def get_follow_suggestions(
+    limit: int = Query(10, ge=1, le=50),
+    current_user: UserCurrent = Depends(get_current_user),
+):
+    return await follow_service.get_follow_suggestions(str(current_user.id), limit)
+
+
 @follow_routes.post(
     "/{username}/follow",
     response_model=GenericMessageResponse,
@@ -54,22 +71,32 @@ async def get_follow_stats(username: str):
 
 @follow_routes.get(
     "/{username}/followers",
-    response_model=list[followerProfile],
+    response_model=FollowListPage,
     status_code=status.HTTP_200_OK,
-    summary="Obtém a lista de seguidores de um usuário",
+    summary="Obtém a lista paginada de seguidores de um usuário",
 )
-async def get_followers(username: str):
-    return await follow_service.get_followers(username)
+async def get_followers(
+    username: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    order: Literal["desc", "asc"] = "desc",
+):
+    return await follow_service.get_followers(username, limit, cursor, order)
 
 
 @follow_routes.get(
     "/{username}/following",
-    response_model=list[followerProfile],
+    response_model=FollowListPage,
     status_code=status.HTTP_200_OK,
-    summary="Obtém a lista de usuários que um usuário está seguindo",
+    summary="Obtém a lista paginada de usuários que um usuário está seguindo",
 )
-async def get_following(username: str):
-    return await follow_service.get_following(username)
+async def get_following(
+    username: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    order: Literal["desc", "asc"] = "desc",
+):
+    return await follow_service.get_following(username, limit, cursor, order)
 
 
 @follow_routes.get(
@@ -84,6 +111,22 @@ async def is_following_user(
     return await follow_service.check_following_status(str(current_user.id), username)
 
 
+@follow_routes.post(
+    "/is-following",
+    response_model=BulkFollowingStatusResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Verifica em lote se o usuário logado está seguindo vários usuários",
+)
+async def are_following_users(
+    body: BulkFollowingStatusRequest,
+    current_user: UserCurrent = Depends(get_current_user),
+):
+    statuses = await follow_service.check_following_statuses(
+        str(current_user.id), body.usernames
+    )
+    return {"statuses": statuses}
+
+
 @follow_routes.delete(
     "/followers/{username}",
     response_model=GenericMessageResponse,
@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Literal
+from helpers.image_cache import iter_mapped
+from helpers.images import DERIVATIVE_FORMATS
+from helpers.upload_limits import UPLOAD_CHUNK_SIZE
+from services import image_proxy_service
+
+image_tag_metadata = {
+    "name": "Imagens",
+    "description": "Redimensionamento de imagens sob demanda com cache em disco.",
+}
+
+image_routes = APIRouter(prefix="/img", tags=[image_tag_metadata["name"]])
+
+
+@image_routes.get(
+    "/{bucket}/{path:path}",
+    status_code=status.HTTP_200_OK,
+    summary="Entrega uma imagem redimensionada para a largura pedida",
+)
+async def resize_image(
+    bucket: str,
+    path: str,
+    request: Request,
+    w: int = Query(..., ge=1, le=4096),
+    fmt: Literal["webp", "jpeg"] = "webp",
+):
+    file, size, key = await image_proxy_service.get_resized(bucket, path, w, fmt)
+    headers = {
+        "etag": f'"{key}"',
+        "cache-control": image_proxy_service.IMAGE_PROXY_CACHE_CONTROL,
+    }
+    if request.headers.get("if-none-match") == headers["etag"]:
+        file.close()
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return StreamingResponse(
+        iter_mapped(file, UPLOAD_CHUNK_SIZE),
+        media_type=DERIVATIVE_FORMATS[fmt][1],
+        headers={**headers, "content-length": str(size)},
+        background=BackgroundTask(file.close),
+    )
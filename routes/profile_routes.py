@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status, UploadFile, File
+from fastapi import APIRouter, Depends, status, UploadFile, File, Request, Response
 from schemas.profile_schemas import (
     ProfilePublic,
     ProfileDataUpdate,
@@ -8,6 +8,7 @@ from schemas.profile_schemas import (
 )
 from services import profile_service
 from helpers.dependencies import get_current_user, get_current_token, UserCurrent
+from helpers.cache import etag_matches
 
 profile_tag_metadata = {
     "name": "Perfis de Usuário",
@@ -17,6 +18,19 @@ profile_tag_metadata = {
 profile_routes = APIRouter(prefix="/profile", tags=[profile_tag_metadata["name"]])
 
 
+async def conditional_profile_response(
+    username: str, request: Request, response: Response
+):
+    profile, etag = await profile_service.get_user_profile_with_etag(username)
+    cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers)
+
+    response.headers.update(cache_headers)
+    return profile
+
+
 @profile_routes.get(
     "/{username}",
     response_model=ProfilePublic,
@@ -25,9 +39,11 @@ profile_routes = APIRouter(prefix="/profile", tags=[profile_tag_metadata["name"]
 )
 async def get_profile_by_username(
     username: str,
+    request: Request,
+    response: Response,
 ):
 
-    return await profile_service.get_user_profile_by_username(username)
+    return await conditional_profile_response(username, request, response)
 
 
 @profile_routes.get(
@@ -36,8 +52,8 @@ async def get_profile_by_username(
     status_code=status.HTTP_200_OK,
     summary="Obtém o perfil de um usuário pelo nome de usuário",
 )
-async def get_user_profile(username: str):
-    return await profile_service.get_user_profile_by_username(username)
+async def get_user_profile(username: str, request: Request, response: Response):
+    return await conditional_profile_response(username, request, response)
 
 
 @profile_routes.put(
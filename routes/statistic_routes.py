@@ -1,10 +1,14 @@
-from fastapi import APIRouter
-from services import statistic_service
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from services import statistic_service, leaderboard_service
 from schemas.statistic_schemas import (
     UseStatsResponse,
     TopicByAuthor,
+    TopicsByAuthorPage,
+    LeaderboardEntry,
+    UserActivityResponse,
 )
-from typing import List
+from typing import List, Literal, Optional
 
 statistic_tag_metadata = {
     "name": "Estatísticas",
@@ -20,7 +24,44 @@ async def get_user_statistics(username: str):
     return stats
 
 
-@statistic_router.get("/profile/{username}/topics", response_model=List[TopicByAuthor])
-async def get_topics_by_author_controller(username: str):
-    topics = await statistic_service.get_topics_by_author(username)
+@statistic_router.get("/profile/{username}/topics", response_model=TopicsByAuthorPage)
+async def get_topics_by_author_controller(
+    username: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+):
+    if output_format == "ndjson":
+        rows = await statistic_service.stream_topics_by_author(username)
+        return StreamingResponse(
+            (
+                TopicByAuthor.model_validate(row).model_dump_json() + "\n"
+                for row in rows
+            ),
+            media_type="application/x-ndjson",
+        )
+
+    topics = await statistic_service.get_topics_by_author(username, limit, cursor)
     return topics
+
+
+@statistic_router.get(
+    "/profile/{username}/activity",
+    response_model=UserActivityResponse,
+    summary="Obtém o histórico de atividade de um usuário",
+)
+async def get_user_activity_controller(username: str):
+    activity = await statistic_service.get_user_activity(username)
+    return activity
+
+
+@statistic_router.get(
+    "/leaderboards/{board}",
+    response_model=List[LeaderboardEntry],
+    summary="Obtém um ranking de usuários ou tópicos",
+)
+async def get_leaderboard_controller(
+    board: Literal["posters", "followed", "topics"],
+    window: Literal["all", "30d", "7d"] = "all",
+):
+    return await leaderboard_service.get_leaderboard(board, window)
@@ -0,0 +1,42 @@
+import asyncio
+from fastapi import APIRouter, Request, Response, status
+from fastapi.responses import FileResponse
+from helpers.exceptions import AppException
+from helpers.storage import LocalStorage, storage
+
+storage_tag_metadata = {
+    "name": "Arquivos",
+    "description": "Entrega dos arquivos enviados quando o armazenamento é local.",
+}
+
+storage_routes = APIRouter(prefix="/storage", tags=[storage_tag_metadata["name"]])
+
+
+@storage_routes.head("/{bucket}/{path:path}", include_in_schema=False)
+@storage_routes.get(
+    "/{bucket}/{path:path}",
+    status_code=status.HTTP_200_OK,
+    summary="Entrega um arquivo do armazenamento local",
+)
+async def serve_file(bucket: str, path: str, request: Request):
+    if not isinstance(storage, LocalStorage):
+        raise AppException("NOT_FOUND", "Arquivo não encontrado.")
+
+    file_path, metadata = await asyncio.to_thread(storage.open, bucket, path)
+    stat_result = await asyncio.to_thread(file_path.stat)
+    response = FileResponse(
+        file_path,
+        media_type=metadata["content_type"],
+        headers={"cache-control": metadata["cache_control"]},
+        stat_result=stat_result,
+    )
+
+    if request.headers.get("if-none-match") == response.headers["etag"]:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={
+                "etag": response.headers["etag"],
+                "cache-control": metadata["cache_control"],
+            },
+        )
+    return response
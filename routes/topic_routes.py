@@ -31,19 +31,18 @@ async def create_topic_route(
     images: List[UploadFile] = File([]),
     current_user: UserCurrent = Depends(get_current_user),
 ):
-    image_urls = []
-    if images:
-        for image_file in images:
-            if image_file.filename:
-                url = await upload_service.upload_file(image_file)
-                image_urls.append(url)
-    new_topic = await topic_service.create_topic(
-        title=title,
-        content=content,
-        author_id=str(current_user.id),
-        category=category,
-        images=image_urls if image_urls else None,
-    )
+    uploaded_images = await upload_service.upload_files(images)
+    try:
+        new_topic = await topic_service.create_topic(
+            title=title,
+            content=content,
+            author_id=str(current_user.id),
+            category=category,
+            images=uploaded_images if uploaded_images else None,
+        )
+    except Exception:
+        upload_service.discard_uploads(uploaded_images)
+        raise
 
     topic_details = await topic_service.get_topic_by_field("id", new_topic["id"], 1, 0)
     return topic_details["data"]
@@ -112,19 +111,17 @@ async def create_comment_route(
     images: List[UploadFile] = File([]),
     current_user: UserCurrent = Depends(get_current_user),
 ):
-    image_urls = []
-    if images:
-        for image_file in images:
-            if image_file.filename:
-                url = await upload_service.upload_file(image_file)
-                image_urls.append(url)
-
-    return await topic_service.create_comment(
-        content=content,
-        author_id=str(current_user.id),
-        topic_id=topic_id,
-        images=image_urls if image_urls else None,
-    )
+    uploaded_images = await upload_service.upload_files(images)
+    try:
+        return await topic_service.create_comment(
+            content=content,
+            author_id=str(current_user.id),
+            topic_id=topic_id,
+            images=uploaded_images if uploaded_images else None,
+        )
+    except Exception:
+        upload_service.discard_uploads(uploaded_images)
+        raise
 
 
 @topic_routes.patch(
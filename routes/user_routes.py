@@ -6,7 +6,8 @@ from fastapi import (
     WebSocket,
     WebSocketDisconnect,
 )
-from schemas.user_schemas import AllUserResponse
+from typing import List, Literal, Optional
+from schemas.user_schemas import AllUserResponse, UserSearchResult
 from services import user_service
 from helpers.dependencies import get_current_user_ws, UserCurrent
 
@@ -47,6 +48,26 @@ async def websocket_ping(
     summary="Obtém uma lista paginada de todos os perfis de usuário",
 )
 async def get_all_users(
-    page: int = Query(1, ge=1), limit: int = Query(20, ge=1, le=100)
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    sort: Literal[
+        "joined_at", "last_login", "mensagens_count", "username"
+    ] = "username",
+    order: Literal["asc", "desc"] = "asc",
 ):
-    return await user_service.get_all_profiles(page=page, limit=limit)
+    return await user_service.get_all_profiles(
+        limit=limit, cursor=cursor, sort=sort, order=order
+    )
+
+
+@user_routes.get(
+    "/search",
+    response_model=List[UserSearchResult],
+    status_code=status.HTTP_200_OK,
+    summary="Busca usuários pelo início ou por parte do nome de usuário",
+)
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=32),
+    limit: int = Query(10, ge=1, le=50),
+):
+    return await user_service.search_users(q, limit)
@@ -57,5 +57,10 @@ class AccountDelete(CamelCaseModel):
     password: str
 
 
+class UsernameAvailability(BaseModel):
+    username: str
+    available: bool
+
+
 class MessageResponse(BaseModel):
     message: str
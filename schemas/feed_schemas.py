@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Optional, Literal
+from datetime import datetime
+
+
+class FeedAuthor(BaseModel):
+    username: str
+    avatar_url: Optional[HttpUrl] = None
+    role: str
+
+
+class FeedTopic(BaseModel):
+    id: int
+    title: str
+    slug: str
+    category: str
+
+
+class FeedComment(BaseModel):
+    id: int
+    content: str
+
+
+class FeedItem(BaseModel):
+    type: Literal["topic", "comment"]
+    created_in: datetime = Field(..., alias="createdIn")
+    author: FeedAuthor
+    topic: FeedTopic
+    comment: Optional[FeedComment] = None
+
+    class Config:
+        populate_by_name = True
+
+
+class FeedPage(BaseModel):
+    data: List[FeedItem]
+    nextCursor: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, HttpUrl
-from typing import Optional
+from typing import Dict, Optional, List
 
 
 class FollowStatsResponse(BaseModel):
@@ -14,6 +14,19 @@ class followerProfile(BaseModel):
     avatar_url: Optional[HttpUrl] = None
 
 
+class FollowSuggestion(followerProfile):
+    shared_count: int = Field(..., alias="sharedCount")
+    score: float
+
+    class Config:
+        populate_by_name = True
+
+
+class FollowListPage(BaseModel):
+    data: List[followerProfile]
+    nextCursor: Optional[str] = None
+
+
 class FollowingStatsResponse(BaseModel):
     is_following: bool = Field(..., alias="isFollowing")
 
@@ -21,5 +34,13 @@ class FollowingStatsResponse(BaseModel):
         populate_by_name = True
 
 
+class BulkFollowingStatusRequest(BaseModel):
+    usernames: List[str] = Field(..., min_length=1, max_length=300)
+
+
+class BulkFollowingStatusResponse(BaseModel):
+    statuses: Dict[str, bool]
+
+
 class GenericMessageResponse(BaseModel):
     message: str
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field, HttpUrl
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
+from schemas.topic_schemas import ImageVariant
 
 
 class ProfileBase(BaseModel):
@@ -20,6 +21,7 @@ class ProfilePublic(ProfileBase):
     last_login: Optional[datetime]
     role: str
     avatar_url: Optional[HttpUrl] = None
+    avatar_variants: List[ImageVariant] = []
     followers_count: int = 0
     following_count: int = 0
     mensagens_count: int = 0
@@ -43,6 +45,7 @@ class ProfileDataUpdate(BaseModel):
 
 class AvatarUpdateResponse(BaseModel):
     avatar_url: Optional[HttpUrl] = None
+    avatar_variants: List[ImageVariant] = []
 
 
 class MessageResponse(BaseModel):
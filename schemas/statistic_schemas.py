@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, HttpUrl
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
 
 
 class AuthorProfile(BaseModel):
@@ -21,6 +21,47 @@ class TopicByAuthor(BaseModel):
     comentarios: List[CommentCount]
 
 
+class TopicsByAuthorPage(BaseModel):
+    data: List[TopicByAuthor]
+    nextCursor: Optional[str] = None
+
+
+class LeaderboardUser(BaseModel):
+    username: str
+    role: str
+    avatar_url: Optional[HttpUrl] = None
+
+
+class LeaderboardTopic(BaseModel):
+    title: str
+    slug: str
+    category: str
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    score: int
+    user: Optional[LeaderboardUser] = None
+    topic: Optional[LeaderboardTopic] = None
+
+
+class DailyActivity(BaseModel):
+    date: date
+    count: int
+
+
+class ActivityHeatmap(BaseModel):
+    start: date
+    weeks: List[List[int]]
+
+
+class UserActivityResponse(BaseModel):
+    totalPosts: int
+    postsPerDay: List[DailyActivity]
+    postsPerHourOfWeek: List[List[int]]
+    heatmap: ActivityHeatmap
+
+
 class UseStatsResponse(BaseModel):
     topics_count: int = Field(..., alias="topicsCount")
     topics_per_day: float = Field(..., alias="topicsPerDay")
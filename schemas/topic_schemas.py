@@ -3,15 +3,23 @@ from typing import List, Optional
 from datetime import datetime
 
 
+class ImageVariant(BaseModel):
+    width: int
+    format: str
+    url: HttpUrl
+
+
 class ProfileNested(BaseModel):
     username: str
     avatar_url: Optional[HttpUrl] = None
+    avatar_variants: List[ImageVariant] = []
     role: str
 
 
 class ImageNested(BaseModel):
     id: int
     url: HttpUrl
+    variants: List[ImageVariant] = []
 
 
 class CommentNested(BaseModel):
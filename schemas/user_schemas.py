@@ -14,8 +14,15 @@ class AllUsersProfile(BaseModel):
 
 class AllUserResponse(BaseModel):
     data: List[AllUsersProfile]
+    nextCursor: Optional[str] = None
     total_count: int
 
 
+class UserSearchResult(BaseModel):
+    username: str
+    role: str
+    avatar_url: Optional[HttpUrl] = None
+
+
 class Config:
     from_attributes = True
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers.exceptions import AppException
+from helpers.export import EXPORT_FORMATS
+from services.export_service import EXPORT_TABLES, export_table
+
+
+async def export_to_file(table: str, output_format: str, since, output_dir: Path):
+    chunks, watermark = await export_table(table, output_format, since)
+    path = output_dir / f"{table}.{EXPORT_FORMATS[output_format][1]}"
+    written = 0
+    with open(path, "wb") as output:
+        for chunk in chunks:
+            output.write(chunk)
+            written += len(chunk)
+            print(f"\r{table}: {written / 1024 / 1024:.1f} MiB", end="", flush=True)
+    print(f"\r{table}: {written / 1024 / 1024:.1f} MiB -> {path}")
+    return watermark
+
+
+async def main(tables, output_format: str, since, output_dir: Path):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    watermarks = []
+    for table in tables:
+        watermarks.append(await export_to_file(table, output_format, since, output_dir))
+    print(f"Marca d'água para a próxima exportação incremental: {min(watermarks)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Exporta tabelas do fórum em blocos ordenados por chave."
+    )
+    parser.add_argument(
+        "tables", nargs="*", choices=list(EXPORT_TABLES), default=list(EXPORT_TABLES)
+    )
+    parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Exporta apenas linhas criadas ou alteradas após esta data (ISO 8601).",
+    )
+    parser.add_argument("--output-dir", type=Path, default=Path("exports"))
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.tables, args.format, args.since, args.output_dir))
+    except AppException as e:
+        raise SystemExit(e.message)
@@ -0,0 +1,49 @@
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from helpers.exceptions import AppException
+from helpers.storage import storage
+from services.storage_gc_service import (
+    GC_BUCKETS,
+    STORAGE_GC_GRACE_HOURS,
+    collect_garbage,
+)
+
+
+async def main(buckets, dry_run: bool, grace_hours: float):
+    try:
+        for bucket in buckets:
+            report = await collect_garbage(
+                bucket, dry_run=dry_run, grace_hours=grace_hours
+            )
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+    finally:
+        await storage.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Encontra arquivos no Storage que não são referenciados por imagens "
+            "ou avatares e os envia para a fila de remoção."
+        )
+    )
+    parser.add_argument(
+        "buckets", nargs="*", choices=list(GC_BUCKETS), default=list(GC_BUCKETS)
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Apenas relata os arquivos órfãos, sem removê-los.",
+    )
+    parser.add_argument("--grace-hours", type=float, default=STORAGE_GC_GRACE_HOURS)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.buckets, args.dry_run, args.grace_hours))
+    except AppException as e:
+        raise SystemExit(e.message)
@@ -0,0 +1,75 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.import_service import (
+    IMPORT_BATCH_SIZE,
+    IMPORT_TABLES,
+    ImportState,
+    connect,
+    finalize_import,
+    import_table,
+)
+
+
+def progress_reporter():
+    started = time.monotonic()
+
+    def report(table: str, progress: dict):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        print(
+            f"\r{table}: {progress['imported']} importadas, "
+            f"{progress['rejected']} rejeitadas "
+            f"({progress['imported'] / elapsed:.0f} linhas/s)",
+            end="",
+            flush=True,
+        )
+
+    return report
+
+
+def main(args):
+    state = ImportState(args.state or args.dump_dir / "import_state.json")
+    connection = connect(args.database_url)
+    try:
+        with open(args.dump_dir / "rejected.ndjson", "a", encoding="utf-8") as rejects:
+            for table in IMPORT_TABLES:
+                path = args.dump_dir / f"{table}.ndjson"
+                if not path.exists():
+                    print(f"{table}: arquivo {path.name} não encontrado, ignorando.")
+                    continue
+                import_table(
+                    connection,
+                    table,
+                    path,
+                    state,
+                    rejects,
+                    progress_reporter(),
+                    args.batch_size,
+                )
+                print()
+
+        if not args.skip_counters:
+            print("Recalculando contadores...")
+            finalize_import(connection)
+    finally:
+        connection.close()
+    print("Importação concluída.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Importa um dump NDJSON de outro fórum (topicos, comentarios, imagens "
+            "e followers) em lotes transacionais, com retomada."
+        )
+    )
+    parser.add_argument("dump_dir", type=Path)
+    parser.add_argument("--database-url")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+    parser.add_argument("--state", type=Path)
+    parser.add_argument("--skip-counters", action="store_true")
+    main(parser.parse_args())
@@ -11,20 +11,19 @@ from schemas.auth_schemas import UserCurrent
 from helpers.exceptions import AppException
 from schemas.auth_schemas import UserCreate
 from supabase import AuthApiError
+from services.profile_service import invalidate_profile_cache
+from services.user_service import (
+    index_username,
+    is_username_available,
+    remove_username_from_index,
+)
 
 ONE_HOUR = 60 * 60
 THIRTY_DAYS = 60 * 60 * 24 * 30
 
 
 async def register_user(user_data: UserCreate):
-    existing_user_req = (
-        supabase.from_("profiles")
-        .select("id")
-        .eq("username", user_data.username)
-        .execute()
-    )
-
-    if existing_user_req.data:
+    if not await is_username_available(user_data.username):
         raise AppException(
             type="CONFLICT", message="Este nome de usuário já está em uso."
         )
@@ -60,13 +59,18 @@ async def register_user(user_data: UserCreate):
     try:
         profile_data = {"id": user_id, "username": user_data.username}
         supabase.from_("profiles").insert(profile_data).execute()
-    except Exception:
+    except Exception as e:
         if user_id:
             supabase_admin.auth.admin.delete_user(user_id)
+        if getattr(e, "code", None) == "23505":
+            raise AppException(
+                type="CONFLICT", message="Este nome de usuário já está em uso."
+            )
         raise AppException(
             type="INTERNAL_SERVER_ERROR", message="Falha ao criar o perfil do usuário."
         )
 
+    index_username(user_id, user_data.username)
     return {"message": "Usuário registrado com sucesso!"}
 
 
@@ -100,6 +104,7 @@ async def login_user(email: str, password: str, keep_logged: bool):
         supabase.from_("profiles").update(
             {"last_login": datetime.now(timezone.utc).isoformat()}
         ).eq("id", session.user.id).execute()
+        invalidate_profile_cache(user_id=user_id)
 
         return {
             "access_token": session.session.access_token,
@@ -141,7 +146,7 @@ async def get_user_by_token(token: str):
             "username": profile_response.data["username"],
             "role": profile_response.data["role"],
             "avatar_url": profile_response.data["avatar_url"],
-            "access_token": token
+            "access_token": token,
         }
     except Exception:
         raise AppException(
@@ -254,4 +259,6 @@ async def delete_user_account(user_id: str, email: str, password: str):
             message="Não foi possível deletar a conta do usuário.",
         )
 
+    remove_username_from_index(user_id)
+    invalidate_profile_cache(user_id=user_id)
     return {"message": "Conta de usuário deletada com sucesso."}
@@ -0,0 +1,218 @@
+import asyncio
+import os
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from config.supabase_client import supabase_admin as supabase
+from helpers.exceptions import AppException
+from helpers.pagination import quote_filter_value
+from helpers.storage import storage
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+STORAGE_DELETION_INTERVAL_SECONDS = float(
+    os.environ.get("STORAGE_DELETION_INTERVAL_SECONDS", "5")
+)
+STORAGE_DELETION_BATCH_SIZE = int(os.environ.get("STORAGE_DELETION_BATCH_SIZE", "500"))
+STORAGE_DELETION_MAX_ATTEMPTS = int(
+    os.environ.get("STORAGE_DELETION_MAX_ATTEMPTS", "8")
+)
+STORAGE_DELETION_DELAY_SECONDS = float(
+    os.environ.get("STORAGE_DELETION_DELAY_SECONDS", "60")
+)
+STORAGE_DELETION_CLAIM_TIMEOUT_SECONDS = 600
+STORAGE_DELETION_CLAIM_WAIT_SECONDS = 30
+STORAGE_DELETION_BACKOFF_SECONDS = 30
+
+
+def enqueue_deletions(
+    bucket: str, objects: Iterable[Tuple[str, Optional[str]]]
+) -> None:
+    due_at = datetime.now(timezone.utc) + timedelta(
+        seconds=STORAGE_DELETION_DELAY_SECONDS
+    )
+    rows = [
+        {
+            "bucket": bucket,
+            "path": path,
+            "reference_url": reference_url,
+            "next_attempt_at": due_at.isoformat(),
+        }
+        for path, reference_url in dict.fromkeys(objects)
+    ]
+    if not rows:
+        return
+    try:
+        supabase.from_("storage_deletions").insert(
+            rows, returning=ReturnMethod.minimal
+        ).execute()
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR",
+            f"Erro ao enfileirar a remoção de {len(rows)} arquivo(s) em "
+            f"'{bucket}': {e.message}",
+        )
+
+
+def claim_expiry() -> str:
+    return (
+        datetime.now(timezone.utc)
+        - timedelta(seconds=STORAGE_DELETION_CLAIM_TIMEOUT_SECONDS)
+    ).isoformat()
+
+
+def unclaimed_filter() -> str:
+    return f"claimed_at.is.null,claimed_at.lt.{quote_filter_value(claim_expiry())}"
+
+
+def fetch_due_deletions() -> List[dict]:
+    response = (
+        supabase.from_("storage_deletions")
+        .select("id, bucket, path, reference_url, attempts")
+        .or_(unclaimed_filter())
+        .lt("attempts", STORAGE_DELETION_MAX_ATTEMPTS)
+        .lte("next_attempt_at", datetime.now(timezone.utc).isoformat())
+        .order("id")
+        .limit(STORAGE_DELETION_BATCH_SIZE)
+        .execute()
+    )
+    return response.data or []
+
+
+def referenced_urls(urls: List[str]) -> set:
+    if not urls:
+        return set()
+    images = supabase.from_("imagens").select("url").in_("url", urls).execute()
+    avatars = (
+        supabase.from_("profiles")
+        .select("avatar_url")
+        .in_("avatar_url", urls)
+        .execute()
+    )
+    return {row["url"] for row in images.data or []} | {
+        row["avatar_url"] for row in avatars.data or []
+    }
+
+
+def claim_deletions(ids: List[int]) -> set:
+    if not ids:
+        return set()
+    response = (
+        supabase.from_("storage_deletions")
+        .update({"claimed_at": datetime.now(timezone.utc).isoformat()})
+        .in_("id", ids)
+        .or_(unclaimed_filter())
+        .execute()
+    )
+    return {row["id"] for row in response.data or []}
+
+
+def cancel_pending_deletions(bucket: str, prefix: str) -> bool:
+    supabase.from_("storage_deletions").delete(returning=ReturnMethod.minimal).eq(
+        "bucket", bucket
+    ).like("path", f"{prefix}%").or_(unclaimed_filter()).execute()
+    in_flight = (
+        supabase.from_("storage_deletions")
+        .select("id")
+        .eq("bucket", bucket)
+        .like("path", f"{prefix}%")
+        .gte("claimed_at", claim_expiry())
+        .limit(1)
+        .execute()
+    )
+    return bool(in_flight.data)
+
+
+async def reserve_stored_objects(bucket: str, prefix: str) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + STORAGE_DELETION_CLAIM_WAIT_SECONDS
+    try:
+        while await asyncio.to_thread(cancel_pending_deletions, bucket, prefix):
+            if loop.time() >= deadline:
+                raise AppException(
+                    "CONFLICT",
+                    "Este arquivo está sendo removido. Tente novamente em instantes.",
+                )
+            await asyncio.sleep(0.5)
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao verificar a fila de remoção: {e.message}"
+        )
+
+
+def complete_deletions(ids: List[int]) -> None:
+    if ids:
+        supabase.from_("storage_deletions").delete(returning=ReturnMethod.minimal).in_(
+            "id", ids
+        ).execute()
+
+
+def reschedule_deletions(entries: List[dict], error: str) -> None:
+    now = datetime.now(timezone.utc)
+    for entry in entries:
+        attempts = entry["attempts"] + 1
+        delay = STORAGE_DELETION_BACKOFF_SECONDS * 2 ** (attempts - 1)
+        supabase.from_("storage_deletions").update(
+            {
+                "attempts": attempts,
+                "last_error": error[:1000],
+                "next_attempt_at": (now + timedelta(seconds=delay)).isoformat(),
+                "claimed_at": None,
+            },
+            returning=ReturnMethod.minimal,
+        ).eq("id", entry["id"]).execute()
+
+
+async def remove_batch(bucket: str, entries: List[dict]) -> None:
+    try:
+        await storage.remove(bucket, [entry["path"] for entry in entries])
+    except Exception as e:
+        print(
+            f"Falha ao remover {len(entries)} arquivo(s) de '{bucket}', "
+            f"nova tentativa agendada: {str(e)}"
+        )
+        await asyncio.to_thread(reschedule_deletions, entries, str(e))
+        return
+    await asyncio.to_thread(complete_deletions, [entry["id"] for entry in entries])
+
+
+async def process_due_deletions() -> int:
+    entries = await asyncio.to_thread(fetch_due_deletions)
+    if not entries:
+        return 0
+
+    still_referenced = await asyncio.to_thread(
+        referenced_urls,
+        list({entry["reference_url"] for entry in entries if entry["reference_url"]}),
+    )
+    skipped = [entry for entry in entries if entry["reference_url"] in still_referenced]
+    await asyncio.to_thread(complete_deletions, [entry["id"] for entry in skipped])
+
+    candidates = [
+        entry for entry in entries if entry["reference_url"] not in still_referenced
+    ]
+    claimed = await asyncio.to_thread(
+        claim_deletions, [entry["id"] for entry in candidates]
+    )
+    by_bucket = defaultdict(list)
+    for entry in candidates:
+        if entry["id"] in claimed:
+            by_bucket[entry["bucket"]].append(entry)
+    await asyncio.gather(
+        *(
+            remove_batch(bucket, bucket_entries)
+            for bucket, bucket_entries in by_bucket.items()
+        )
+    )
+    return len(entries)
+
+
+async def process_deletion_queue() -> None:
+    try:
+        while await process_due_deletions() == STORAGE_DELETION_BATCH_SIZE:
+            pass
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao processar a fila de remoção: {e.message}"
+        )
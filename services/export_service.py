@@ -0,0 +1,97 @@
+import asyncio
+from datetime import datetime, timezone
+from itertools import chain, islice
+from typing import Iterator, Optional, Tuple
+
+from config.supabase_client import supabase_admin as supabase
+from helpers.exceptions import AppException
+from helpers.export import iter_csv, iter_ndjson, iter_parquet, load_pyarrow
+from helpers.pagination import iter_keyset, quote_filter_value
+from models.comments import Comentario
+from models.followers import Follower
+from models.profile import Profile
+from models.topics import Topico
+from postgrest.exceptions import APIError
+
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_PARQUET_ROW_GROUP_SIZE = 50000
+
+EXPORT_TABLES = {
+    "topicos": {
+        "model": Topico,
+        "keys": ("id",),
+        "watermarks": ("created_in", "updated_in"),
+    },
+    "comentarios": {
+        "model": Comentario,
+        "keys": ("id",),
+        "watermarks": ("created_in", "updated_in"),
+    },
+    "profiles": {
+        "model": Profile,
+        "keys": ("id",),
+        "watermarks": ("joined_at",),
+    },
+    "followers": {
+        "model": Follower,
+        "keys": ("follower_id", "following_id"),
+        "watermarks": ("created_at",),
+    },
+}
+
+
+def export_columns(table: str) -> list:
+    return list(EXPORT_TABLES[table]["model"].__table__.columns)
+
+
+def iter_table_rows(table: str, since: Optional[datetime] = None) -> Iterator[dict]:
+    spec = EXPORT_TABLES[table]
+    columns = ", ".join(column.name for column in export_columns(table))
+
+    def build_query():
+        query = supabase.from_(table).select(columns)
+        if since is None:
+            return query
+
+        watermarks = spec["watermarks"]
+        if len(watermarks) == 1:
+            return query.gt(watermarks[0], since.isoformat())
+        value = quote_filter_value(since.isoformat())
+        return query.or_(",".join(f"{column}.gt.{value}" for column in watermarks))
+
+    yield from iter_keyset(build_query, *spec["keys"], page_size=EXPORT_CHUNK_SIZE)
+
+
+def prefetch_rows(table: str, since: Optional[datetime]) -> Iterator[dict]:
+    rows = iter_table_rows(table, since)
+    first_page = list(islice(rows, EXPORT_CHUNK_SIZE))
+    return chain(first_page, rows)
+
+
+async def export_table(
+    table: str, output_format: str, since: Optional[datetime] = None
+) -> Tuple[Iterator[bytes], str]:
+    if output_format == "parquet":
+        load_pyarrow()
+
+    watermark = datetime.now(timezone.utc).isoformat()
+    try:
+        rows = await asyncio.to_thread(prefetch_rows, table, since)
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao exportar a tabela {table}: {e.message}"
+        )
+    except Exception as e:
+        raise AppException(
+            "INTERNAL_SERVER_ERROR",
+            f"Erro inesperado ao exportar a tabela {table}: {str(e)}",
+        )
+
+    columns = export_columns(table)
+    if output_format == "csv":
+        chunks = iter_csv(rows, [column.name for column in columns], EXPORT_CHUNK_SIZE)
+    elif output_format == "ndjson":
+        chunks = iter_ndjson(rows, EXPORT_CHUNK_SIZE)
+    else:
+        chunks = iter_parquet(rows, columns, EXPORT_PARQUET_ROW_GROUP_SIZE)
+    return chunks, watermark
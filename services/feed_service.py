@@ -0,0 +1,291 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import List, Optional, Tuple
+
+from config.supabase_client import supabase_admin as supabase
+from helpers.background import run_in_background
+from helpers.cache import TTLCache
+from helpers.exceptions import AppException
+from helpers.pagination import (
+    decode_cursor,
+    encode_cursor,
+    is_integer,
+    is_timestamp,
+    iter_keyset,
+)
+from postgrest.exceptions import APIError
+from postgrest.types import ReturnMethod
+
+FEED_CELEBRITY_THRESHOLD = int(os.environ.get("FEED_CELEBRITY_THRESHOLD", "5000"))
+FEED_RETENTION_DAYS = int(os.environ.get("FEED_RETENTION_DAYS", "30"))
+FEED_TRIM_INTERVAL_SECONDS = int(os.environ.get("FEED_TRIM_INTERVAL_SECONDS", "3600"))
+FEED_INSERT_CHUNK_SIZE = 1000
+FEED_CURSOR_OVERLAP = 1
+FEED_ITEM_TYPES = ("topic", "comment")
+FEED_CURSOR_CHECKS = (is_timestamp, lambda value: value in FEED_ITEM_TYPES, is_integer)
+
+celebrity_followees_cache = TTLCache(60, 10000)
+
+TOPIC_FIELDS = "id, title, slug, category"
+AUTHOR_FIELDS = "username, avatar_url, role"
+
+
+def write_fan_out(
+    author_id: str, topic_id: int, comment_id: Optional[int], created_in: str
+):
+    profile_res = (
+        supabase.from_("profiles")
+        .select("followers_count")
+        .eq("id", author_id)
+        .single()
+        .execute()
+    )
+    if not profile_res.data:
+        return
+    if (profile_res.data.get("followers_count") or 0) >= FEED_CELEBRITY_THRESHOLD:
+        return
+
+    followers = iter_keyset(
+        lambda: supabase.from_("followers")
+        .select("follower_id")
+        .eq("following_id", author_id),
+        "follower_id",
+        page_size=FEED_INSERT_CHUNK_SIZE,
+    )
+    entries = []
+    for row in islice(followers, FEED_CELEBRITY_THRESHOLD):
+        entries.append(
+            {
+                "user_id": row["follower_id"],
+                "author_id": author_id,
+                "topic_id": topic_id,
+                "comment_id": comment_id,
+                "created_in": created_in,
+            }
+        )
+        if len(entries) == FEED_INSERT_CHUNK_SIZE:
+            insert_feed_entries(entries)
+            entries = []
+    if entries:
+        insert_feed_entries(entries)
+
+
+def insert_feed_entries(entries: List[dict]):
+    supabase.from_("feed_entries").insert(
+        entries, returning=ReturnMethod.minimal
+    ).execute()
+
+
+def publish_to_feeds(
+    author_id: str, topic_id: int, created_in: str, comment_id: Optional[int] = None
+):
+    run_in_background(
+        asyncio.to_thread(write_fan_out, author_id, topic_id, comment_id, created_in),
+        "feed_fan_out",
+    )
+
+
+def delete_author_entries(user_id: str, author_id: str):
+    supabase.from_("feed_entries").delete(returning=ReturnMethod.minimal).match(
+        {"user_id": user_id, "author_id": author_id}
+    ).execute()
+
+
+def remove_author_from_feed(user_id: str, author_id: str):
+    invalidate_celebrity_followees(user_id)
+    run_in_background(
+        asyncio.to_thread(delete_author_entries, user_id, author_id),
+        "feed_unfollow_cleanup",
+    )
+
+
+def invalidate_celebrity_followees(user_id: str):
+    celebrity_followees_cache.delete(str(user_id))
+
+
+def delete_entries_before(cutoff: datetime):
+    supabase.from_("feed_entries").delete(returning=ReturnMethod.minimal).lt(
+        "created_in", cutoff.isoformat()
+    ).execute()
+
+
+async def trim_feed_entries():
+    cutoff = datetime.now(timezone.utc) - timedelta(days=FEED_RETENTION_DAYS)
+    try:
+        await asyncio.to_thread(delete_entries_before, cutoff)
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao limpar as linhas do tempo: {e.message}"
+        )
+
+
+def get_celebrity_followees(user_id: str) -> List[str]:
+    cached = celebrity_followees_cache.get(str(user_id))
+    if cached is not None:
+        return cached
+
+    response = (
+        supabase.from_("followers")
+        .select(
+            "following_id, following:profiles!followers_following_id_fkey!inner(followers_count)"
+        )
+        .eq("follower_id", user_id)
+        .gte("following.followers_count", FEED_CELEBRITY_THRESHOLD)
+        .execute()
+    )
+    followee_ids = [row["following_id"] for row in response.data or []]
+    celebrity_followees_cache.set(str(user_id), followee_ids)
+    return followee_ids
+
+
+def feed_item_key(item: dict) -> tuple:
+    item_id = item["comment"]["id"] if item["comment"] else item["topic"]["id"]
+    return (datetime.fromisoformat(item["createdIn"]), item["type"], item_id)
+
+
+def fetch_timeline_items(
+    user_id: str, before: Optional[str], limit: int
+) -> Tuple[List[dict], bool]:
+    query = (
+        supabase.from_("feed_entries")
+        .select(
+            f"created_in, comment_id, topicos({TOPIC_FIELDS}), comentarios(id, content), author:profiles!feed_entries_author_id_fkey({AUTHOR_FIELDS})"
+        )
+        .eq("user_id", user_id)
+    )
+    if before:
+        query = query.lte("created_in", before)
+    response = (
+        query.order("created_in", desc=True)
+        .order("id", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    rows = response.data or []
+    items = [
+        {
+            "type": "comment" if row["comment_id"] else "topic",
+            "createdIn": row["created_in"],
+            "author": row["author"],
+            "topic": row["topicos"],
+            "comment": row["comentarios"],
+        }
+        for row in rows
+        if row.get("topicos")
+    ]
+    return items, len(rows) >= limit
+
+
+def fetch_celebrity_topics(
+    author_ids: List[str], before: Optional[str], limit: int
+) -> Tuple[List[dict], bool]:
+    query = (
+        supabase.from_("topicos")
+        .select(f"{TOPIC_FIELDS}, created_in, author:profiles({AUTHOR_FIELDS})")
+        .in_("author_id", author_ids)
+    )
+    if before:
+        query = query.lte("created_in", before)
+    response = (
+        query.order("created_in", desc=True)
+        .order("id", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    rows = response.data or []
+    items = [
+        {
+            "type": "topic",
+            "createdIn": row["created_in"],
+            "author": row["author"],
+            "topic": {
+                field: row[field] for field in ("id", "title", "slug", "category")
+            },
+            "comment": None,
+        }
+        for row in rows
+    ]
+    return items, len(rows) >= limit
+
+
+def fetch_celebrity_comments(
+    author_ids: List[str], before: Optional[str], limit: int
+) -> Tuple[List[dict], bool]:
+    query = (
+        supabase.from_("comentarios")
+        .select(
+            f"id, content, created_in, topicos({TOPIC_FIELDS}), author:profiles({AUTHOR_FIELDS})"
+        )
+        .in_("author_id", author_ids)
+    )
+    if before:
+        query = query.lte("created_in", before)
+    response = (
+        query.order("created_in", desc=True)
+        .order("id", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    rows = response.data or []
+    items = [
+        {
+            "type": "comment",
+            "createdIn": row["created_in"],
+            "author": row["author"],
+            "topic": row["topicos"],
+            "comment": {"id": row["id"], "content": row["content"]},
+        }
+        for row in rows
+        if row.get("topicos")
+    ]
+    return items, len(rows) >= limit
+
+
+async def get_feed(user_id: str, limit: int = 20, cursor: str = None):
+    cursor_key = None
+    before = None
+    if cursor:
+        created_in, item_type, item_id = decode_cursor(cursor, FEED_CURSOR_CHECKS)
+        cursor_key = (datetime.fromisoformat(created_in), item_type, item_id)
+        before = created_in
+
+    fetch_limit = limit + FEED_CURSOR_OVERLAP + 1
+    try:
+        sources = [fetch_timeline_items(user_id, before, fetch_limit)]
+        celebrity_ids = get_celebrity_followees(user_id)
+        if celebrity_ids:
+            sources.append(fetch_celebrity_topics(celebrity_ids, before, fetch_limit))
+            sources.append(fetch_celebrity_comments(celebrity_ids, before, fetch_limit))
+    except APIError as e:
+        raise AppException("DATABASE_ERROR", f"Erro ao buscar o feed: {e.message}")
+    except Exception as e:
+        raise AppException(
+            "INTERNAL_SERVER_ERROR", f"Erro inesperado ao buscar o feed: {str(e)}"
+        )
+
+    safe_floor = max(
+        (feed_item_key(items[-1]) for items, full in sources if full and items),
+        default=None,
+    )
+
+    merged = {}
+    for items, _ in sources:
+        for item in items:
+            key = feed_item_key(item)
+            if cursor_key and key >= cursor_key:
+                continue
+            merged[key] = item
+
+    ordered_keys = sorted(merged, reverse=True)
+    page_keys = [key for key in ordered_keys if safe_floor is None or key >= safe_floor]
+    page_keys = page_keys[:limit]
+    has_more = len(ordered_keys) > len(page_keys) or any(full for _, full in sources)
+
+    next_cursor = None
+    if page_keys and has_more:
+        last_key = page_keys[-1]
+        next_cursor = encode_cursor(merged[last_key]["createdIn"], *last_key[1:])
+
+    return {"data": [merged[key] for key in page_keys], "nextCursor": next_cursor}
@@ -1,7 +1,43 @@
+import asyncio
+import os
+from array import array
+from datetime import datetime, timezone
+from typing import Dict, List
+import numpy as np
 from config.supabase_client import supabase
 from helpers.exceptions import AppException
 from postgrest.exceptions import APIError
 from schemas.follow_schemas import FollowingStatsResponse
+from services.profile_service import invalidate_profile_cache
+from helpers.pagination import (
+    decode_cursor,
+    keyset_filter,
+    build_cursor_page,
+    iter_keyset,
+)
+from helpers.follow_graph import FollowGraph, follow_graph
+from helpers.follow_suggestions import compute_follow_suggestions, follow_suggestions
+from services import leaderboard_service
+from services.feed_service import (
+    invalidate_celebrity_followees,
+    remove_author_from_feed,
+)
+
+FOLLOW_GRAPH_ENABLED = os.environ.get("FOLLOW_GRAPH_ENABLED", "false").lower() == "true"
+FOLLOW_GRAPH_REFRESH_SECONDS = int(
+    os.environ.get("FOLLOW_GRAPH_REFRESH_SECONDS", "600")
+)
+FOLLOW_GRAPH_PAGE_SIZE = 1000
+BULK_LOOKUP_CHUNK_SIZE = 100
+
+FOLLOW_SUGGESTIONS_ENABLED = (
+    os.environ.get("FOLLOW_SUGGESTIONS_ENABLED", "false").lower() == "true"
+)
+FOLLOW_SUGGESTIONS_REFRESH_SECONDS = int(
+    os.environ.get("FOLLOW_SUGGESTIONS_REFRESH_SECONDS", "3600")
+)
+FOLLOW_SUGGESTIONS_TOP_K = int(os.environ.get("FOLLOW_SUGGESTIONS_TOP_K", "50"))
+FOLLOW_RECENCY_HALF_LIFE_DAYS = 90
 
 
 async def get_user_id_by_username(username: str):
@@ -37,6 +73,11 @@ async def follow_user(follower_id: str, following_username: str):
                 "following_uuid": following_id,
             },
         ).execute()
+        follow_graph.add_edge(follower_id, following_id)
+        invalidate_celebrity_followees(follower_id)
+        leaderboard_service.record_follow(following_id)
+        invalidate_profile_cache(user_id=follower_id)
+        invalidate_profile_cache(user_id=following_id, username=following_username)
         return {"message": "Usuário seguido com sucesso!"}
     except APIError as e:
         if e.code == "23505":
@@ -57,6 +98,11 @@ async def unfollow_user(follower_id: str, following_username: str):
                 "following_uuid": following_id,
             },
         ).execute()
+        follow_graph.remove_edge(follower_id, following_id)
+        remove_author_from_feed(follower_id, following_id)
+        leaderboard_service.record_unfollow(following_id)
+        invalidate_profile_cache(user_id=follower_id)
+        invalidate_profile_cache(user_id=following_id, username=following_username)
         return {"message": "Você deixou de seguir o usuário."}
     except APIError as e:
         if e.code == "23505":
@@ -68,6 +114,11 @@ async def unfollow_user(follower_id: str, following_username: str):
 
 async def get_follow_stats(username: str):
     user_id = await get_user_id_by_username(username)
+    if follow_graph.loaded:
+        return {
+            "followers_count": follow_graph.followers_count(user_id),
+            "following_count": follow_graph.following_count(user_id),
+        }
     try:
         response = (
             supabase.from_("profiles")
@@ -89,18 +140,36 @@ async def get_follow_stats(username: str):
         )
 
 
-async def get_followers(username: str):
+async def get_followers(
+    username: str, limit: int = 20, cursor: str = None, order: str = "desc"
+):
     user_id = await get_user_id_by_username(username)
+    descending = order == "desc"
+    cursor_values = decode_cursor(cursor) if cursor else None
     try:
-        response = (
+        query = (
             supabase.from_("followers")
             .select(
-                "follower:profiles!followers_follower_id_fkey(username, role, avatar_url)"
+                "created_at, follower_id, follower:profiles!followers_follower_id_fkey(username, role, avatar_url)"
             )
             .eq("following_id", user_id)
+        )
+        if cursor_values:
+            query = query.or_(
+                keyset_filter("created_at", "follower_id", cursor_values, descending)
+            )
+        response = (
+            query.order("created_at", desc=descending)
+            .order("follower_id", desc=descending)
+            .limit(limit + 1)
             .execute()
         )
-        return [item.get("follower") for item in response.data if item.get("follower")]
+        return build_cursor_page(
+            response.data or [],
+            limit,
+            lambda row: (row["created_at"], row["follower_id"]),
+            lambda row: row.get("follower"),
+        )
     except APIError as e:
         raise AppException("DATABASE_ERROR", f"Erro ao buscar seguidores: {e.message}")
     except Exception as e:
@@ -110,20 +179,36 @@ async def get_followers(username: str):
         )
 
 
-async def get_following(username: str):
+async def get_following(
+    username: str, limit: int = 20, cursor: str = None, order: str = "desc"
+):
     user_id = await get_user_id_by_username(username)
+    descending = order == "desc"
+    cursor_values = decode_cursor(cursor) if cursor else None
     try:
-        response = (
+        query = (
             supabase.from_("followers")
             .select(
-                "following:profiles!followers_following_id_fkey(username, role, avatar_url)"
+                "created_at, following_id, following:profiles!followers_following_id_fkey(username, role, avatar_url)"
             )
             .eq("follower_id", user_id)
+        )
+        if cursor_values:
+            query = query.or_(
+                keyset_filter("created_at", "following_id", cursor_values, descending)
+            )
+        response = (
+            query.order("created_at", desc=descending)
+            .order("following_id", desc=descending)
+            .limit(limit + 1)
             .execute()
         )
-        return [
-            item.get("following") for item in response.data if item.get("following")
-        ]
+        return build_cursor_page(
+            response.data or [],
+            limit,
+            lambda row: (row["created_at"], row["following_id"]),
+            lambda row: row.get("following"),
+        )
     except APIError as e:
         raise AppException(
             "DATABASE_ERROR", f"Erro ao buscar usuários que você segue: {e.message}"
@@ -139,6 +224,10 @@ async def check_following_status(
     follower_id: str, following_username: str
 ) -> FollowingStatsResponse:
     following_id = await get_user_id_by_username(following_username)
+    if follow_graph.loaded:
+        return FollowingStatsResponse(
+            is_following=follow_graph.is_following(follower_id, following_id)
+        )
     try:
         response = (
             supabase.from_("followers")
@@ -163,6 +252,65 @@ async def check_following_status(
         )
 
 
+async def get_user_ids_by_usernames(usernames: List[str]) -> Dict[str, str]:
+    user_ids = {}
+    try:
+        for start in range(0, len(usernames), BULK_LOOKUP_CHUNK_SIZE):
+            chunk = usernames[start : start + BULK_LOOKUP_CHUNK_SIZE]
+            response = (
+                supabase.from_("profiles")
+                .select("id, username")
+                .in_("username", chunk)
+                .execute()
+            )
+            for row in response.data or []:
+                user_ids[row["username"]] = row["id"]
+        return user_ids
+    except APIError as e:
+        raise AppException("DATABASE_ERROR", f"Erro ao buscar os usuários: {e.message}")
+    except Exception as e:
+        raise AppException(
+            "INTERNAL_SERVER_ERROR", f"Erro inesperado ao buscar os usuários: {str(e)}"
+        )
+
+
+async def check_following_statuses(
+    follower_id: str, usernames: List[str]
+) -> Dict[str, bool]:
+    user_ids = await get_user_ids_by_usernames(list(dict.fromkeys(usernames)))
+
+    if follow_graph.loaded:
+        return {
+            username: follow_graph.is_following(follower_id, user_id)
+            for username, user_id in user_ids.items()
+        }
+
+    candidate_ids = [user_id for user_id in user_ids.values() if user_id != follower_id]
+    followed_ids = set()
+    try:
+        for start in range(0, len(candidate_ids), BULK_LOOKUP_CHUNK_SIZE):
+            chunk = candidate_ids[start : start + BULK_LOOKUP_CHUNK_SIZE]
+            response = (
+                supabase.from_("followers")
+                .select("following_id")
+                .eq("follower_id", follower_id)
+                .in_("following_id", chunk)
+                .execute()
+            )
+            followed_ids.update(row["following_id"] for row in response.data or [])
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao verificar status de seguimento: {e.message}"
+        )
+    except Exception as e:
+        raise AppException(
+            "INTERNAL_SERVER_ERROR",
+            f"Erro inesperado ao verificar status de seguimento: {str(e)}",
+        )
+
+    return {username: user_id in followed_ids for username, user_id in user_ids.items()}
+
+
 async def remove_follower(remover_id: str, follower_username: str):
     follower_id = await get_user_id_by_username(follower_username)
     if remover_id == follower_id:
@@ -183,6 +331,11 @@ async def remove_follower(remover_id: str, follower_username: str):
 
         if response.count == 0:
             raise AppException("NOT_FOUND", "Este usuário não é seu seguidor.")
+        follow_graph.remove_edge(follower_id, remover_id)
+        remove_author_from_feed(follower_id, remover_id)
+        leaderboard_service.record_unfollow(remover_id)
+        invalidate_profile_cache(user_id=remover_id)
+        invalidate_profile_cache(user_id=follower_id, username=follower_username)
         return {"message": "Seguidor removido com sucesso."}
     except APIError as e:
         raise AppException("DATABASE_ERROR", f"Erro ao remover seguidor: {e.message}")
@@ -191,3 +344,113 @@ async def remove_follower(remover_id: str, follower_username: str):
             "INTERNAL_SERVER_ERROR",
             f"Erro inesperado ao remover seguidor: {str(e)}",
         )
+
+
+def iter_follower_rows(columns: str):
+    return iter_keyset(
+        lambda: supabase.from_("followers").select(columns),
+        "follower_id",
+        "following_id",
+        FOLLOW_GRAPH_PAGE_SIZE,
+    )
+
+
+def iter_follow_edges():
+    for row in iter_follower_rows("follower_id, following_id"):
+        yield row["follower_id"], row["following_id"]
+
+
+def iter_profile_rows(columns: str):
+    return iter_keyset(
+        lambda: supabase.from_("profiles").select(columns),
+        "id",
+        page_size=FOLLOW_GRAPH_PAGE_SIZE,
+    )
+
+
+async def load_follow_graph():
+    follow_graph.begin_reload()
+    try:
+        new_graph = await asyncio.to_thread(FollowGraph.from_edges, iter_follow_edges())
+    except APIError as e:
+        follow_graph.cancel_reload()
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao carregar o grafo de seguidores: {e.message}"
+        )
+    except Exception as e:
+        follow_graph.cancel_reload()
+        raise AppException(
+            "INTERNAL_SERVER_ERROR",
+            f"Erro inesperado ao carregar o grafo de seguidores: {str(e)}",
+        )
+    follow_graph.replace(new_graph)
+
+
+def build_follow_suggestions():
+    user_index = {}
+    profiles = []
+    messages_counts = array("I")
+    for row in iter_profile_rows("id, username, role, avatar_url, mensagens_count"):
+        user_index[row["id"]] = len(profiles)
+        profiles.append(
+            {
+                "id": row["id"],
+                "username": row["username"],
+                "role": row["role"],
+                "avatar_url": row["avatar_url"],
+            }
+        )
+        messages_counts.append(max(0, row.get("mensagens_count") or 0))
+
+    now = datetime.now(timezone.utc)
+    sources = array("i")
+    targets = array("i")
+    edge_weights = array("f")
+    for row in iter_follower_rows("follower_id, following_id, created_at"):
+        source = user_index.get(row["follower_id"])
+        target = user_index.get(row["following_id"])
+        if source is None or target is None:
+            continue
+        age_days = (now - datetime.fromisoformat(row["created_at"])).days
+        sources.append(source)
+        targets.append(target)
+        edge_weights.append(
+            1 + 0.5 ** (max(0, age_days) / FOLLOW_RECENCY_HALF_LIFE_DAYS)
+        )
+
+    activity = 1 + np.log1p(np.frombuffer(messages_counts, dtype=np.uint32))
+    suggestions = compute_follow_suggestions(
+        len(profiles),
+        np.frombuffer(sources, dtype=np.int32),
+        np.frombuffer(targets, dtype=np.int32),
+        np.frombuffer(edge_weights, dtype=np.float32),
+        activity,
+        FOLLOW_SUGGESTIONS_TOP_K,
+    )
+    return user_index, profiles, suggestions
+
+
+async def refresh_follow_suggestions():
+    try:
+        result = await asyncio.to_thread(build_follow_suggestions)
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao calcular sugestões de usuários: {e.message}"
+        )
+    except Exception as e:
+        raise AppException(
+            "INTERNAL_SERVER_ERROR",
+            f"Erro inesperado ao calcular sugestões de usuários: {str(e)}",
+        )
+    follow_suggestions.replace(*result)
+
+
+async def get_follow_suggestions(user_id: str, limit: int):
+    suggestions = follow_suggestions.get(user_id)
+    if follow_graph.loaded:
+        suggestions = [
+            suggestion
+            for suggestion in suggestions
+            if not follow_graph.is_following(user_id, suggestion["id"])
+        ]
+    return suggestions[:limit]
@@ -1,9 +1,15 @@
 import asyncio
+import os
 from config.supabase_client import supabase, supabase_admin
 from helpers.exceptions import AppException
+from helpers.cache import TTLCache
 from postgrest.exceptions import APIError
 from datetime import datetime, timezone, timedelta
 
+FORUM_STATS_CACHE_TTL = int(os.environ.get("FORUM_STATS_CACHE_TTL", "60"))
+
+forum_stats_cache = TTLCache(FORUM_STATS_CACHE_TTL, 1)
+
 
 async def get_forum_stats():
     try:
@@ -46,6 +52,14 @@ async def get_forum_stats():
         )
 
 
+async def get_forum_stats_snapshot():
+    snapshot = forum_stats_cache.get("stats")
+    if snapshot is None:
+        snapshot = await get_forum_stats()
+        forum_stats_cache.set("stats", snapshot)
+    return snapshot
+
+
 async def get_recent_posts(limit: int = 10):
     try:
         response = supabase_admin.rpc(
@@ -0,0 +1,88 @@
+import asyncio
+import os
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Tuple
+
+import httpx
+from helpers.exceptions import AppException
+from helpers.image_cache import DiskLRUCache, cache_key
+from helpers.storage import PUBLIC_BUCKETS, storage
+from services import image_service
+
+IMAGE_PROXY_WIDTHS = (48, 96, 160, 256, 320, 480, 640, 960, 1280, 1920)
+IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR", "cache/images")
+IMAGE_CACHE_MAX_BYTES = int(os.environ.get("IMAGE_CACHE_MAX_BYTES", str(1024**3)))
+IMAGE_PROXY_CACHE_CONTROL = "public, max-age=86400"
+
+render_cache = DiskLRUCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES)
+render_cache_loading = asyncio.Lock()
+inflight_renders: Dict[str, asyncio.Future] = {}
+
+
+def snap_width(width: int) -> int:
+    for allowed in IMAGE_PROXY_WIDTHS:
+        if allowed >= width:
+            return allowed
+    return IMAGE_PROXY_WIDTHS[-1]
+
+
+def remove_files(paths: List[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+async def load_render_cache() -> None:
+    async with render_cache_loading:
+        if not render_cache.loaded:
+            await asyncio.to_thread(render_cache.load)
+
+
+async def render_to_cache(
+    key: str, bucket: str, path: str, width: int, format: str
+) -> Path:
+    try:
+        data = await storage.read(bucket, path)
+    except httpx.HTTPError:
+        raise AppException("STORAGE_ERROR", "Falha ao ler a imagem original.")
+    if data is None:
+        raise AppException("NOT_FOUND", "Imagem não encontrada.")
+
+    rendered = await image_service.render(data, width, format)
+    await asyncio.to_thread(render_cache.write, key, rendered)
+    evicted = render_cache.add(key, len(rendered))
+    if evicted:
+        await asyncio.to_thread(remove_files, evicted)
+    return render_cache.path(key)
+
+
+async def render_once(key: str, bucket: str, path: str, width: int, format: str):
+    render = inflight_renders.get(key)
+    if render is None:
+        render = asyncio.ensure_future(
+            render_to_cache(key, bucket, path, width, format)
+        )
+        inflight_renders[key] = render
+        render.add_done_callback(lambda _: inflight_renders.pop(key, None))
+    return await asyncio.shield(render)
+
+
+async def get_resized(
+    bucket: str, path: str, width: int, format: str
+) -> Tuple[BinaryIO, int, str]:
+    if bucket not in PUBLIC_BUCKETS:
+        raise AppException("NOT_FOUND", "Imagem não encontrada.")
+    if not render_cache.loaded:
+        await load_render_cache()
+
+    width = snap_width(width)
+    key = cache_key(bucket, path, width, format)
+    cached = render_cache.get(key) or await render_once(
+        key, bucket, path, width, format
+    )
+    try:
+        file = await asyncio.to_thread(open, cached, "rb")
+    except FileNotFoundError:
+        render_cache.discard(key)
+        cached = await render_once(key, bucket, path, width, format)
+        file = await asyncio.to_thread(open, cached, "rb")
+    return file, os.fstat(file.fileno()).st_size, key
@@ -0,0 +1,68 @@
+import asyncio
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Optional
+
+from fastapi import UploadFile
+from helpers.exceptions import AppException
+from helpers.images import InvalidImage, process_image, render_variant
+
+IMAGE_WORKERS = int(os.environ.get("IMAGE_WORKERS", str(os.cpu_count() or 1)))
+IMAGE_MAX_PENDING = int(os.environ.get("IMAGE_MAX_PENDING", str(IMAGE_WORKERS * 4)))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+image_pool: Optional[ProcessPoolExecutor] = None
+pending_jobs = asyncio.Semaphore(IMAGE_MAX_PENDING)
+
+
+def get_image_pool() -> ProcessPoolExecutor:
+    global image_pool
+    if image_pool is None:
+        image_pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS)
+    return image_pool
+
+
+def shutdown_image_pool() -> None:
+    global image_pool
+    if image_pool is not None:
+        image_pool.shutdown(wait=False, cancel_futures=True)
+        image_pool = None
+
+
+async def run_in_pool(function, *args):
+    async with pending_jobs:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                get_image_pool(), function, *args
+            )
+        except InvalidImage:
+            raise AppException(
+                "VALIDATION_ERROR", "O arquivo enviado não é uma imagem válida."
+            )
+        except BrokenProcessPool:
+            shutdown_image_pool()
+            raise AppException(
+                "INTERNAL_SERVER_ERROR", "Falha ao processar a imagem enviada."
+            )
+
+
+def spool_to_disk(source) -> str:
+    with tempfile.NamedTemporaryFile(prefix="upload-", delete=False) as target:
+        shutil.copyfileobj(source, target, UPLOAD_CHUNK_SIZE)
+    return target.name
+
+
+async def process_upload(file: UploadFile, widths: Iterable[int]) -> dict:
+    await file.seek(0)
+    path = await asyncio.to_thread(spool_to_disk, file.file)
+    try:
+        return await run_in_pool(process_image, path, tuple(widths))
+    finally:
+        os.unlink(path)
+
+
+async def render(data: bytes, width: int, format: str) -> bytes:
+    return await run_in_pool(render_variant, data, width, format)
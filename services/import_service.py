@@ -0,0 +1,343 @@
+import io
+import json
+import os
+import uuid
+from datetime import date, datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import psycopg2
+from sqlalchemy import UUID, Date, DateTime, Integer, create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+
+from models.comments import Comentario
+from models.followers import Follower
+from models.images import Imagem
+from models.import_id_map import ImportIdMap
+from models.topics import Topico
+
+DATABASE_URL = os.environ.get("DATABASE_URL")
+IMPORT_BATCH_SIZE = int(os.environ.get("IMPORT_BATCH_SIZE", "5000"))
+
+IMPORT_TABLES = {
+    "topicos": Topico,
+    "comentarios": Comentario,
+    "imagens": Imagem,
+    "followers": Follower,
+}
+SEQUENCE_TABLES = ("topicos", "comentarios", "imagens")
+
+
+def check_topic(row: dict) -> Optional[str]:
+    if row.get("content") and len(row["content"]) > 2000:
+        return "conteúdo com mais de 2000 caracteres"
+    return None
+
+
+def check_image(row: dict) -> Optional[str]:
+    if (row.get("topic_id") is None) == (row.get("comment_id") is None):
+        return "a imagem deve pertencer a um tópico ou a um comentário"
+    return None
+
+
+def check_follow(row: dict) -> Optional[str]:
+    if row["follower_id"] == row["following_id"]:
+        return "um usuário não pode seguir a si mesmo"
+    return None
+
+
+ROW_CHECKS = {
+    "topicos": check_topic,
+    "comentarios": check_topic,
+    "imagens": check_image,
+    "followers": check_follow,
+}
+
+
+def coerce_value(column, value):
+    if isinstance(column.type, JSONB):
+        return json.dumps([] if value is None or value == "" else value)
+    if value is None or value == "":
+        return None
+    if isinstance(column.type, Integer):
+        return int(value)
+    if isinstance(column.type, DateTime):
+        parsed = datetime.fromisoformat(str(value))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.isoformat()
+    if isinstance(column.type, Date):
+        return date.fromisoformat(str(value)).isoformat()
+    if isinstance(column.type, UUID):
+        return str(uuid.UUID(str(value)))
+    return str(value)
+
+
+def validate_row(table: str, row: dict, now: str) -> Tuple[Optional[list], str]:
+    values = []
+    for column in IMPORT_TABLES[table].__table__.columns:
+        try:
+            value = coerce_value(column, row.get(column.name))
+        except (TypeError, ValueError):
+            return None, f"valor inválido para {column.name}"
+
+        if value is None and column.server_default is not None:
+            value = now
+        if value is None and not column.nullable:
+            return None, f"campo obrigatório ausente: {column.name}"
+        values.append(value)
+
+    record = dict(zip(import_columns(table), values))
+    error = ROW_CHECKS[table](record)
+    if error:
+        return None, error
+    return values, ""
+
+
+def import_columns(table: str) -> List[str]:
+    return [column.name for column in IMPORT_TABLES[table].__table__.columns]
+
+
+def copy_literal(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, int):
+        return str(value)
+    return '"' + value.replace('"', '""') + '"'
+
+
+def copy_payload(rows: List[list]) -> str:
+    return "".join(",".join(map(copy_literal, row)) + "\n" for row in rows)
+
+
+def remapped_columns(table: str) -> List[Tuple[str, str]]:
+    return [
+        (column.name, key.column.table.name)
+        for column in IMPORT_TABLES[table].__table__.columns
+        for key in column.foreign_keys
+        if key.column.table.name in SEQUENCE_TABLES
+    ]
+
+
+def stage_rows(
+    cursor, table: str, rows: List[list]
+) -> Tuple[int, List[Tuple[list, str]]]:
+    columns = ", ".join(import_columns(table))
+    cursor.execute("DROP TABLE IF EXISTS import_stage")
+    cursor.execute(
+        f"CREATE TEMP TABLE import_stage (LIKE public.{table}) ON COMMIT DROP"
+    )
+    cursor.copy_expert(
+        f"COPY import_stage ({columns}) FROM STDIN WITH (FORMAT csv)",
+        io.StringIO(copy_payload(rows)),
+    )
+    if table not in SEQUENCE_TABLES:
+        cursor.execute(
+            f"INSERT INTO public.{table} ({columns}) "
+            f"SELECT {columns} FROM import_stage ON CONFLICT DO NOTHING"
+        )
+        return cursor.rowcount, []
+
+    cursor.execute(
+        "DELETE FROM import_stage AS s USING public.import_id_map AS m "
+        "WHERE m.table_name = %s AND m.legacy_id = s.id",
+        (table,),
+    )
+    staged = ", ".join(f"s.{column}" for column in import_columns(table))
+    failures = []
+    cursor.execute(
+        "DELETE FROM import_stage AS s USING import_stage AS o "
+        f"WHERE s.id = o.id AND s.ctid > o.ctid RETURNING {staged}"
+    )
+    failures.extend((list(row), "id legado duplicado") for row in cursor.fetchall())
+
+    for column, parent in remapped_columns(table):
+        cursor.execute(
+            f"DELETE FROM import_stage AS s WHERE s.{column} IS NOT NULL "
+            "AND NOT EXISTS (SELECT 1 FROM public.import_id_map AS m "
+            f"WHERE m.table_name = %s AND m.legacy_id = s.{column}) "
+            f"RETURNING {staged}",
+            (parent,),
+        )
+        failures.extend(
+            (list(row), f"{column} aponta para um registro de {parent} não importado")
+            for row in cursor.fetchall()
+        )
+    for column, parent in remapped_columns(table):
+        cursor.execute(
+            f"UPDATE import_stage AS s SET {column} = m.new_id "
+            "FROM public.import_id_map AS m "
+            f"WHERE m.table_name = %s AND m.legacy_id = s.{column}",
+            (parent,),
+        )
+
+    for column in IMPORT_TABLES[table].__table__.columns:
+        if column.unique:
+            cursor.execute(
+                f"UPDATE import_stage AS s SET {column.name} = "
+                f"s.{column.name} || '-' || s.id "
+                f"WHERE EXISTS (SELECT 1 FROM public.{table} AS t "
+                f"WHERE t.{column.name} = s.{column.name}) "
+                "OR EXISTS (SELECT 1 FROM import_stage AS o "
+                f"WHERE o.{column.name} = s.{column.name} AND o.id <> s.id)"
+            )
+
+    cursor.execute("ALTER TABLE import_stage ADD COLUMN legacy_id bigint")
+    cursor.execute(
+        "UPDATE import_stage SET legacy_id = id, "
+        f"id = nextval(pg_get_serial_sequence('public.{table}', 'id'))"
+    )
+    cursor.execute(
+        f"INSERT INTO public.{table} ({columns}) SELECT {columns} FROM import_stage"
+    )
+    imported = cursor.rowcount
+    cursor.execute(
+        "INSERT INTO public.import_id_map (table_name, legacy_id, new_id) "
+        "SELECT %s, legacy_id, id FROM import_stage",
+        (table,),
+    )
+    return imported, failures
+
+
+def write_batch(
+    connection, table: str, rows: List[list]
+) -> Tuple[int, List[Tuple[list, str]]]:
+    cursor = connection.cursor()
+    try:
+        imported, failures = stage_rows(cursor, table, rows)
+        connection.commit()
+        return imported, failures
+    except psycopg2.Error:
+        connection.rollback()
+
+    imported = 0
+    failures = []
+    for row in rows:
+        cursor.execute("SAVEPOINT import_row")
+        try:
+            inserted, rejected = stage_rows(cursor, table, [row])
+        except psycopg2.Error as e:
+            cursor.execute("ROLLBACK TO SAVEPOINT import_row")
+            failures.append((row, str(e).strip()))
+            continue
+        imported += inserted
+        failures.extend(rejected)
+    connection.commit()
+    return imported, failures
+
+
+def iter_dump_lines(path: Path, offset: int) -> Iterator[Tuple[bytes, int]]:
+    with open(path, "rb") as dump:
+        dump.seek(offset)
+        while line := dump.readline():
+            yield line, dump.tell()
+
+
+class ImportState:
+    def __init__(self, path: Path):
+        self.path = path
+        self.tables = json.loads(path.read_text()) if path.exists() else {}
+
+    def table(self, table: str) -> dict:
+        return self.tables.setdefault(
+            table, {"offset": 0, "imported": 0, "rejected": 0, "done": False}
+        )
+
+    def save(self) -> None:
+        temporary = self.path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(self.tables, indent=2))
+        os.replace(temporary, self.path)
+
+
+def import_table(
+    connection,
+    table: str,
+    path: Path,
+    state: ImportState,
+    rejects,
+    report: Callable[[str, dict], None],
+    batch_size: int = IMPORT_BATCH_SIZE,
+):
+    progress = state.table(table)
+    if progress["done"]:
+        return
+
+    now = datetime.now(timezone.utc).isoformat()
+    lines = iter_dump_lines(path, progress["offset"])
+    while batch := list(islice(lines, batch_size)):
+        valid = []
+        rejected = []
+        for line, _ in batch:
+            if not line.strip():
+                continue
+            try:
+                values, error = validate_row(table, json.loads(line), now)
+            except (ValueError, AttributeError):
+                values, error = None, "linha JSON inválida"
+            if values is None:
+                rejected.append((line.decode("utf-8", "replace").strip(), error))
+            else:
+                valid.append(values)
+
+        imported, failures = write_batch(connection, table, valid) if valid else (0, [])
+        columns = import_columns(table)
+        rejected.extend(
+            (
+                json.dumps(dict(zip(columns, row)), ensure_ascii=False, default=str),
+                error,
+            )
+            for row, error in failures
+        )
+        for line, error in rejected:
+            rejects.write(
+                json.dumps(
+                    {"table": table, "error": error, "line": line}, ensure_ascii=False
+                )
+                + "\n"
+            )
+        rejects.flush()
+
+        progress["offset"] = batch[-1][1]
+        progress["imported"] += imported
+        progress["rejected"] += len(rejected)
+        state.save()
+        report(table, progress)
+
+    progress["done"] = True
+    state.save()
+
+
+def finalize_import(connection):
+    cursor = connection.cursor()
+    cursor.execute("""
+        UPDATE public.profiles AS p
+        SET followers_count = COALESCE(followers.total, 0),
+            following_count = COALESCE(following.total, 0),
+            mensagens_count = COALESCE(posts.total, 0)
+        FROM public.profiles AS base
+        LEFT JOIN (
+            SELECT following_id AS id, count(*) AS total
+            FROM public.followers GROUP BY following_id
+        ) AS followers ON followers.id = base.id
+        LEFT JOIN (
+            SELECT follower_id AS id, count(*) AS total
+            FROM public.followers GROUP BY follower_id
+        ) AS following ON following.id = base.id
+        LEFT JOIN (
+            SELECT author_id AS id, count(*) AS total FROM (
+                SELECT author_id FROM public.topicos
+                UNION ALL
+                SELECT author_id FROM public.comentarios
+            ) AS all_posts GROUP BY author_id
+        ) AS posts ON posts.id = base.id
+        WHERE p.id = base.id
+        """)
+    cursor.execute("DELETE FROM public.user_stats")
+    connection.commit()
+
+
+def connect(database_url: Optional[str] = None):
+    engine = create_engine(database_url or DATABASE_URL)
+    ImportIdMap.__table__.create(engine, checkfirst=True)
+    return engine.raw_connection()
@@ -0,0 +1,202 @@
+import asyncio
+import os
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from config.supabase_client import supabase_admin as supabase
+from helpers.cache import TTLCache
+from helpers.exceptions import AppException
+from helpers.leaderboard import Leaderboard
+from helpers.pagination import iter_keyset
+from postgrest.exceptions import APIError
+
+LEADERBOARD_SIZE = int(os.environ.get("LEADERBOARD_SIZE", "50"))
+LEADERBOARD_REBUILD_SECONDS = int(os.environ.get("LEADERBOARD_REBUILD_SECONDS", "600"))
+LEADERBOARD_PAGE_SIZE = 1000
+LEADERBOARD_WINDOWS = {"all": None, "30d": 30, "7d": 7}
+LEADERBOARD_BOARDS = ("posters", "followed", "topics")
+
+leaderboards = {
+    (board, window): Leaderboard(LEADERBOARD_SIZE)
+    for board in LEADERBOARD_BOARDS
+    for window in LEADERBOARD_WINDOWS
+}
+profile_summary_cache = TTLCache(300, 5000)
+topic_summary_cache = TTLCache(300, 5000)
+
+
+def recent_windows(created_in: str, now: datetime) -> List[str]:
+    age = now - datetime.fromisoformat(created_in)
+    return [
+        window
+        for window, days in LEADERBOARD_WINDOWS.items()
+        if days is not None and age <= timedelta(days=days)
+    ]
+
+
+def windows_for(created_in: str) -> List[str]:
+    return ["all"] + recent_windows(created_in, datetime.now(timezone.utc))
+
+
+def record_topic_created(author_id: str, created_in: str):
+    for window in windows_for(created_in):
+        leaderboards[("posters", window)].add(str(author_id), 1)
+
+
+def record_comment_created(author_id: str, topic_id: int, created_in: str):
+    for window in windows_for(created_in):
+        leaderboards[("posters", window)].add(str(author_id), 1)
+        leaderboards[("topics", window)].add(topic_id, 1)
+
+
+def record_topic_deleted(author_id: str, topic_id: int, created_in: str):
+    for window in windows_for(created_in):
+        leaderboards[("posters", window)].add(str(author_id), -1)
+    for window in LEADERBOARD_WINDOWS:
+        leaderboards[("topics", window)].discard(topic_id)
+
+
+def record_comment_deleted(author_id: str, topic_id: int, created_in: str):
+    for window in windows_for(created_in):
+        leaderboards[("posters", window)].add(str(author_id), -1)
+        leaderboards[("topics", window)].add(topic_id, -1)
+
+
+def record_follow(following_id: str):
+    for window in LEADERBOARD_WINDOWS:
+        leaderboards[("followed", window)].add(str(following_id), 1)
+
+
+def record_unfollow(following_id: str):
+    leaderboards[("followed", "all")].add(str(following_id), -1)
+
+
+def fetch_leaderboard_scores() -> Dict[tuple, Counter]:
+    now = datetime.now(timezone.utc)
+    widest_days = max(days for days in LEADERBOARD_WINDOWS.values() if days)
+    cutoff = (now - timedelta(days=widest_days)).isoformat()
+    scores = {key: Counter() for key in leaderboards}
+
+    for row in iter_keyset(
+        lambda: supabase.from_("profiles").select(
+            "id, mensagens_count, followers_count"
+        ),
+        "id",
+        page_size=LEADERBOARD_PAGE_SIZE,
+    ):
+        scores[("posters", "all")][row["id"]] = row.get("mensagens_count") or 0
+        scores[("followed", "all")][row["id"]] = row.get("followers_count") or 0
+
+    for row in iter_keyset(
+        lambda: supabase.from_("topicos").select("id, comentarios(count)"),
+        "id",
+        page_size=LEADERBOARD_PAGE_SIZE,
+    ):
+        comment_count = (row.get("comentarios") or [{}])[0].get("count", 0)
+        scores[("topics", "all")][row["id"]] = comment_count
+
+    for row in iter_keyset(
+        lambda: supabase.from_("topicos")
+        .select("id, author_id, created_in")
+        .gte("created_in", cutoff),
+        "id",
+        page_size=LEADERBOARD_PAGE_SIZE,
+    ):
+        for window in recent_windows(row["created_in"], now):
+            scores[("posters", window)][row["author_id"]] += 1
+
+    for row in iter_keyset(
+        lambda: supabase.from_("comentarios")
+        .select("id, author_id, topic_id, created_in")
+        .gte("created_in", cutoff),
+        "id",
+        page_size=LEADERBOARD_PAGE_SIZE,
+    ):
+        for window in recent_windows(row["created_in"], now):
+            scores[("posters", window)][row["author_id"]] += 1
+            scores[("topics", window)][row["topic_id"]] += 1
+
+    for row in iter_keyset(
+        lambda: supabase.from_("followers")
+        .select("follower_id, following_id, created_at")
+        .gte("created_at", cutoff),
+        "follower_id",
+        "following_id",
+        page_size=LEADERBOARD_PAGE_SIZE,
+    ):
+        for window in recent_windows(row["created_at"], now):
+            scores[("followed", window)][row["following_id"]] += 1
+
+    return scores
+
+
+async def rebuild_leaderboards():
+    try:
+        scores = await asyncio.to_thread(fetch_leaderboard_scores)
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao recalcular os rankings: {e.message}"
+        )
+    except Exception as e:
+        raise AppException(
+            "INTERNAL_SERVER_ERROR",
+            f"Erro inesperado ao recalcular os rankings: {str(e)}",
+        )
+
+    for key, leaderboard in leaderboards.items():
+        leaderboard.replace(scores[key])
+
+
+def get_summaries(table: str, columns: str, ids: list, cache: TTLCache) -> dict:
+    summaries = {}
+    missing = []
+    for item_id in ids:
+        cached = cache.get(item_id)
+        if cached is None:
+            missing.append(item_id)
+        else:
+            summaries[item_id] = cached
+
+    if missing:
+        response = supabase.from_(table).select(columns).in_("id", missing).execute()
+        for row in response.data or []:
+            item_id = row.pop("id")
+            cache.set(item_id, row)
+            summaries[item_id] = row
+    return summaries
+
+
+async def get_leaderboard(board: str, window: str):
+    leaderboard = leaderboards[(board, window)]
+    if not leaderboard.loaded:
+        raise AppException(
+            "SERVICE_UNAVAILABLE",
+            "Os rankings ainda estão sendo calculados. Tente novamente em instantes.",
+        )
+
+    top = leaderboard.top()
+    try:
+        if board == "topics":
+            summaries = get_summaries(
+                "topicos",
+                "id, title, slug, category",
+                [key for key, _ in top],
+                topic_summary_cache,
+            )
+        else:
+            summaries = get_summaries(
+                "profiles",
+                "id, username, role, avatar_url",
+                [key for key, _ in top],
+                profile_summary_cache,
+            )
+    except APIError as e:
+        raise AppException("DATABASE_ERROR", f"Erro ao buscar o ranking: {e.message}")
+
+    entry_field = "topic" if board == "topics" else "user"
+    entries = [(key, score) for key, score in top if key in summaries]
+    return [
+        {"rank": rank, "score": score, entry_field: summaries[key]}
+        for rank, (key, score) in enumerate(entries, start=1)
+    ]
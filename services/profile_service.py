@@ -1,4 +1,5 @@
-import time
+import asyncio
+import os
 from config.supabase_client import (
     create_authenticated_client,
     supabase,
@@ -6,16 +7,53 @@ from config.supabase_client import (
 )
 from fastapi import UploadFile
 from helpers.exceptions import AppException
+from helpers.cache import TTLCache, compute_etag
 from postgrest.exceptions import APIError
 from datetime import date
+from services.user_service import index_username
+from services import image_service
+from services.deletion_service import enqueue_deletions, reserve_stored_objects
+from services.upload_service import (
+    check_upload_size,
+    digest_file,
+    storage_path,
+    store_image,
+)
+from helpers.images import AVATAR_WIDTHS
+
+PROFILE_CACHE_TTL = int(os.environ.get("PROFILE_CACHE_TTL", "300"))
+PROFILE_CACHE_MAX_ENTRIES = int(os.environ.get("PROFILE_CACHE_MAX_ENTRIES", "10000"))
+
+profile_cache = TTLCache(PROFILE_CACHE_TTL, PROFILE_CACHE_MAX_ENTRIES)
+profile_username_cache = TTLCache(PROFILE_CACHE_TTL, PROFILE_CACHE_MAX_ENTRIES)
+
+
+def invalidate_profile_cache(user_id: str = None, username: str = None):
+    if user_id:
+        cached_username = profile_username_cache.get(str(user_id))
+        profile_username_cache.delete(str(user_id))
+        if cached_username:
+            profile_cache.delete(cached_username)
+
+    if username:
+        profile_cache.delete(username)
 
 
 async def get_user_profile_by_username(username: str):
+    profile, _ = await get_user_profile_with_etag(username)
+    return profile
+
+
+async def get_user_profile_with_etag(username: str):
+    cached = profile_cache.get(username)
+    if cached:
+        return cached
+
     try:
         response = (
             supabase.from_("profiles")
             .select(
-                "username, gender, birthdate, location, website, joined_at, last_login, role, facebook, instagram, discord, steam, avatar_url, followers_count, following_count, mensagens_count"
+                "id, username, gender, birthdate, location, website, joined_at, last_login, role, facebook, instagram, discord, steam, avatar_url, avatar_variants, followers_count, following_count, mensagens_count"
             )
             .eq("username", username)
             .single()
@@ -23,7 +61,13 @@ async def get_user_profile_by_username(username: str):
         )
         if not response.data:
             raise AppException("NOT_FOUND", "Perfil não encontrado.")
-        return response.data
+
+        profile = {key: value for key, value in response.data.items() if key != "id"}
+        cached = (profile, compute_etag(profile))
+
+        profile_cache.set(username, cached)
+        profile_username_cache.set(str(response.data["id"]), username)
+        return cached
     except APIError as e:
         raise AppException("DATABASE_ERROR", f"Erro ao buscar o perfil: {e.message}")
     except Exception as e:
@@ -71,6 +115,7 @@ async def update_profile(user_id: str, profile_data: dict):
                 "NOT_FOUND",
                 "O perfil que você tentou atualizar não foi encontrado ou você не tem permissão.",
             )
+        invalidate_profile_cache(user_id=user_id)
         return {"message": "Perfil atualizado com sucesso!"}
     except APIError as e:
         raise AppException("DATABASE_ERROR", f"Erro ao atualizar perfil: {e.message}")
@@ -95,6 +140,8 @@ async def update_user_profile_and_auth(
             .eq("id", user.id)
             .execute()
         )
+        invalidate_profile_cache(user_id=user.id, username=new_username)
+        index_username(user.id, new_username)
 
         if new_email and new_email.lower() != user.email.lower():
             try:
@@ -125,57 +172,40 @@ async def update_user_profile_and_auth(
         )
 
 
+def avatar_paths(profile: dict) -> list:
+    urls = [profile["avatar_url"]] + [
+        variant["url"] for variant in profile.get("avatar_variants") or []
+    ]
+    return [path for path in (storage_path(url, "avatars") for url in urls) if path]
+
+
 async def update_avatar(user_id: str, avatar_file: UploadFile, token: str):
     try:
         if not avatar_file:
             raise AppException("BAD_REQUEST", "Nenhum arquivo de avatar foi enviado.")
+        check_upload_size(avatar_file)
+        digest = await asyncio.to_thread(digest_file, avatar_file.file)
+        image = await image_service.process_upload(avatar_file, AVATAR_WIDTHS)
 
         supabase_autenticated = await create_authenticated_client(token)
 
         profile_res = (
             supabase_admin.from_("profiles")
-            .select("avatar_url")
+            .select("avatar_url, avatar_variants")
             .eq("id", user_id)
             .single()
             .execute()
         )
 
-        if profile_res.data and profile_res.data.get("avatar_url"):
-            old_url = profile_res.data["avatar_url"]
-            old_file_name = old_url.split("/")[-1].split("?")[0]
-            if old_file_name:
-                supabase_autenticated.storage.from_("avatars").remove(
-                    [f"avatars/{old_file_name}"]
-                )
-
-        MIME_TYPE_MAP = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}
-        content_type = avatar_file.content_type
-        file_extension = MIME_TYPE_MAP.get(content_type, "jpg")
-
-        file_name = f"{user_id}.{file_extension}"
-        file_path = f"avatars/{file_name}"
-
-        file_content = await avatar_file.read()
-
-        supabase_autenticated.storage.from_("avatars").upload(
-            path=file_path,
-            file=file_content,
-            file_options={"content-type": avatar_file.content_type, "upsert": "true"},
-        )
-
-        url_data = supabase_autenticated.storage.from_("avatars").get_public_url(
-            file_path
+        file_path = f"avatars/{user_id}/{digest}.{image['extension']}"
+        await reserve_stored_objects("avatars", f"avatars/{user_id}/{digest}")
+        avatar_url, avatar_variants = await store_image(
+            "avatars", file_path, image, token=token
         )
-        public_url = url_data
-        timestamp = int(time.time())
-        if "?" in public_url:
-            avatar_url = f"{public_url}&t={timestamp}"
-        else:
-            avatar_url = f"{public_url}?t={timestamp}"
 
         update_response = (
             supabase_autenticated.from_("profiles")
-            .update({"avatar_url": avatar_url})
+            .update({"avatar_url": avatar_url, "avatar_variants": avatar_variants})
             .eq("id", user_id)
             .execute()
         )
@@ -185,14 +215,32 @@ async def update_avatar(user_id: str, avatar_file: UploadFile, token: str):
                 "INTERNAL_SERVER_ERROR",
                 "Falha ao salvar a URL do avatar no perfil (nenhum registro atualizado).",
             )
+        invalidate_profile_cache(user_id=user_id)
+
+        if profile_res.data and profile_res.data.get("avatar_url"):
+            new_paths = set(
+                avatar_paths(
+                    {"avatar_url": avatar_url, "avatar_variants": avatar_variants}
+                )
+            )
+            old_paths = [
+                path for path in avatar_paths(profile_res.data) if path not in new_paths
+            ]
+            enqueue_deletions(
+                "avatars",
+                ((path, profile_res.data["avatar_url"]) for path in old_paths),
+            )
 
         return {
             "message": "Avatar atualizado com sucesso!",
             "avatar_url": avatar_url,
+            "avatar_variants": avatar_variants,
         }
     except APIError as e:
         raise AppException("STORAGE_ERROR", f"Falha ao atualizar o avatar: {e.message}")
     except Exception as e:
+        if isinstance(e, AppException):
+            raise
         raise AppException(
             "INTERNAL_SERVER_ERROR", f"Erro inesperado ao atualizar avatar: {str(e)}"
         )
@@ -202,7 +250,7 @@ async def delete_avatar(user_id: str):
     try:
         profile_res = (
             supabase_admin.from_("profiles")
-            .select("avatar_url")
+            .select("avatar_url, avatar_variants")
             .eq("id", user_id)
             .single()
             .execute()
@@ -211,15 +259,9 @@ async def delete_avatar(user_id: str):
         if not (profile_res.data and profile_res.data.get("avatar_url")):
             return {"message": "Nenhum avatar para remover."}
 
-        old_url = profile_res.data["avatar_url"]
-        old_file_name = old_url.split("/")[-1].split("?")[0]
-
-        if old_file_name:
-            supabase_admin.storage.from_("avatars").remove([old_file_name])
-
         update_res = (
             supabase_admin.from_("profiles")
-            .update({"avatar_url": None})
+            .update({"avatar_url": None, "avatar_variants": []})
             .eq("id", user_id)
             .execute()
         )
@@ -228,6 +270,14 @@ async def delete_avatar(user_id: str):
             raise AppException(
                 "INTERNAL_SERVER_ERROR", "Falha ao remover a URL do avatar do perfil."
             )
+        invalidate_profile_cache(user_id=user_id)
+        enqueue_deletions(
+            "avatars",
+            (
+                (path, profile_res.data["avatar_url"])
+                for path in avatar_paths(profile_res.data)
+            ),
+        )
 
         return {"message": "Avatar removido com sucesso!"}
 
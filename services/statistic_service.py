@@ -1,122 +1,281 @@
+import asyncio
+import os
+import time
 from datetime import datetime, timezone
-from config.supabase_client import supabase
+from typing import Optional
+
+import numpy as np
+
+from config.supabase_client import supabase, supabase_admin
+from helpers.activity import compute_activity, timestamps_to_array
+from helpers.background import run_in_background
+from helpers.cache import TTLCache
 from helpers.exceptions import AppException
+from helpers.pagination import (
+    decode_cursor,
+    keyset_filter,
+    build_cursor_page,
+    iter_keyset,
+)
 from postgrest.exceptions import APIError
 from services.follow_service import get_user_id_by_username
-from services.forum_service import get_forum_stats
+from services.forum_service import get_forum_stats_snapshot
 
+USER_STATS_MAX_AGE_SECONDS = int(os.environ.get("USER_STATS_MAX_AGE_SECONDS", "86400"))
+TOPICS_STREAM_CHUNK_SIZE = 500
+USER_STATS_FIELDS = (
+    "topics_count, messages_count, last_topic_at, last_post_at, "
+    "computed_at, updated_at"
+)
+ACTIVITY_CACHE_TTL = int(os.environ.get("ACTIVITY_CACHE_TTL", "600"))
+ACTIVITY_HEATMAP_WEEKS = 53
+ACTIVITY_PAGE_SIZE = 1000
 
-async def get_user_stats(username):
-    try:
-        user_id = await get_user_id_by_username(username)
+activity_cache = TTLCache(ACTIVITY_CACHE_TTL, 1000)
 
-        profile_res = (
-            supabase.from_("profiles")
-            .select("joined_at, mensagens_count, followers_count, last_login")
-            .eq("id", user_id)
-            .single()
-            .execute()
-        )
-        if not profile_res.data:
-            raise AppException("NOT_FOUND", "Perfil não encontrado.")
-        profile = profile_res.data
-        last_topic_res = (
-            supabase.from_("topicos")
-            .select("created_in")
-            .eq("author_id", user_id)
-            .order("created_in", desc=True)
-            .limit(1)
-            .execute()
-        )
-        last_comment_res = (
-            supabase.from_("comentarios")
-            .select("created_in")
-            .eq("author_id", user_id)
-            .order("created_in", desc=True)
-            .limit(1)
-            .execute()
-        )
-        count_res = (
-            supabase.from_("topicos")
-            .select("*", count="exact", head=True)
-            .eq("author_id", user_id)
+
+def compute_user_stats_record(user_id: str) -> dict:
+    profile_res = (
+        supabase.from_("profiles")
+        .select("mensagens_count")
+        .eq("id", user_id)
+        .single()
+        .execute()
+    )
+    count_res = (
+        supabase.from_("topicos")
+        .select("*", count="exact", head=True)
+        .eq("author_id", user_id)
+        .execute()
+    )
+    last_topic_res = (
+        supabase.from_("topicos")
+        .select("created_in")
+        .eq("author_id", user_id)
+        .order("created_in", desc=True)
+        .limit(1)
+        .execute()
+    )
+    last_comment_res = (
+        supabase.from_("comentarios")
+        .select("created_in")
+        .eq("author_id", user_id)
+        .order("created_in", desc=True)
+        .limit(1)
+        .execute()
+    )
+
+    last_topic_at = (
+        last_topic_res.data[0]["created_in"] if last_topic_res.data else None
+    )
+    last_comment_at = (
+        last_comment_res.data[0]["created_in"] if last_comment_res.data else None
+    )
+    post_dates = [value for value in (last_topic_at, last_comment_at) if value]
+    now = datetime.now(timezone.utc).isoformat()
+
+    return {
+        "user_id": user_id,
+        "topics_count": count_res.count or 0,
+        "messages_count": (profile_res.data or {}).get("mensagens_count") or 0,
+        "last_topic_at": last_topic_at,
+        "last_post_at": (
+            max(post_dates, key=datetime.fromisoformat) if post_dates else None
+        ),
+        "computed_at": now,
+        "updated_at": now,
+    }
+
+
+def store_user_stats_record(user_id: str) -> dict:
+    record = compute_user_stats_record(user_id)
+    supabase_admin.from_("user_stats").upsert(record).execute()
+    return record
+
+
+def refresh_user_stats(user_id: str):
+    run_in_background(
+        asyncio.to_thread(store_user_stats_record, user_id), "user_stats_refresh"
+    )
+
+
+def is_latest(created_in: str, latest: Optional[str]) -> bool:
+    return latest is None or datetime.fromisoformat(
+        created_in
+    ) >= datetime.fromisoformat(latest)
+
+
+def apply_stats_event(
+    record: dict, kind: str, created_in: str, delta: int
+) -> Optional[dict]:
+    updated = dict(record)
+    if kind == "topic":
+        updated["topics_count"] = max(0, (record.get("topics_count") or 0) + delta)
+
+    fields = ["last_post_at"] + (["last_topic_at"] if kind == "topic" else [])
+    for field in fields:
+        if not is_latest(created_in, record.get(field)):
+            continue
+        if delta < 0:
+            return None
+        if delta > 0:
+            updated[field] = created_in
+    return updated
+
+
+def update_user_stats_record(user_id: str, kind: str, created_in: str, delta: int):
+    profile_res = (
+        supabase_admin.from_("profiles")
+        .select(f"mensagens_count, user_stats({USER_STATS_FIELDS})")
+        .eq("id", user_id)
+        .maybe_single()
+        .execute()
+    )
+    profile = (profile_res and profile_res.data) or {}
+    record = profile.get("user_stats")
+    if isinstance(record, list):
+        record = record[0] if record else None
+
+    updated = apply_stats_event(record, kind, created_in, delta) if record else None
+    if updated is not None:
+        updated["messages_count"] = profile.get("mensagens_count") or 0
+        updated["updated_at"] = datetime.now(timezone.utc).isoformat()
+        response = (
+            supabase_admin.from_("user_stats")
+            .update(updated)
+            .eq("user_id", user_id)
+            .eq("updated_at", record["updated_at"])
             .execute()
         )
-        topics_count = count_res.count or 0
+        if response.data:
+            return
 
-        forum_stats = await get_forum_stats()
-        total_topics = forum_stats.get("totalTopics", 0)
-        total_posts = forum_stats.get("totalPosts", 0)
+    store_user_stats_record(user_id)
 
-        member_since = datetime.fromisoformat(profile["joined_at"])
-        days_as_member = (datetime.now(timezone.utc) - member_since).days
-        days_as_member = max(1, days_as_member)
 
-        topics_per_day = round(topics_count / days_as_member, 2)
-        topics_percentage = (
-            round((topics_count / total_topics) * 100, 2) if total_topics > 0 else 0
-        )
+def record_user_post(user_id: str, kind: str, created_in: str, delta: int = 1):
+    run_in_background(
+        asyncio.to_thread(update_user_stats_record, user_id, kind, created_in, delta),
+        "user_stats_update",
+    )
 
-        messages_count = profile.get("mensagens_count", 0)
-        messages_per_day = round(messages_count / days_as_member, 2)
-        messages_percentage = (
-            round((messages_count / total_posts) * 100, 2) if total_posts > 0 else 0
-        )
 
-        last_topic_date = (
-            datetime.fromisoformat(last_topic_res.data[0]["created_in"])
-            if last_topic_res.data
-            else None
-        )
-        last_comment_date = (
-            datetime.fromisoformat(last_comment_res.data[0]["created_in"])
-            if last_comment_res.data
-            else None
+def build_user_stats_response(profile: dict, record: dict, forum_stats: dict):
+    total_topics = forum_stats.get("totalTopics", 0)
+    total_posts = forum_stats.get("totalPosts", 0)
+
+    member_since = datetime.fromisoformat(profile["joined_at"])
+    days_as_member = (datetime.now(timezone.utc) - member_since).days
+    days_as_member = max(1, days_as_member)
+
+    topics_count = record.get("topics_count", 0)
+    topics_per_day = round(topics_count / days_as_member, 2)
+    topics_percentage = (
+        round((topics_count / total_topics) * 100, 2) if total_topics > 0 else 0
+    )
+
+    messages_count = record.get("messages_count", 0)
+    messages_per_day = round(messages_count / days_as_member, 2)
+    messages_percentage = (
+        round((messages_count / total_posts) * 100, 2) if total_posts > 0 else 0
+    )
+
+    last_topic_date = (
+        datetime.fromisoformat(record["last_topic_at"])
+        if record.get("last_topic_at")
+        else None
+    )
+    last_post_date = (
+        datetime.fromisoformat(record["last_post_at"])
+        if record.get("last_post_at")
+        else None
+    )
+
+    return {
+        "topicsCount": topics_count,
+        "topicsPerDay": topics_per_day,
+        "topicsPercentage": topics_percentage,
+        "lastTopicDate": last_topic_date,
+        "messagesCount": messages_count,
+        "messagesPerDay": messages_per_day,
+        "messagesPercentage": messages_percentage,
+        "lastPostDate": last_post_date,
+        "followersCount": profile.get("followers_count", 0),
+        "memberSince": profile["joined_at"],
+        "lastLogin": profile.get("last_login"),
+    }
+
+
+async def get_user_stats(username):
+    try:
+        profile_res = (
+            supabase.from_("profiles")
+            .select(
+                f"id, joined_at, followers_count, last_login, user_stats({USER_STATS_FIELDS})"
+            )
+            .eq("username", username)
+            .maybe_single()
+            .execute()
         )
+        if not (profile_res and profile_res.data):
+            raise AppException("NOT_FOUND", "Perfil não encontrado.")
+        profile = profile_res.data
+
+        record = profile.get("user_stats")
+        if isinstance(record, list):
+            record = record[0] if record else None
 
-        last_post_date = None
-        if last_topic_date and last_comment_date:
-            last_post_date = max(last_topic_date, last_comment_date)
+        if not record:
+            record = await asyncio.to_thread(store_user_stats_record, profile["id"])
         else:
-            last_post_date = last_topic_date or last_comment_date
-
-        return {
-            "topicsCount": topics_count,
-            "topicsPerDay": topics_per_day,
-            "topicsPercentage": topics_percentage,
-            "lastTopicDate": last_topic_date,
-            "messagesCount": messages_count,
-            "messagesPerDay": messages_per_day,
-            "messagesPercentage": messages_percentage,
-            "lastPostDate": last_post_date,
-            "followersCount": profile.get("followers_count", 0),
-            "memberSince": profile["joined_at"],
-            "lastLogin": profile.get("last_login"),
-        }
+            age = datetime.now(timezone.utc) - datetime.fromisoformat(
+                record.get("computed_at") or record["updated_at"]
+            )
+            if age.total_seconds() > USER_STATS_MAX_AGE_SECONDS:
+                refresh_user_stats(profile["id"])
+
+        forum_stats = await get_forum_stats_snapshot()
+        return build_user_stats_response(profile, record, forum_stats)
     except APIError as e:
         raise AppException(
             "DATABASE_ERROR", f"Erro ao buscar estatísticas do usuário: {e.message}"
         )
     except Exception as e:
+        if isinstance(e, AppException):
+            raise
         raise AppException(
             "INTERNAL_SERVER_ERROR",
             f"Erro inesperado ao buscar estatísticas do usuário: {str(e)}",
         )
 
 
-async def get_topics_by_author(username: str):
+def fetch_topics_by_author_page(author_id: str, limit: int, cursor_values=None):
+    query = (
+        supabase.from_("topicos")
+        .select(
+            "id, title, slug, category, created_in, profiles( username, role, avatar_url), comentarios ( count )"
+        )
+        .eq("author_id", author_id)
+    )
+    if cursor_values:
+        query = query.or_(keyset_filter("created_in", "id", cursor_values, True))
+    response = (
+        query.order("created_in", desc=True)
+        .order("id", desc=True)
+        .limit(limit)
+        .execute()
+    )
+    return response.data or []
+
+
+async def get_topics_by_author(username: str, limit: int = 20, cursor: str = None):
+    author_id = await get_user_id_by_username(username)
+    cursor_values = decode_cursor(cursor) if cursor else None
     try:
-        author_id = await get_user_id_by_username(username)
-        response = (
-            supabase.from_("topicos")
-            .select(
-                "title, slug, category, created_in, profiles( username, role, avatar_url), comentarios ( count )"
-            )
-            .eq("author_id", author_id)
-            .order("created_in", desc=True)
-            .execute()
+        rows = fetch_topics_by_author_page(author_id, limit + 1, cursor_values)
+        return build_cursor_page(
+            rows, limit, lambda row: (row["created_in"], row["id"])
         )
-        return response.data or []
     except APIError as e:
         raise AppException(
             "DATABASE_ERROR",
@@ -127,3 +286,67 @@ async def get_topics_by_author(username: str):
             "INTERNAL_SERVER_ERROR",
             f"Erro inesperado ao buscar os tópicos do usuário: {str(e)}",
         )
+
+
+def iter_topics_by_author(author_id: str):
+    cursor_values = None
+    while True:
+        rows = fetch_topics_by_author_page(
+            author_id, TOPICS_STREAM_CHUNK_SIZE, cursor_values
+        )
+        yield from rows
+
+        if len(rows) < TOPICS_STREAM_CHUNK_SIZE:
+            return
+        cursor_values = [rows[-1]["created_in"], rows[-1]["id"]]
+
+
+async def stream_topics_by_author(username: str):
+    author_id = await get_user_id_by_username(username)
+    return iter_topics_by_author(author_id)
+
+
+def fetch_post_timestamps(author_id: str) -> np.ndarray:
+    return np.concatenate(
+        [
+            timestamps_to_array(
+                row["created_in"]
+                for row in iter_keyset(
+                    lambda table=table: supabase.from_(table)
+                    .select("id, created_in")
+                    .eq("author_id", author_id),
+                    "id",
+                    page_size=ACTIVITY_PAGE_SIZE,
+                )
+            )
+            for table in ("topicos", "comentarios")
+        ]
+    )
+
+
+def invalidate_user_activity(user_id: str):
+    activity_cache.delete(str(user_id))
+
+
+async def get_user_activity(username: str):
+    author_id = await get_user_id_by_username(username)
+    cached = activity_cache.get(str(author_id))
+    if cached is not None:
+        return cached
+
+    try:
+        timestamps = await asyncio.to_thread(fetch_post_timestamps, author_id)
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR",
+            f"Erro ao buscar a atividade do usuário: {e.message}",
+        )
+    except Exception as e:
+        raise AppException(
+            "INTERNAL_SERVER_ERROR",
+            f"Erro inesperado ao buscar a atividade do usuário: {str(e)}",
+        )
+
+    activity = compute_activity(timestamps, int(time.time()), ACTIVITY_HEATMAP_WEEKS)
+    activity_cache.set(str(author_id), activity)
+    return activity
@@ -0,0 +1,139 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Iterator, List, Optional
+
+from config.supabase_client import supabase_admin as supabase
+from helpers.exceptions import AppException
+from helpers.pagination import iter_keyset
+from helpers.storage import storage
+from postgrest.exceptions import APIError
+from services.deletion_service import STORAGE_DELETION_BATCH_SIZE, enqueue_deletions
+from services.upload_service import storage_path
+
+STORAGE_GC_ENABLED = os.environ.get("STORAGE_GC_ENABLED", "false").lower() == "true"
+STORAGE_GC_INTERVAL_SECONDS = int(
+    os.environ.get("STORAGE_GC_INTERVAL_SECONDS", "86400")
+)
+STORAGE_GC_GRACE_HOURS = float(os.environ.get("STORAGE_GC_GRACE_HOURS", "24"))
+STORAGE_GC_PAGE_SIZE = 1000
+STORAGE_GC_SAMPLE_SIZE = 20
+FOLDER_PLACEHOLDER = ".emptyFolderPlaceholder"
+
+
+def referenced_paths(bucket: str, rows: Iterator[dict], fields: tuple) -> set:
+    paths = set()
+    for row in rows:
+        url, variants = row[fields[0]], row[fields[1]] or []
+        for value in [url, *(variant["url"] for variant in variants)]:
+            path = storage_path(value, bucket) if value else None
+            if path:
+                paths.add(path)
+    return paths
+
+
+def image_references() -> set:
+    rows = iter_keyset(
+        lambda: supabase.from_("imagens").select("id, url, variants"),
+        "id",
+        page_size=STORAGE_GC_PAGE_SIZE,
+    )
+    return referenced_paths("images", rows, ("url", "variants"))
+
+
+def avatar_references() -> set:
+    rows = iter_keyset(
+        lambda: supabase.from_("profiles")
+        .select("id, avatar_url, avatar_variants")
+        .not_.is_("avatar_url", "null"),
+        "id",
+        page_size=STORAGE_GC_PAGE_SIZE,
+    )
+    return referenced_paths("avatars", rows, ("avatar_url", "avatar_variants"))
+
+
+GC_BUCKETS = {"images": image_references, "avatars": avatar_references}
+
+
+async def iter_bucket_objects(bucket: str, prefix: str = "") -> AsyncIterator[dict]:
+    offset = 0
+    while True:
+        page = await storage.list(bucket, prefix, STORAGE_GC_PAGE_SIZE, offset)
+        for entry in page:
+            path = f"{prefix}/{entry['name']}" if prefix else entry["name"]
+            if entry.get("id") is None:
+                async for child in iter_bucket_objects(bucket, path):
+                    yield child
+            elif entry["name"] != FOLDER_PLACEHOLDER:
+                yield {**entry, "path": path}
+
+        if len(page) < STORAGE_GC_PAGE_SIZE:
+            return
+        offset += STORAGE_GC_PAGE_SIZE
+
+
+async def collect_garbage(
+    bucket: str, dry_run: bool = False, grace_hours: Optional[float] = None
+) -> dict:
+    if bucket not in GC_BUCKETS:
+        raise AppException("BAD_REQUEST", f"Bucket não suportado: {bucket}")
+
+    grace = STORAGE_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=grace)
+    references = await asyncio.to_thread(GC_BUCKETS[bucket])
+    report = {
+        "bucket": bucket,
+        "dryRun": dry_run,
+        "scanned": 0,
+        "referenced": 0,
+        "recent": 0,
+        "orphans": 0,
+        "orphanBytes": 0,
+        "sample": [],
+    }
+    pending: List[str] = []
+
+    async def flush():
+        await asyncio.to_thread(
+            enqueue_deletions,
+            bucket,
+            [(path, storage.public_url(bucket, path)) for path in pending],
+        )
+        pending.clear()
+
+    async for entry in iter_bucket_objects(bucket):
+        report["scanned"] += 1
+        if entry["path"] in references:
+            report["referenced"] += 1
+            continue
+        if datetime.fromisoformat(entry["created_at"]) > cutoff:
+            report["recent"] += 1
+            continue
+
+        report["orphans"] += 1
+        report["orphanBytes"] += (entry.get("metadata") or {}).get("size") or 0
+        if len(report["sample"]) < STORAGE_GC_SAMPLE_SIZE:
+            report["sample"].append(entry["path"])
+        if not dry_run:
+            pending.append(entry["path"])
+            if len(pending) >= STORAGE_DELETION_BATCH_SIZE:
+                await flush()
+
+    if pending:
+        await flush()
+    return report
+
+
+async def collect_all_garbage() -> None:
+    for bucket in GC_BUCKETS:
+        try:
+            report = await collect_garbage(bucket)
+        except APIError as e:
+            raise AppException(
+                "DATABASE_ERROR", f"Erro ao coletar arquivos órfãos: {e.message}"
+            )
+        print(
+            f"Coleta de órfãos em '{bucket}': {report['scanned']} arquivos, "
+            f"{report['orphans']} enfileirados para remoção "
+            f"({report['orphanBytes'] / 1024 / 1024:.1f} MiB)"
+        )
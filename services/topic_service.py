@@ -9,7 +9,15 @@ from helpers.exceptions import AppException
 from postgrest.exceptions import APIError
 
 from services.category_service import category_exists
-from services.upload_service import delete_file
+from services.upload_service import delete_files
+from services.profile_service import invalidate_profile_cache
+from services.feed_service import publish_to_feeds
+from services.statistic_service import (
+    invalidate_user_activity,
+    record_user_post,
+    refresh_user_stats,
+)
+from services import leaderboard_service
 
 
 def generate_slug(title: str) -> str:
@@ -26,7 +34,7 @@ async def get_topic_by_field(field: str, value, page: int, limit: int):
         topic_res = (
             supabase.from_("topicos")
             .select(
-                "*, profiles(username, avatar_url, role), imagens(id, url), comment_count:comentarios(count)"
+                "*, profiles(username, avatar_url, avatar_variants, role), imagens(id, url, variants), comment_count:comentarios(count)"
             )
             .eq(field, value)
             .single()
@@ -46,7 +54,7 @@ async def get_topic_by_field(field: str, value, page: int, limit: int):
 
         comments_res = (
             supabase.from_("comentarios")
-            .select("*, profiles(username, avatar_url, role)")
+            .select("*, profiles(username, avatar_url, avatar_variants, role)")
             .eq("topic_id", topic_data["id"])
             .order("created_in", desc=False)
             .range(comments_from, comments_to)
@@ -60,7 +68,7 @@ async def get_topic_by_field(field: str, value, page: int, limit: int):
 
 
 async def create_topic(
-    title: str, content: str, author_id: str, category: str, images: List[str] = None
+    title: str, content: str, author_id: str, category: str, images: List[dict] = None
 ):
     if not await category_exists(category):
         raise AppException(
@@ -101,11 +109,25 @@ async def create_topic(
 
         if images and topic_data:
             images_to_insert = [
-                {"url": url, "topic_id": topic_data["id"], "author_id": author_id}
-                for url in images
+                {
+                    "url": image["url"],
+                    "variants": image["variants"],
+                    "topic_id": topic_data["id"],
+                    "author_id": author_id,
+                }
+                for image in images
             ]
-            supabase.from_("imagens").insert(images_to_insert).execute()
-
+            try:
+                supabase.from_("imagens").insert(images_to_insert).execute()
+            except APIError:
+                supabase.from_("topicos").delete().eq("id", topic_data["id"]).execute()
+                raise
+
+        invalidate_profile_cache(user_id=author_id)
+        publish_to_feeds(author_id, topic_data["id"], topic_data["created_in"])
+        record_user_post(author_id, "topic", topic_data["created_in"])
+        invalidate_user_activity(author_id)
+        leaderboard_service.record_topic_created(author_id, topic_data["created_in"])
         return topic_data
     except (APIError, IndexError) as e:
         raise AppException("DATABASE_ERROR", f"Erro ao criar tópico: {e.message}")
@@ -142,15 +164,26 @@ async def update_topic(topic_id: int, user_id: str, updates: dict):
 async def delete_topic(topic_id: int, user_id: str):
     try:
         images_res = (
-            supabase.from_("imagens").select("url").eq("topic_id", topic_id).execute()
+            supabase.from_("imagens")
+            .select("url, variants")
+            .eq("topic_id", topic_id)
+            .execute()
         )
-        if images_res.data:
-            for image in images_res.data:
-                await delete_file(image["url"])
-
-        supabase.from_("topicos").delete().match(
-            {"id": topic_id, "author_id": user_id}
-        ).execute()
+        deleted_res = (
+            supabase.from_("topicos")
+            .delete()
+            .match({"id": topic_id, "author_id": user_id})
+            .execute()
+        )
+        if deleted_res.data:
+            delete_files(images_res.data or [])
+        for topic in deleted_res.data or []:
+            leaderboard_service.record_topic_deleted(
+                topic["author_id"], topic["id"], topic["created_in"]
+            )
+        invalidate_profile_cache(user_id=user_id)
+        refresh_user_stats(user_id)
+        invalidate_user_activity(user_id)
     except APIError as e:
         raise AppException(
             "DATABASE_ERROR", f"Ocorreu um erro ao deletar o tópico: {e.message}"
@@ -158,7 +191,7 @@ async def delete_topic(topic_id: int, user_id: str):
 
 
 async def create_comment(
-    content: str, author_id: str, topic_id: int, images: List[str] = None
+    content: str, author_id: str, topic_id: int, images: List[dict] = None
 ):
     try:
         rpc_res = supabase.rpc(
@@ -179,14 +212,40 @@ async def create_comment(
 
         if images and comment_data:
             images_to_insert = [
-                {"url": url, "comment_id": comment_data["id"], "author_id": author_id}
-                for url in images
+                {
+                    "url": image["url"],
+                    "variants": image["variants"],
+                    "comment_id": comment_data["id"],
+                    "author_id": author_id,
+                }
+                for image in images
             ]
-            supabase.from_("imagens").insert(images_to_insert).execute()
+            try:
+                supabase.from_("imagens").insert(images_to_insert).execute()
+            except APIError:
+                supabase.from_("comentarios").delete().eq(
+                    "id", comment_data["id"]
+                ).execute()
+                raise
+
+        invalidate_profile_cache(user_id=author_id)
+        publish_to_feeds(
+            author_id,
+            topic_id,
+            comment_data["created_in"],
+            comment_id=comment_data["id"],
+        )
+        record_user_post(author_id, "comment", comment_data["created_in"])
+        invalidate_user_activity(author_id)
+        leaderboard_service.record_comment_created(
+            author_id, topic_id, comment_data["created_in"]
+        )
 
         full_comment_res = (
             supabase.from_("comentarios")
-            .select("*, profiles(username, avatar_url, role), imagens(id, url)")
+            .select(
+                "*, profiles(username, avatar_url, avatar_variants, role), imagens(id, url, variants)"
+            )
             .eq("id", comment_data["id"])
             .single()
             .execute()
@@ -218,7 +277,9 @@ async def update_comment(comment_id: int, user_id: str, content: str):
             )
         response = (
             supabase.from_("comentarios")
-            .select("*, profiles(username, avatar_url, role), imagens(id, url)")
+            .select(
+                "*, profiles(username, avatar_url, avatar_variants, role), imagens(id, url, variants)"
+            )
             .eq("id", comment_id)
             .single()
             .execute()
@@ -241,17 +302,25 @@ async def delete_comment(comment_id: int, user_id: str):
     try:
         images_res = (
             supabase.from_("imagens")
-            .select("url")
+            .select("url, variants")
             .eq("comment_id", comment_id)
             .execute()
         )
-        if images_res.data:
-            for image in images_res.data:
-                await delete_file(image["url"])
-
-        supabase.from_("comentarios").delete().match(
-            {"id": comment_id, "author_id": user_id}
-        ).execute()
+        deleted_res = (
+            supabase.from_("comentarios")
+            .delete()
+            .match({"id": comment_id, "author_id": user_id})
+            .execute()
+        )
+        if deleted_res.data:
+            delete_files(images_res.data or [])
+        for comment in deleted_res.data or []:
+            leaderboard_service.record_comment_deleted(
+                comment["author_id"], comment["topic_id"], comment["created_in"]
+            )
+            record_user_post(user_id, "comment", comment["created_in"], -1)
+        invalidate_profile_cache(user_id=user_id)
+        invalidate_user_activity(user_id)
     except APIError as e:
         raise AppException(
             "DATABASE_ERROR", f"Ocorreu um erro ao deletar o comentário: {e.message}"
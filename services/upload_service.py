@@ -1,64 +1,211 @@
-import time
+import asyncio
+import hashlib
+import os
+import re
+from typing import List, Optional, Tuple
+from urllib.parse import unquote
+import httpx
 from fastapi import UploadFile
 from config.supabase_client import supabase_admin
 from helpers.exceptions import AppException
+from helpers.images import IMAGE_WIDTHS
+from helpers.storage import IMMUTABLE_CACHE_CONTROL, storage
+from helpers.upload_limits import (
+    UPLOAD_CHUNK_SIZE,
+    UPLOAD_MAX_FILE_BYTES,
+    UPLOAD_MAX_REQUEST_BYTES,
+    PAYLOAD_TOO_LARGE_MESSAGE,
+)
 from postgrest.exceptions import APIError
-
-
-async def upload_file(file: UploadFile) -> str:
+from services import image_service
+from services.deletion_service import enqueue_deletions, reserve_stored_objects
+
+UPLOAD_MAX_CONCURRENCY = int(os.environ.get("UPLOAD_MAX_CONCURRENCY", "16"))
+UPLOAD_REQUEST_CONCURRENCY = int(os.environ.get("UPLOAD_REQUEST_CONCURRENCY", "4"))
+
+upload_slots = asyncio.Semaphore(UPLOAD_MAX_CONCURRENCY)
+
+EXTENSION_PATTERN = re.compile(r"\.[a-z0-9]{1,10}")
+
+
+def check_upload_size(file: UploadFile) -> None:
+    if file.size is not None and file.size > UPLOAD_MAX_FILE_BYTES:
+        raise AppException("PAYLOAD_TOO_LARGE", PAYLOAD_TOO_LARGE_MESSAGE)
+
+
+def digest_file(file) -> str:
+    digest = hashlib.sha256()
+    size = 0
+    file.seek(0)
+    while chunk := file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > UPLOAD_MAX_FILE_BYTES:
+            raise AppException("PAYLOAD_TOO_LARGE", PAYLOAD_TOO_LARGE_MESSAGE)
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def content_key(digest: str, filename: str) -> str:
+    extension = os.path.splitext(filename)[1].lower()
+    if not EXTENSION_PATTERN.fullmatch(extension):
+        extension = ""
+    return f"public/{digest[:2]}/{digest}{extension}"
+
+
+async def put_object(
+    bucket: str, path: str, data: bytes, content_type: str, **options
+) -> str:
+    await storage.put(bucket, path, data, content_type, **options)
+    return storage.public_url(bucket, path)
+
+
+async def store_image(
+    bucket: str,
+    path: str,
+    image: dict,
+    token: Optional[str] = None,
+) -> Tuple[str, List[dict]]:
+    stem = path.rsplit(".", 1)[0]
+
+    async def store_variant(derivative: dict) -> dict:
+        url = await put_object(
+            bucket,
+            f"{stem}_{derivative['width']}.{derivative['extension']}",
+            derivative["data"],
+            derivative["content_type"],
+            token=token,
+            exist_ok=True,
+            cache_control=IMMUTABLE_CACHE_CONTROL,
+        )
+        return {
+            "width": derivative["width"],
+            "format": derivative["format"],
+            "url": url,
+        }
+
+    variants = await asyncio.gather(*map(store_variant, image["derivatives"]))
+    url = await put_object(
+        bucket,
+        path,
+        image["data"],
+        image["content_type"],
+        token=token,
+        exist_ok=True,
+        cache_control=IMMUTABLE_CACHE_CONTROL,
+    )
+    return url, list(variants)
+
+
+def find_stored_variants(public_url: str) -> Optional[List[dict]]:
+    response = (
+        supabase_admin.from_("imagens")
+        .select("variants")
+        .eq("url", public_url)
+        .limit(1)
+        .execute()
+    )
+    return response.data[0]["variants"] if response.data else None
+
+
+async def upload_file(file: UploadFile) -> dict:
     if not file or not file.filename:
         raise AppException(
             type="VALIDATION_ERROR", message="Nenhum arquivo fornecido para upload."
         )
 
     try:
-        file_content = await file.read()
-
-        file_path = (
-            f"public/{int(time.time() * 1000)}-{file.filename.replace(' ', '_')}"
-        )
+        check_upload_size(file)
+        digest = await asyncio.to_thread(digest_file, file.file)
+        file_path = content_key(digest, file.filename)
+        await reserve_stored_objects("images", file_path.rsplit(".", 1)[0])
 
-        supabase_admin.storage.from_("images").upload(
-            path=file_path,
-            file=file_content,
-            file_options={
-                "content-type": file.content_type or "application/octet-stream",
-                "upsert": "false",
-            },
-        )
+        if await storage.exists("images", file_path):
+            public_url = storage.public_url("images", file_path)
+            variants = await asyncio.to_thread(find_stored_variants, public_url)
+            if variants is not None:
+                return {"url": public_url, "variants": variants}
 
-        public_url = supabase_admin.storage.from_("images").get_public_url(file_path)
+        image = await image_service.process_upload(file, IMAGE_WIDTHS)
+        public_url, variants = await store_image("images", file_path, image)
 
         if not public_url:
             raise AppException(
                 "STORAGE_ERROR", "Não foi possível obter a URL pública do arquivo."
             )
 
-        return public_url
+        return {"url": public_url, "variants": variants}
 
-    except APIError as e:
+    except (APIError, httpx.HTTPError) as e:
         raise AppException(
             type="STORAGE_ERROR", message="Falha ao fazer upload do arquivo."
         )
     except Exception as e:
+        if isinstance(e, AppException):
+            raise
         raise AppException(
             type="INTERNAL_SERVER_ERROR", message="Ocorreu um erro interno no servidor."
         )
 
 
-async def delete_file(public_url: str) -> None:
-    try:
-        bucket_name = "images"
-        search_string = f"/{bucket_name}/"
+def storage_path(public_url: str, bucket_name: str) -> Optional[str]:
+    search_string = f"/{bucket_name}/"
 
-        start_index = public_url.find(search_string)
-        if start_index == -1:
+    start_index = public_url.find(search_string)
+    if start_index == -1:
+        return None
 
-            return
+    return unquote(public_url[start_index + len(search_string) :].split("?")[0])
 
-        file_path = public_url[start_index + len(search_string) :]
 
-        supabase_admin.storage.from_(bucket_name).remove([file_path])
+def delete_files(images: List[dict]) -> None:
+    enqueue_deletions(
+        "images",
+        (
+            (path, image["url"])
+            for image in images
+            for url in [
+                image["url"],
+                *(variant["url"] for variant in image.get("variants") or []),
+            ]
+            if (path := storage_path(url, "images"))
+        ),
+    )
 
-    except Exception as e:
-        return
+
+def discard_uploads(images: List[dict]) -> None:
+    try:
+        delete_files(images)
+    except AppException as e:
+        print(f"Falha ao descartar {len(images)} upload(s) não utilizados: {e.message}")
+
+
+async def upload_files(files: List[UploadFile]) -> List[dict]:
+    files = [file for file in files or [] if file and file.filename]
+    for file in files:
+        check_upload_size(file)
+    if sum(file.size or 0 for file in files) > UPLOAD_MAX_REQUEST_BYTES:
+        raise AppException("PAYLOAD_TOO_LARGE", PAYLOAD_TOO_LARGE_MESSAGE)
+
+    request_slots = asyncio.Semaphore(UPLOAD_REQUEST_CONCURRENCY)
+    failures = []
+
+    async def upload_one(file: UploadFile) -> dict:
+        async with request_slots, upload_slots:
+            if failures:
+                raise AppException(
+                    "STORAGE_ERROR", "Upload cancelado após falha em outro arquivo."
+                )
+            try:
+                return await upload_file(file)
+            except Exception as e:
+                failures.append(e)
+                raise
+
+    results = await asyncio.gather(
+        *(upload_one(file) for file in files), return_exceptions=True
+    )
+    if failures:
+        discard_uploads([result for result in results if isinstance(result, dict)])
+        raise failures[0]
+    return results
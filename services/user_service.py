@@ -1,8 +1,34 @@
+import asyncio
+import os
 from config.supabase_client import supabase
+from helpers.cache import TTLCache
 from helpers.exceptions import AppException
+from helpers.pagination import (
+    build_cursor_page,
+    decode_cursor,
+    is_integer,
+    is_timestamp,
+    keyset_filter,
+    iter_keyset,
+)
+from helpers.username_index import UsernameIndex, username_index
 from postgrest.exceptions import APIError
 from datetime import datetime, timezone
 
+PROFILE_LIST_FIELDS = (
+    "username, role, joined_at, last_login, avatar_url, mensagens_count"
+)
+PROFILE_SORT_COLUMNS = ("joined_at", "last_login", "mensagens_count", "username")
+NULLABLE_SORT_COLUMNS = ("last_login",)
+USERNAME_MAX_LENGTH = 55
+
+USERNAME_INDEX_REFRESH_SECONDS = int(
+    os.environ.get("USERNAME_INDEX_REFRESH_SECONDS", "900")
+)
+USERNAME_INDEX_PAGE_SIZE = 1000
+
+profile_count_cache = TTLCache(300, 1)
+
 
 async def upsert_online_user(user_id: str) -> None:
     try:
@@ -36,30 +62,97 @@ async def remove_online_user(user_id: str) -> None:
         )
 
 
-async def get_all_profiles(page: int, limit: int):
-    try:
-        from_range = (page - 1) * limit
-        to_range = from_range + limit - 1
-
+def get_profiles_total() -> int:
+    total = profile_count_cache.get("total")
+    if total is None:
         count_response = (
-            supabase.from_("profiles").select("*", count="exact", head=True).execute()
-        )
-        total_count = count_response.count or 0
-
-        response = (
             supabase.from_("profiles")
-            .select(
-                "username, role, joined_at, last_login, avatar_url, mensagens_count"
-            )
-            .range(from_range, to_range)
+            .select("*", count="estimated", head=True)
             .execute()
         )
-        data = response.data or []
+        total = count_response.count or 0
+        profile_count_cache.set("total", total)
+    return total
+
+
+def fetch_profiles_without_sort_value(
+    sort: str, descending: bool, limit: int, after_username: str = None
+):
+    query = supabase.from_("profiles").select(PROFILE_LIST_FIELDS).is_(sort, "null")
+    if after_username is not None:
+        operator = query.lt if descending else query.gt
+        query = operator("username", after_username)
+    response = query.order("username", desc=descending).limit(limit).execute()
+    return response.data or []
+
+
+def fetch_profiles_page(sort: str, descending: bool, limit: int, cursor_values=None):
+    query = supabase.from_("profiles").select(PROFILE_LIST_FIELDS)
+    if sort == "username":
+        if cursor_values:
+            operator = query.lt if descending else query.gt
+            query = operator("username", cursor_values[0])
+        response = query.order("username", desc=descending).limit(limit).execute()
+        return response.data or []
+
+    nullable = sort in NULLABLE_SORT_COLUMNS
+    if cursor_values and cursor_values[0] is None:
+        return fetch_profiles_without_sort_value(
+            sort, descending, limit, cursor_values[1]
+        )
+
+    if nullable:
+        query = query.not_.is_(sort, "null")
+    if cursor_values:
+        query = query.or_(keyset_filter(sort, "username", cursor_values, descending))
+    response = (
+        query.order(sort, desc=descending)
+        .order("username", desc=descending)
+        .limit(limit)
+        .execute()
+    )
+    rows = response.data or []
+
+    if nullable and len(rows) < limit:
+        rows += fetch_profiles_without_sort_value(sort, descending, limit - len(rows))
+    return rows
 
-        if not data and page > 1:
-            raise AppException("NOT_FOUND", "Nenhum perfil encontrado nesta página.")
 
-        return {"data": data, "total_count": total_count}
+def is_username(value) -> bool:
+    return (
+        isinstance(value, str)
+        and 0 < len(value) <= USERNAME_MAX_LENGTH
+        and value.isprintable()
+    )
+
+
+PROFILE_CURSOR_CHECKS = {
+    "username": (is_username,),
+    "joined_at": (is_timestamp, is_username),
+    "last_login": (lambda value: value is None or is_timestamp(value), is_username),
+    "mensagens_count": (is_integer, is_username),
+}
+
+
+async def get_all_profiles(
+    limit: int = 20, cursor: str = None, sort: str = "username", order: str = "asc"
+):
+    descending = order == "desc"
+    cursor_values = (
+        decode_cursor(cursor, PROFILE_CURSOR_CHECKS[sort]) if cursor else None
+    )
+    try:
+        rows = fetch_profiles_page(sort, descending, limit + 1, cursor_values)
+        page = build_cursor_page(
+            rows,
+            limit,
+            lambda row: (
+                (row["username"],)
+                if sort == "username"
+                else (row[sort], row["username"])
+            ),
+        )
+        return {**page, "total_count": get_profiles_total()}
 
     except APIError as e:
         raise AppException("DATABASE_ERROR", f"Erro ao buscar perfis: {e.message}")
@@ -67,3 +160,95 @@ async def get_all_profiles(page: int, limit: int):
         raise AppException(
             "INTERNAL_SERVER_ERROR", f"Erro inesperado ao buscar perfis: {str(e)}"
         )
+
+
+def count_profiles() -> int:
+    response = (
+        supabase.from_("profiles").select("id", count="exact", head=True).execute()
+    )
+    return response.count or 0
+
+
+def build_username_index() -> UsernameIndex:
+    expected_count = count_profiles()
+    return UsernameIndex.from_profiles(iter_username_rows(), expected_count)
+
+
+def iter_username_rows():
+    return iter_keyset(
+        lambda: supabase.from_("profiles").select(
+            "id, username, role, avatar_url, mensagens_count"
+        ),
+        "id",
+        page_size=USERNAME_INDEX_PAGE_SIZE,
+    )
+
+
+async def load_username_index():
+    username_index.begin_reload()
+    try:
+        new_index = await asyncio.to_thread(build_username_index)
+    except APIError as e:
+        username_index.cancel_reload()
+        raise AppException(
+            "DATABASE_ERROR", f"Erro ao carregar o índice de usuários: {e.message}"
+        )
+    except Exception as e:
+        username_index.cancel_reload()
+        raise AppException(
+            "INTERNAL_SERVER_ERROR",
+            f"Erro inesperado ao carregar o índice de usuários: {str(e)}",
+        )
+    username_index.replace(new_index)
+
+
+def index_username(user_id: str, username: str):
+    username_index.upsert(user_id, username)
+
+
+def remove_username_from_index(user_id: str):
+    username_index.remove(user_id)
+
+
+def escape_like_pattern(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def is_username_available(username: str) -> bool:
+    if username_index.loaded:
+        taken = username_index.is_taken(username)
+        if taken is not None:
+            return not taken
+
+    try:
+        response = (
+            supabase.from_("profiles")
+            .select("id")
+            .eq("username", username)
+            .limit(1)
+            .execute()
+        )
+        return not response.data
+    except APIError as e:
+        raise AppException(
+            "DATABASE_ERROR",
+            f"Erro ao verificar o nome de usuário: {e.message}",
+        )
+
+
+async def search_users(query: str, limit: int = 10):
+    if username_index.loaded:
+        return username_index.search(query, limit)
+
+    try:
+        response = (
+            supabase.from_("profiles")
+            .select("username, role, avatar_url")
+            .ilike("username", f"{escape_like_pattern(query)}%")
+            .order("mensagens_count", desc=True)
+            .limit(limit)
+            .execute()
+        )
+        return response.data or []
+    except APIError as e:
+        raise AppException("DATABASE_ERROR", f"Erro ao buscar usuários: {e.message}")
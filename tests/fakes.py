@@ -0,0 +1,157 @@
+import re
+import time
+from types import SimpleNamespace
+
+POSTGREST_MAX_ROWS = 1000
+KEYSET_CONDITION = re.compile(r'(\w+)\.(\w+)\."((?:[^"\\]|\\.)*)"')
+COMPARISONS = {
+    "eq": lambda left, right: left == right,
+    "gt": lambda left, right: left > right,
+    "lt": lambda left, right: left < right,
+}
+
+
+class FakeQuery:
+    def __init__(self, db, table):
+        self.db = db
+        self.table = table
+        self.filters = []
+        self.order_columns = []
+        self.row_limit = None
+        self.action = "select"
+        self.payload = None
+        self.single_row = False
+        self.embeds = []
+
+    def select(self, *columns, **options):
+        self.embeds = re.findall(r"(\w+)\(", ",".join(columns))
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self.filters.append(lambda row: row.get(column) > value)
+        return self
+
+    def gte(self, column, value):
+        self.filters.append(lambda row: row.get(column) >= value)
+        return self
+
+    def or_(self, filters):
+        conditions = [
+            (column, operator, re.sub(r"\\(.)", r"\1", value))
+            for column, operator, value in KEYSET_CONDITION.findall(filters)
+        ]
+        clauses = [conditions[:1], conditions[1:]]
+        self.filters.append(
+            lambda row: any(
+                all(
+                    COMPARISONS[operator](str(row.get(column)), value)
+                    for column, operator, value in clause
+                )
+                for clause in clauses
+            )
+        )
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def order(self, column, desc=False):
+        self.order_columns.append((column, desc))
+        return self
+
+    def limit(self, row_limit):
+        self.row_limit = row_limit
+        return self
+
+    def single(self):
+        self.single_row = True
+        return self
+
+    maybe_single = single
+
+    def insert(self, rows, **options):
+        self.action = "insert"
+        self.payload = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def upsert(self, rows, **options):
+        self.action = "upsert"
+        self.payload = rows if isinstance(rows, list) else [rows]
+        return self
+
+    def update(self, values, **options):
+        self.action = "update"
+        self.payload = values
+        return self
+
+    def delete(self, **options):
+        self.action = "delete"
+        return self
+
+    def execute(self):
+        self.db.round_trips += 1
+        time.sleep(self.db.latency)
+        rows = self.db.tables.setdefault(self.table, [])
+        if self.action == "upsert":
+            key = self.db.keys.get(self.table, "id")
+            replaced = {row[key] for row in self.payload}
+            rows[:] = [row for row in rows if row.get(key) not in replaced]
+            rows.extend(dict(row) for row in self.payload)
+            return SimpleNamespace(data=self.payload, count=None)
+        if self.action == "insert":
+            self.db.inserts.append((self.table, len(self.payload)))
+            rows.extend(self.payload)
+            return SimpleNamespace(data=self.payload, count=None)
+
+        matched = [row for row in rows if all(check(row) for check in self.filters)]
+        if self.action == "update":
+            for row in matched:
+                row.update(self.payload)
+            return SimpleNamespace(data=matched, count=len(matched))
+        if self.action == "delete":
+            self.db.tables[self.table] = [row for row in rows if row not in matched]
+            return SimpleNamespace(data=matched, count=len(matched))
+
+        for column, desc in reversed(self.order_columns):
+            matched.sort(key=lambda row: row[column], reverse=desc)
+        if self.single_row:
+            return SimpleNamespace(
+                data=self.embed(matched[0]) if matched else None, count=None
+            )
+        limit = min(self.row_limit or POSTGREST_MAX_ROWS, POSTGREST_MAX_ROWS)
+        return SimpleNamespace(
+            data=[self.embed(row) for row in matched[:limit]], count=len(matched)
+        )
+
+    def embed(self, row):
+        embedded = dict(row)
+        for table in self.embeds:
+            column = self.db.embeds.get(table)
+            if column:
+                embedded[table] = [
+                    dict(related)
+                    for related in self.db.tables.get(table, [])
+                    if related.get(column) == row.get("id")
+                ]
+        return embedded
+
+
+class FakeDatabase:
+    def __init__(self, **tables):
+        self.tables = {name: list(rows) for name, rows in tables.items()}
+        self.inserts = []
+        self.keys = {}
+        self.embeds = {}
+        self.latency = 0.0
+        self.round_trips = 0
+
+    def from_(self, table):
+        return FakeQuery(self, table)
+
+    table = from_
@@ -0,0 +1,37 @@
+from helpers import cache as cache_module
+from helpers.cache import TTLCache, compute_etag, etag_matches
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+    cache = TTLCache(10)
+    cache.set("key", "value")
+
+    now[0] = 105.0
+    assert cache.get("key") == "value"
+    now[0] = 111.0
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_dropped_when_full():
+    cache = TTLCache(60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_etag_is_stable_and_matches_weak_validators():
+    etag = compute_etag({"b": 1, "a": [1, 2]})
+
+    assert etag == compute_etag({"a": [1, 2], "b": 1})
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
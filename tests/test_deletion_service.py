@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+from postgrest.exceptions import APIError
+
+from helpers.exceptions import AppException
+from services import deletion_service
+from tests.fakes import FakeDatabase
+
+
+class RecordingStorage:
+    def __init__(self):
+        self.removed = []
+
+    async def remove(self, bucket, paths):
+        self.removed.append((bucket, sorted(paths)))
+
+
+def entry(entry_id, path, reference_url=None, bucket="images"):
+    return {
+        "id": entry_id,
+        "bucket": bucket,
+        "path": path,
+        "reference_url": reference_url,
+        "attempts": 0,
+    }
+
+
+def test_only_claimed_unreferenced_entries_are_removed(monkeypatch):
+    entries = [
+        entry(1, "a.jpg"),
+        entry(2, "b.jpg", "https://cdn/images/b.jpg"),
+        entry(3, "c.jpg"),
+    ]
+    completed = []
+    storage = RecordingStorage()
+    monkeypatch.setattr(deletion_service, "storage", storage)
+    monkeypatch.setattr(deletion_service, "fetch_due_deletions", lambda: entries)
+    monkeypatch.setattr(deletion_service, "referenced_urls", lambda urls: set(urls))
+    monkeypatch.setattr(deletion_service, "claim_deletions", lambda ids: {1})
+    monkeypatch.setattr(deletion_service, "complete_deletions", completed.extend)
+
+    assert asyncio.run(deletion_service.process_due_deletions()) == 3
+
+    assert storage.removed == [("images", ["a.jpg"])]
+    assert sorted(completed) == [1, 2]
+
+
+def test_reserve_waits_for_in_flight_deletion(monkeypatch):
+    answers = iter([True, True, False])
+    monkeypatch.setattr(
+        deletion_service, "cancel_pending_deletions", lambda *_: next(answers)
+    )
+    monkeypatch.setattr(deletion_service, "STORAGE_DELETION_CLAIM_WAIT_SECONDS", 5)
+
+    asyncio.run(deletion_service.reserve_stored_objects("images", "public/aa/hash"))
+
+    assert next(answers, None) is None
+
+
+def test_reserve_gives_up_when_deletion_stays_in_flight(monkeypatch):
+    monkeypatch.setattr(deletion_service, "cancel_pending_deletions", lambda *_: True)
+    monkeypatch.setattr(deletion_service, "STORAGE_DELETION_CLAIM_WAIT_SECONDS", 0)
+
+    with pytest.raises(AppException) as error:
+        asyncio.run(deletion_service.reserve_stored_objects("images", "public/aa/hash"))
+    assert error.value.type == "CONFLICT"
+
+
+def test_current_avatar_urls_count_as_references(monkeypatch):
+    database = FakeDatabase(
+        imagens=[{"url": "https://cdn/images/a.jpg"}],
+        profiles=[{"id": "user", "avatar_url": "https://cdn/avatars/a.png"}],
+    )
+    monkeypatch.setattr(deletion_service, "supabase", database)
+
+    assert deletion_service.referenced_urls(
+        [
+            "https://cdn/images/a.jpg",
+            "https://cdn/avatars/a.png",
+            "https://cdn/avatars/old.png",
+        ]
+    ) == {"https://cdn/images/a.jpg", "https://cdn/avatars/a.png"}
+
+
+def test_enqueue_failure_is_reported(monkeypatch):
+    class FailingDatabase(FakeDatabase):
+        def from_(self, table):
+            query = super().from_(table)
+
+            def execute():
+                raise APIError({"message": "indisponível"})
+
+            query.execute = execute
+            return query
+
+    monkeypatch.setattr(deletion_service, "supabase", FailingDatabase())
+
+    with pytest.raises(AppException) as error:
+        deletion_service.enqueue_deletions("images", [("a.jpg", None)])
+    assert error.value.type == "DATABASE_ERROR"
+
+
+def test_enqueue_delays_new_entries(monkeypatch):
+    database = FakeDatabase()
+    monkeypatch.setattr(deletion_service, "supabase", database)
+
+    deletion_service.enqueue_deletions(
+        "images", [("a.jpg", "https://cdn/a.jpg"), ("a.jpg", "https://cdn/a.jpg")]
+    )
+
+    [row] = database.tables["storage_deletions"]
+    assert row["path"] == "a.jpg" and row["next_attempt_at"]
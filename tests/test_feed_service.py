@@ -0,0 +1,107 @@
+import asyncio
+
+from services import feed_service
+from tests.fakes import FakeDatabase
+
+
+def test_fan_out_reaches_followers_past_the_row_cap(monkeypatch):
+    followers = [
+        {"follower_id": f"user-{index:05d}", "following_id": "author"}
+        for index in range(2500)
+    ]
+    database = FakeDatabase(
+        profiles=[{"id": "author", "followers_count": len(followers)}],
+        followers=followers,
+    )
+    monkeypatch.setattr(feed_service, "supabase", database)
+
+    feed_service.write_fan_out("author", 1, None, "2024-01-01T00:00:00+00:00")
+
+    delivered = {entry["user_id"] for entry in database.tables["feed_entries"]}
+    assert delivered == {row["follower_id"] for row in followers}
+    assert max(size for _, size in database.inserts) <= 1000
+
+
+def test_fan_out_skips_celebrity_authors(monkeypatch):
+    database = FakeDatabase(
+        profiles=[
+            {
+                "id": "author",
+                "followers_count": feed_service.FEED_CELEBRITY_THRESHOLD,
+            }
+        ],
+        followers=[{"follower_id": "user", "following_id": "author"}],
+    )
+    monkeypatch.setattr(feed_service, "supabase", database)
+
+    feed_service.write_fan_out("author", 1, None, "2024-01-01T00:00:00+00:00")
+
+    assert "feed_entries" not in database.tables
+
+
+def timeline_source(items):
+    def fetch(owner, before, limit):
+        rows = sorted(
+            (item for item in items if before is None or item["createdIn"] <= before),
+            key=feed_service.feed_item_key,
+            reverse=True,
+        )
+        return rows[:limit], len(rows) >= limit
+
+    return fetch
+
+
+def feed_item(item_type, item_id, minute):
+    reference = {"id": item_id}
+    return {
+        "type": item_type,
+        "createdIn": f"2024-01-01T00:{minute:02d}:00+00:00",
+        "author": None,
+        "topic": reference,
+        "comment": reference if item_type == "comment" else None,
+    }
+
+
+def walk_feed(limit):
+    pages, cursor = [], None
+    while True:
+        page = asyncio.run(feed_service.get_feed("reader", limit, cursor))
+        pages.append([(item["type"], item["topic"]["id"]) for item in page["data"]])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            return pages
+
+
+def test_feed_pages_reach_the_oldest_item(monkeypatch):
+    items = [feed_item("topic", item_id, item_id) for item_id in range(1, 10)]
+    monkeypatch.setattr(feed_service, "fetch_timeline_items", timeline_source(items))
+    monkeypatch.setattr(feed_service, "get_celebrity_followees", lambda user: [])
+
+    pages = walk_feed(2)
+
+    assert [item_id for page in pages for _, item_id in page] == list(range(9, 0, -1))
+    assert all(len(page) == 2 for page in pages[:-1])
+
+
+def test_feed_pages_merge_celebrity_sources_with_ties(monkeypatch):
+    timeline = [feed_item("topic", item_id, item_id) for item_id in range(1, 8)]
+    topics = [
+        feed_item("topic", 100 + index, minute)
+        for index, minute in enumerate((2, 5, 5, 7))
+    ]
+    comments = [feed_item("comment", 200 + minute, minute) for minute in (1, 5, 6)]
+    monkeypatch.setattr(feed_service, "fetch_timeline_items", timeline_source(timeline))
+    monkeypatch.setattr(feed_service, "fetch_celebrity_topics", timeline_source(topics))
+    monkeypatch.setattr(
+        feed_service, "fetch_celebrity_comments", timeline_source(comments)
+    )
+    monkeypatch.setattr(feed_service, "get_celebrity_followees", lambda user: ["c"])
+
+    walked = [entry for page in walk_feed(3) for entry in page]
+
+    expected = sorted(
+        timeline + topics + comments,
+        key=feed_service.feed_item_key,
+        reverse=True,
+    )
+    assert walked == [(item["type"], item["topic"]["id"]) for item in expected]
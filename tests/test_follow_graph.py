@@ -0,0 +1,31 @@
+from helpers.follow_graph import FollowGraph
+
+
+def test_edges_and_counts():
+    graph = FollowGraph.from_edges([("a", "b"), ("b", "a"), ("a", "c"), ("a", "c")])
+
+    assert graph.is_mutual("a", "b")
+    assert graph.is_following("a", "c") and not graph.is_following("c", "a")
+    assert graph.following_count("a") == 2
+    assert graph.followers_count("c") == 1
+    assert graph.edge_count() == 3
+
+
+def test_updates_during_reload_are_replayed():
+    graph = FollowGraph.from_edges([("a", "b")])
+    graph.begin_reload()
+    graph.add_edge("c", "a")
+    graph.remove_edge("a", "b")
+
+    graph.replace(FollowGraph.from_edges([("a", "b"), ("b", "c")]))
+
+    assert graph.is_following("c", "a")
+    assert not graph.is_following("a", "b")
+    assert graph.is_following("b", "c")
+
+
+def test_unloaded_graph_ignores_updates():
+    graph = FollowGraph()
+    graph.add_edge("a", "b")
+
+    assert not graph.is_following("a", "b")
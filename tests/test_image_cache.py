@@ -0,0 +1,62 @@
+from helpers.image_cache import DiskLRUCache, cache_key, claim_directory, iter_mapped
+
+
+def loaded_cache(tmp_path, max_bytes):
+    cache = DiskLRUCache(str(tmp_path), max_bytes)
+    cache.load()
+    return cache
+
+
+def store(cache, key, data):
+    cache.write(key, data)
+    return cache.add(key, len(data))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = loaded_cache(tmp_path, 10)
+    store(cache, "aa1", b"1234")
+    store(cache, "bb2", b"1234")
+    cache.get("aa1")
+
+    evicted = store(cache, "cc3", b"1234")
+
+    assert evicted == [cache.path("bb2")]
+    assert cache.total_bytes == 8
+    assert cache.get("bb2") is None and cache.get("aa1") is not None
+
+
+def test_load_rebuilds_index_from_disk(tmp_path):
+    cache = loaded_cache(tmp_path, 100)
+    store(cache, "aa1", b"12345")
+    cache._lock.close()
+
+    reloaded = loaded_cache(tmp_path, 100)
+
+    assert reloaded.directory == cache.directory
+    assert reloaded.total_bytes == 5
+    assert reloaded.get("aa1") == cache.path("aa1")
+
+
+def test_each_process_claims_its_own_directory(tmp_path):
+    first, first_lock = claim_directory(tmp_path)
+    second, second_lock = claim_directory(tmp_path)
+    first_lock.close()
+    third, third_lock = claim_directory(tmp_path)
+
+    assert first != second
+    assert third == first
+    second_lock.close()
+    third_lock.close()
+
+
+def test_open_file_survives_eviction(tmp_path):
+    cache = loaded_cache(tmp_path, 100)
+    key = cache_key("images", "a.jpg", 320, "webp")
+    data = bytes(range(256)) * 64
+    store(cache, key, data)
+
+    file = open(cache.get(key), "rb")
+    cache.path(key).unlink()
+
+    assert b"".join(iter_mapped(file, 1000)) == data
+    assert file.closed
@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from helpers.exceptions import AppException
+from services import image_proxy_service
+
+
+class UnreachableStorage:
+    async def read(self, bucket, path):
+        raise httpx.ConnectTimeout("timed out")
+
+
+def test_snap_width_rounds_up_to_the_ladder():
+    assert image_proxy_service.snap_width(1) == 48
+    assert image_proxy_service.snap_width(300) == 320
+    assert image_proxy_service.snap_width(5000) == 1920
+
+
+def test_storage_transport_errors_become_storage_errors(monkeypatch):
+    monkeypatch.setattr(image_proxy_service, "storage", UnreachableStorage())
+
+    with pytest.raises(AppException) as error:
+        asyncio.run(
+            image_proxy_service.render_to_cache("key", "images", "a.jpg", 320, "webp")
+        )
+    assert error.value.type == "STORAGE_ERROR"
+
+
+class SlowLoadingCache:
+    def __init__(self):
+        self.loaded = False
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        time.sleep(0.05)
+        self.loaded = True
+
+
+def test_concurrent_requests_load_the_render_cache_once(monkeypatch):
+    cache = SlowLoadingCache()
+    monkeypatch.setattr(image_proxy_service, "render_cache", cache)
+
+    async def load_concurrently():
+        await asyncio.gather(
+            *(image_proxy_service.load_render_cache() for _ in range(5))
+        )
+
+    asyncio.run(load_concurrently())
+    assert cache.loads == 1
@@ -0,0 +1,36 @@
+import asyncio
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import SpooledTemporaryFile
+
+from fastapi import UploadFile
+from PIL import Image
+
+from helpers.images import process_image
+from services import image_service
+
+
+def png_upload(width: int, height: int) -> UploadFile:
+    spooled = SpooledTemporaryFile()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(spooled, format="PNG")
+    return UploadFile(spooled, filename="foto.png")
+
+
+def test_process_upload_hands_the_worker_a_path_and_removes_it(monkeypatch):
+    sources = []
+
+    def recording_process_image(source, widths):
+        sources.append(source)
+        return process_image(source, widths)
+
+    monkeypatch.setattr(image_service, "image_pool", ThreadPoolExecutor(1))
+    monkeypatch.setattr(image_service, "process_image", recording_process_image)
+
+    result = asyncio.run(image_service.process_upload(png_upload(400, 200), (320,)))
+
+    assert isinstance(sources[0], str)
+    assert not os.path.exists(sources[0])
+    assert (result["width"], result["height"]) == (400, 200)
+    assert Image.open(io.BytesIO(result["data"])).format == "PNG"
+    assert {item["width"] for item in result["derivatives"]} == {320}
@@ -0,0 +1,86 @@
+import random
+from datetime import datetime, timezone
+
+from helpers.leaderboard import Leaderboard
+from services import leaderboard_service
+from tests.fakes import FakeDatabase
+
+
+def expected_top(scores, size):
+    ranked = sorted((-score, key) for key, score in scores.items() if score > 0)
+    return [(key, -negative_score) for negative_score, key in ranked[:size]]
+
+
+def test_top_follows_increments_and_decrements():
+    leaderboard = Leaderboard(2)
+    leaderboard.replace({"a": 5, "b": 3, "c": 1})
+
+    leaderboard.add("a", -4)
+    assert leaderboard.top() == [("b", 3), ("a", 1)]
+
+    leaderboard.add("c", 5)
+    assert leaderboard.top() == [("c", 6), ("b", 3)]
+
+
+def test_discarded_entries_leave_the_top():
+    leaderboard = Leaderboard(2)
+    leaderboard.replace({"a": 5, "b": 3, "c": 1})
+
+    leaderboard.discard("a")
+
+    assert leaderboard.top() == [("b", 3), ("c", 1)]
+
+
+def test_scores_that_reach_zero_are_dropped():
+    leaderboard = Leaderboard(3)
+    leaderboard.replace({"a": 1, "b": 0})
+
+    leaderboard.add("a", -1)
+
+    assert leaderboard.top() == []
+
+
+def test_random_churn_matches_full_sort():
+    rng = random.Random(7)
+    leaderboard = Leaderboard(5)
+    scores = {key: rng.randint(0, 20) for key in range(50)}
+    leaderboard.replace(scores)
+
+    for _ in range(5000):
+        key = rng.randrange(60)
+        if rng.random() < 0.05:
+            leaderboard.discard(key)
+            scores.pop(key, None)
+        else:
+            delta = rng.choice((-1, -1, 1, 2))
+            leaderboard.add(key, delta)
+            scores[key] = max(0, scores.get(key, 0) + delta)
+        if rng.random() < 0.2:
+            assert leaderboard.top() == expected_top(scores, 5)
+
+    assert leaderboard.top() == expected_top(scores, 5)
+    assert len(leaderboard._heap) <= 2 * len(leaderboard._scores) + 5 + 5
+
+
+def test_followers_scan_does_not_skip_rows_sharing_a_timestamp(monkeypatch):
+    followed_at = datetime.now(timezone.utc).isoformat()
+    follows = [("a", "x"), ("a", "y"), ("a", "z"), ("b", "x"), ("b", "z")]
+    database = FakeDatabase(
+        profiles=[],
+        topicos=[],
+        comentarios=[],
+        followers=[
+            {
+                "follower_id": follower,
+                "following_id": following,
+                "created_at": followed_at,
+            }
+            for follower, following in follows
+        ],
+    )
+    monkeypatch.setattr(leaderboard_service, "supabase", database)
+    monkeypatch.setattr(leaderboard_service, "LEADERBOARD_PAGE_SIZE", 2)
+
+    scores = leaderboard_service.fetch_leaderboard_scores()
+
+    assert scores[("followed", "7d")] == {"x": 2, "y": 1, "z": 2}
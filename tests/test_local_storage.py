@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from helpers.exceptions import AppException
+from helpers.storage import LocalStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalStorage(str(tmp_path), "http://localhost:8000/")
+
+
+@pytest.mark.parametrize(
+    "bucket, path",
+    [
+        ("images", "../avatars/secret.png"),
+        ("images", "public/../../outside.txt"),
+        ("images", "/etc/passwd"),
+        ("private", "file.txt"),
+    ],
+)
+def test_file_path_rejects_paths_outside_public_buckets(storage, bucket, path):
+    with pytest.raises(AppException) as error:
+        storage.file_path(bucket, path)
+    assert error.value.type == "NOT_FOUND"
+
+
+def test_file_path_resolves_inside_the_bucket(storage, tmp_path):
+    assert storage.file_path("images", "public/aa/x.jpg") == (
+        tmp_path / "images" / "public" / "aa" / "x.jpg"
+    )
+
+
+def test_put_read_remove_round_trip(storage):
+    async def scenario():
+        await storage.put("images", "public/aa/x.jpg", b"data", "image/jpeg")
+        assert await storage.exists("images", "public/aa/x.jpg")
+        assert await storage.read("images", "public/aa/x.jpg") == b"data"
+
+        path, metadata = storage.open("images", "public/aa/x.jpg")
+        assert metadata["content_type"] == "image/jpeg"
+
+        await storage.remove("images", ["public/aa/x.jpg"])
+        assert await storage.read("images", "public/aa/x.jpg") is None
+
+    asyncio.run(scenario())
+
+
+def test_put_without_upsert_keeps_existing_objects(storage):
+    async def scenario():
+        await storage.put("images", "a.jpg", b"first", "image/jpeg")
+        await storage.put("images", "a.jpg", b"second", "image/jpeg", exist_ok=True)
+        assert await storage.read("images", "a.jpg") == b"first"
+
+        with pytest.raises(AppException):
+            await storage.put("images", "a.jpg", b"second", "image/jpeg")
+
+    asyncio.run(scenario())
+
+
+def test_public_url_quotes_the_path(storage):
+    assert (
+        storage.public_url("images", "public/ação 1.jpg")
+        == "http://localhost:8000/storage/images/public/a%C3%A7%C3%A3o%201.jpg"
+    )
@@ -0,0 +1,87 @@
+from types import SimpleNamespace
+
+import pytest
+
+from helpers.exceptions import AppException
+from helpers.pagination import decode_cursor, encode_cursor, iter_keyset
+
+MAX_ROWS = 1000
+
+
+class CappedQuery:
+    def __init__(self, rows):
+        self.rows = rows
+        self.after = None
+        self.page_size = None
+
+    def gt(self, column, value):
+        self.after = value
+        return self
+
+    def order(self, column):
+        return self
+
+    def limit(self, page_size):
+        self.page_size = page_size
+        return self
+
+    def execute(self):
+        rows = [
+            row for row in self.rows if self.after is None or row["id"] > self.after
+        ]
+        return SimpleNamespace(data=rows[: min(self.page_size, MAX_ROWS)])
+
+
+def test_iter_keyset_reads_past_server_row_cap():
+    rows = [{"id": value} for value in range(2500)]
+
+    result = list(iter_keyset(lambda: CappedQuery(rows), "id", page_size=10000))
+
+    assert result == rows
+
+
+def test_iter_keyset_stops_on_empty_page():
+    queries = []
+
+    def build_query():
+        queries.append(CappedQuery([{"id": value} for value in range(3)]))
+        return queries[-1]
+
+    assert [row["id"] for row in iter_keyset(build_query, "id", page_size=2)] == [
+        0,
+        1,
+        2,
+    ]
+    assert len(queries) == 3
+
+
+def test_iter_keyset_empty_table():
+    assert list(iter_keyset(lambda: CappedQuery([]), "id")) == []
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ("2024-03-01T12:00:00.123456+00:00", 42),
+        ("2024-03-01T12:00:00+00:00", "0b5d6c8e-6f0a-4c1e-9a57-3c1f2d4e5f60"),
+    ],
+)
+def test_decode_cursor_accepts_timestamps_and_identifiers(values):
+    assert decode_cursor(encode_cursor(*values)) == list(values)
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ("2024-03-01T12:00:00+00:00,id.gt.0", 1),
+        ("2024-03-01T12:00:00+00:00", "1),or(id.gt.0"),
+        ("2024-03-01T12:00:00+00:00", True),
+        ("2024-03-01T12:00:00+00:00", "{0b5d6c8e-6f0a-4c1e-9a57-3c1f2d4e5f60}"),
+        ("ontem", 1),
+        ("2024-03-01T12:00:00+00:00",),
+    ],
+)
+def test_decode_cursor_rejects_values_outside_the_expected_shape(values):
+    with pytest.raises(AppException) as error:
+        decode_cursor(encode_cursor(*values))
+    assert error.value.type == "BAD_REQUEST"
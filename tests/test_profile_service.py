@@ -0,0 +1,34 @@
+import asyncio
+
+from services import profile_service
+from tests.fakes import FakeDatabase
+
+USER_ID = "00000000-0000-0000-0000-000000000001"
+
+
+def test_delete_avatar_invalidates_the_cache_before_enqueueing(monkeypatch):
+    database = FakeDatabase(
+        profiles=[
+            {
+                "id": USER_ID,
+                "avatar_url": "https://cdn/avatars/a.png",
+                "avatar_variants": [],
+            }
+        ]
+    )
+    cached_when_enqueued = []
+    monkeypatch.setattr(profile_service, "supabase_admin", database)
+    monkeypatch.setattr(
+        profile_service,
+        "enqueue_deletions",
+        lambda bucket, items: cached_when_enqueued.append(
+            profile_service.profile_cache.get("maria")
+        ),
+    )
+    profile_service.profile_username_cache.set(USER_ID, "maria")
+    profile_service.profile_cache.set("maria", {"avatar_url": "antigo"})
+
+    asyncio.run(profile_service.delete_avatar(USER_ID))
+
+    assert cached_when_enqueued == [None]
+    assert database.tables["profiles"][0]["avatar_url"] is None
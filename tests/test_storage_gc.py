@@ -0,0 +1,57 @@
+import asyncio
+import os
+
+from helpers.storage import LocalStorage
+from services import storage_gc_service
+
+
+def write_object(storage, path, age_hours):
+    target = storage.file_path("images", path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_bytes(b"data")
+    timestamp = target.stat().st_mtime - age_hours * 3600
+    os.utime(target, (timestamp, timestamp))
+
+
+def run_gc(monkeypatch, tmp_path, references, dry_run=False):
+    storage = LocalStorage(str(tmp_path), "http://localhost:8000")
+    write_object(storage, "public/aa/kept.jpg", 48)
+    write_object(storage, "public/aa/orphan.jpg", 48)
+    write_object(storage, "public/bb/ação.jpg", 48)
+    write_object(storage, "public/bb/recent.jpg", 0)
+
+    enqueued = []
+    monkeypatch.setattr(storage_gc_service, "storage", storage)
+    monkeypatch.setattr(
+        storage_gc_service, "GC_BUCKETS", {"images": lambda: references}
+    )
+    monkeypatch.setattr(
+        storage_gc_service,
+        "enqueue_deletions",
+        lambda bucket, objects: enqueued.extend(objects),
+    )
+    report = asyncio.run(
+        storage_gc_service.collect_garbage("images", dry_run=dry_run, grace_hours=24)
+    )
+    return report, enqueued
+
+
+def test_orphans_are_queued_with_their_public_url(monkeypatch, tmp_path):
+    report, enqueued = run_gc(
+        monkeypatch, tmp_path, {"public/aa/kept.jpg", "public/bb/ação.jpg"}
+    )
+
+    assert (report["scanned"], report["referenced"], report["recent"]) == (4, 2, 1)
+    assert enqueued == [
+        (
+            "public/aa/orphan.jpg",
+            "http://localhost:8000/storage/images/public/aa/orphan.jpg",
+        )
+    ]
+
+
+def test_dry_run_queues_nothing(monkeypatch, tmp_path):
+    report, enqueued = run_gc(monkeypatch, tmp_path, set(), dry_run=True)
+
+    assert report["orphans"] == 3
+    assert enqueued == []
@@ -0,0 +1,32 @@
+from helpers.storage import SupabaseStorage
+from services.storage_gc_service import referenced_paths
+from services.upload_service import storage_path
+
+LEGACY_URL = (
+    "https://project.supabase.co/storage/v1/object/public/images/"
+    "public/a%C3%A7%C3%A3o(1).jpg"
+)
+
+
+def test_storage_path_decodes_legacy_urls():
+    assert storage_path(LEGACY_URL, "images") == "public/ação(1).jpg"
+
+
+def test_storage_path_strips_query_and_rejects_other_buckets():
+    assert storage_path(f"{LEGACY_URL}?t=1", "images") == "public/ação(1).jpg"
+    assert storage_path(LEGACY_URL, "avatars") is None
+
+
+def test_public_url_round_trips_through_storage_path():
+    url = SupabaseStorage().public_url("images", "public/ab/ação (1).jpg")
+
+    assert storage_path(url, "images") == "public/ab/ação (1).jpg"
+
+
+def test_gc_references_use_decoded_keys():
+    rows = [{"url": LEGACY_URL, "variants": [{"url": f"{LEGACY_URL[:-4]}_320.webp"}]}]
+
+    assert referenced_paths("images", rows, ("url", "variants")) == {
+        "public/ação(1).jpg",
+        "public/ação(1)_320.webp",
+    }
@@ -0,0 +1,24 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from helpers.storage import LocalStorage
+from routes import storage_routes
+
+
+def test_get_and_head_share_one_documented_operation(monkeypatch, tmp_path):
+    storage = LocalStorage(str(tmp_path), "http://localhost:8000/")
+    asyncio.run(storage.put("images", "public/aa/x.jpg", b"data", "image/jpeg"))
+    monkeypatch.setattr(storage_routes, "storage", storage)
+    app = FastAPI()
+    app.include_router(storage_routes.storage_routes)
+    client = TestClient(app)
+
+    assert client.get("/storage/images/public/aa/x.jpg").content == b"data"
+    head = client.head("/storage/images/public/aa/x.jpg")
+    assert head.status_code == 200
+    assert head.content == b""
+
+    operations = app.openapi()["paths"]["/storage/{bucket}/{path}"]
+    assert list(operations) == ["get"]
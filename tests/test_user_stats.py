@@ -0,0 +1,44 @@
+from services.statistic_service import apply_stats_event
+
+RECORD = {
+    "topics_count": 3,
+    "messages_count": 10,
+    "last_topic_at": "2024-03-01T12:00:00+00:00",
+    "last_post_at": "2024-03-05T12:00:00+00:00",
+    "updated_at": "2024-03-05T12:00:01+00:00",
+}
+
+
+def test_new_topic_advances_counters_and_dates():
+    updated = apply_stats_event(RECORD, "topic", "2024-03-06T08:00:00+00:00", 1)
+
+    assert updated["topics_count"] == 4
+    assert updated["last_topic_at"] == "2024-03-06T08:00:00+00:00"
+    assert updated["last_post_at"] == "2024-03-06T08:00:00+00:00"
+
+
+def test_new_comment_only_touches_last_post():
+    updated = apply_stats_event(RECORD, "comment", "2024-03-06T08:00:00+00:00", 1)
+
+    assert updated["topics_count"] == 3
+    assert updated["last_topic_at"] == RECORD["last_topic_at"]
+    assert updated["last_post_at"] == "2024-03-06T08:00:00+00:00"
+
+
+def test_deleting_an_older_comment_keeps_dates():
+    updated = apply_stats_event(RECORD, "comment", "2024-02-01T00:00:00+00:00", -1)
+
+    assert updated["last_post_at"] == RECORD["last_post_at"]
+
+
+def test_deleting_the_latest_post_requires_recompute():
+    assert apply_stats_event(RECORD, "comment", RECORD["last_post_at"], -1) is None
+
+
+def test_first_post_fills_empty_dates():
+    record = {**RECORD, "topics_count": 0, "last_topic_at": None, "last_post_at": None}
+
+    updated = apply_stats_event(record, "topic", "2024-03-06T08:00:00+00:00", 1)
+
+    assert updated["topics_count"] == 1
+    assert updated["last_topic_at"] == updated["last_post_at"]
@@ -0,0 +1,89 @@
+from helpers.bloom import BloomFilter
+from helpers.username_index import UsernameIndex
+
+
+def profile(user_id, username, activity=0):
+    return {
+        "id": user_id,
+        "username": username,
+        "role": "Membro",
+        "avatar_url": None,
+        "mensagens_count": activity,
+    }
+
+
+def build_index():
+    return UsernameIndex.from_profiles(
+        [
+            profile(1, "Marcos", 10),
+            profile(2, "marcela", 30),
+            profile(3, "Anamaria", 5),
+            profile(4, "maria_luiza", 20),
+        ]
+    )
+
+
+def usernames(results):
+    return [result["username"] for result in results]
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000)
+    values = [f"user{index}" for index in range(1000)]
+    for value in values:
+        bloom.add(value)
+
+    assert all(value in bloom for value in values)
+    false_positives = sum(f"other{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+def test_prefix_search_is_case_insensitive_and_ranked_by_activity():
+    assert usernames(build_index().search("MAR", 10))[:3] == [
+        "marcela",
+        "maria_luiza",
+        "Marcos",
+    ]
+
+
+def test_infix_search_uses_trigrams():
+    assert usernames(build_index().search("ria", 10)) == ["maria_luiza", "Anamaria"]
+
+
+def test_upsert_and_remove_update_search():
+    index = build_index()
+
+    index.upsert("1", "Ricardo")
+    index.remove("2")
+
+    assert usernames(index.search("mar", 10)) == ["maria_luiza", "Anamaria"]
+    assert usernames(index.search("ric", 10)) == ["Ricardo"]
+
+
+def test_is_taken():
+    index = build_index()
+
+    assert index.is_taken("Marcos") is True
+    assert index.is_taken("ninguem") is None
+
+
+def test_missing_name_is_only_trusted_on_a_complete_load():
+    profiles = [profile(1, "Marcos"), profile(2, "marcela")]
+
+    complete = UsernameIndex.from_profiles(profiles, expected_count=2)
+    truncated = UsernameIndex.from_profiles(profiles, expected_count=5)
+    unknown = UsernameIndex.from_profiles(profiles)
+
+    assert complete.is_taken("ninguem") is False
+    assert truncated.is_taken("ninguem") is None
+    assert unknown.is_taken("ninguem") is None
+    assert truncated.is_taken("Marcos") is True
+
+
+def test_replace_carries_completeness():
+    index = UsernameIndex()
+    index.begin_reload()
+
+    index.replace(UsernameIndex.from_profiles([profile(1, "Marcos")], 1))
+
+    assert index.loaded and index.complete